@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+"""
+Adaptive Polling Scheduler for mytribal.ai
+Long-lived loop that polls each RSS source when it is likely to have new entries
+"""
+
+import logging
+import statistics
+import time
+from datetime import datetime
+from pathlib import Path
+
+import schedule
+
+import daily_ai_content_generator as generator
+from feed_state import FeedStateStore
+from websub_receiver import WEBSUB_CONFIG
+
+logger = logging.getLogger(__name__)
+
+SCHEDULER_CONFIG = {
+    'check_interval_seconds': 60,     # How often to look for due sources
+    'min_poll_interval': 15 * 60,     # Never poll a feed more often than this
+    'max_poll_interval': 24 * 3600,   # Never leave a feed unpolled longer than this
+    'default_poll_interval': 6 * 3600,  # Until a feed's cadence has been observed
+    'min_samples': 3,                 # Entry timestamps needed before trusting the estimate
+    'subscribed_poll_interval': 24 * 3600  # Safety-net polls for feeds a WebSub hub pushes to us
+}
+
+def estimate_update_interval(entry_times):
+    """Median gap in seconds between a feed's observed entries, or None if too few samples"""
+    times = sorted(set(entry_times), reverse=True)
+    if len(times) < SCHEDULER_CONFIG['min_samples']:
+        return None
+
+    gaps = [newer - older for newer, older in zip(times, times[1:])]
+    return statistics.median(gaps)
+
+def next_poll_time(state, push_state=None, now=None):
+    """Epoch time at which a feed should next be polled, given its recorded state
+
+    push_state is the feed's record in the WebSub receiver's state. While its
+    subscription is live, the hub delivers new entries and polling only guards
+    against a hub that went quiet.
+    """
+    now = time.time() if now is None else now
+    if push_state and push_state.get('websub_expires', 0) > now:
+        last_heard = max(state.get('last_polled', 0), push_state.get('last_pushed', 0))
+        return max(last_heard + SCHEDULER_CONFIG['subscribed_poll_interval'], state.get('backoff_until', 0))
+
+    last_polled = state.get('last_polled')
+    if last_polled is None:
+        return state.get('backoff_until', 0)  # Never polled: due immediately unless backing off
+
+    interval = estimate_update_interval(state.get('entry_times', []))
+    if interval is None:
+        interval = SCHEDULER_CONFIG['default_poll_interval']
+    interval = min(max(interval, SCHEDULER_CONFIG['min_poll_interval']), SCHEDULER_CONFIG['max_poll_interval'])
+
+    entry_times = state.get('entry_times')
+    expected = entry_times[0] + interval if entry_times else last_polled + interval
+
+    # If the next entry was already expected at the last poll and did not show up,
+    # the feed is running slow: wait a full interval from that poll instead
+    if expected <= last_polled:
+        expected = last_polled + interval
+
+    next_time = min(
+        max(expected, last_polled + SCHEDULER_CONFIG['min_poll_interval']),
+        last_polled + SCHEDULER_CONFIG['max_poll_interval']
+    )
+
+    # A failing feed's circuit breaker outranks its usual cadence
+    return max(next_time, state.get('backoff_until', 0))
+
+def due_sources(feed_state, now=None, push_state=None):
+    """Sources from EXTERNAL_RSS_SOURCES whose next poll time has arrived"""
+    now = time.time() if now is None else now
+    return {
+        source_name: source_info
+        for source_name, source_info in generator.EXTERNAL_RSS_SOURCES.items()
+        if next_poll_time(
+            feed_state.get(source_info['url']),
+            push_state.get(source_info['url']) if push_state else None,
+            now
+        ) <= now
+    }
+
+def load_push_state(data_dir):
+    """The WebSub receiver's subscription and delivery state (read only here)"""
+    return FeedStateStore(
+        generator.state_file_path(data_dir, generator.CONFIG['feed_state_file'], WEBSUB_CONFIG['state_tag'])
+    )
+
+def poll_due_sources():
+    """Run the content generator for every source that is currently due"""
+    data_dir = Path(generator.ensure_data_directory())
+    state_path = data_dir / generator.CONFIG['feed_state_file']
+    push_state = load_push_state(data_dir)
+    sources = due_sources(FeedStateStore(state_path), push_state=push_state)
+
+    if not sources:
+        return
+
+    logger.info(f"⏰ Polling {len(sources)} due sources: {', '.join(sources)}")
+    try:
+        generator.generate_content(sources, append=True)
+    except Exception as e:
+        logger.error(f"❌ Error during scheduled poll: {e}")
+
+    # Reload to pick up the poll times the generator just recorded
+    feed_state = FeedStateStore(state_path)
+    for source_name, source_info in generator.EXTERNAL_RSS_SOURCES.items():
+        next_time = datetime.fromtimestamp(
+            next_poll_time(feed_state.get(source_info['url']), push_state.get(source_info['url']))
+        )
+        logger.info(f"   🗓️ {source_name}: next poll at {next_time.strftime('%Y-%m-%d %H:%M')}")
+
+def main():
+    """Run the adaptive polling loop forever"""
+    logger.info("🚀 Starting adaptive polling scheduler for mytribal.ai...")
+
+    schedule.every(SCHEDULER_CONFIG['check_interval_seconds']).seconds.do(poll_due_sources)
+    poll_due_sources()
+
+    while True:
+        schedule.run_pending()
+        time.sleep(1)
+
+if __name__ == "__main__":
+    try:
+        main()
+    except KeyboardInterrupt:
+        logger.info("🛑 Scheduler stopped")
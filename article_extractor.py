@@ -0,0 +1,286 @@
+#!/usr/bin/env python3
+"""
+Article Extractor
+Fetches the full articles behind selected stories, extracts their main text and
+caches it on disk so an article is never downloaded twice
+"""
+
+import hashlib
+import json
+import logging
+import os
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from html.parser import HTMLParser
+from pathlib import Path
+from urllib.parse import urlparse
+
+import requests
+import urllib3
+
+from bounded_download import download_body
+
+logger = logging.getLogger(__name__)
+
+ARTICLE_CONFIG = {
+    'cache_dir': 'article_cache',           # Stored inside data_dir
+    'cache_max_bytes': 50 * 1024 * 1024,    # Least recently used entries go first beyond this
+    'fresh_seconds': 24 * 3600,             # Serve cached text without revalidating for this long
+    'fetch_workers': 8,
+    'per_host': 2,                          # Concurrent requests to any one site
+    'max_page_bytes': 3 * 1024 * 1024,
+    'max_chars': 8000,                      # Text kept per article
+    'min_paragraph_chars': 40               # Shorter blocks are usually captions or boilerplate
+}
+
+class MainTextExtractor(HTMLParser):
+    """Collects paragraph text, preferring <article>, and skipping page furniture"""
+
+    SKIP_TAGS = {'script', 'style', 'noscript', 'nav', 'header', 'footer', 'aside', 'form', 'figure'}
+    BLOCK_TAGS = {'p', 'h2', 'h3', 'li', 'blockquote'}
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.skip_depth = 0
+        self.article_depth = 0
+        self.current = None
+        self.article_blocks = []
+        self.page_blocks = []
+
+    def handle_starttag(self, tag, attrs):
+        if tag in self.SKIP_TAGS:
+            self.skip_depth += 1
+        elif tag == 'article':
+            self.article_depth += 1
+        elif tag in self.BLOCK_TAGS and not self.skip_depth:
+            self.current = []
+
+    def handle_endtag(self, tag):
+        if tag in self.SKIP_TAGS:
+            self.skip_depth = max(0, self.skip_depth - 1)
+        elif tag == 'article':
+            self.article_depth = max(0, self.article_depth - 1)
+        elif tag in self.BLOCK_TAGS and self.current is not None:
+            text = ' '.join(''.join(self.current).split())
+            if len(text) >= ARTICLE_CONFIG['min_paragraph_chars']:
+                (self.article_blocks if self.article_depth else self.page_blocks).append(text)
+            self.current = None
+
+    def handle_data(self, data):
+        if self.current is not None and not self.skip_depth:
+            self.current.append(data)
+
+def extract_main_text(html, max_chars=None):
+    """Main readable text of an HTML page, paragraphs separated by blank lines"""
+    parser = MainTextExtractor()
+    parser.feed(html)
+    parser.close()
+
+    blocks = parser.article_blocks or parser.page_blocks
+    text = '\n\n'.join(blocks)
+    max_chars = max_chars or ARTICLE_CONFIG['max_chars']
+    return text[:max_chars]
+
+class ArticleCache:
+    """
+    Content-addressed article cache: each body lives in a file named by the hash of
+    URL + ETag, and a small index maps URLs to their current validators. File
+    mtimes record last use for LRU eviction.
+    """
+
+    def __init__(self, cache_dir, max_bytes=None):
+        self.cache_dir = Path(cache_dir)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes or ARTICLE_CONFIG['cache_max_bytes']
+        self.index_path = self.cache_dir / 'index.json'
+        self._lock = threading.Lock()
+
+        try:
+            with open(self.index_path, 'r', encoding='utf-8') as f:
+                self._index = json.load(f)
+        except (FileNotFoundError, ValueError):
+            self._index = {}
+
+    @staticmethod
+    def cache_key(url, etag):
+        return hashlib.sha256(f"{url}\n{etag or ''}".encode('utf-8')).hexdigest()
+
+    def lookup(self, url):
+        """Return (record, path) for a URL's cached article, or (None, None)"""
+        with self._lock:
+            record = self._index.get(url)
+        if record is None:
+            return None, None
+
+        path = self.cache_dir / f"{record['key']}.txt"
+        if not path.exists():
+            with self._lock:
+                self._index.pop(url, None)
+            return None, None
+        return record, path
+
+    def read(self, url):
+        """Cached text for a URL (marking it recently used), or None"""
+        record, path = self.lookup(url)
+        if record is None:
+            return None
+        os.utime(path)
+        return path.read_text(encoding='utf-8')
+
+    def touch(self, url):
+        """Mark a cached article fresh again after a 304 revalidation"""
+        with self._lock:
+            if url in self._index:
+                self._index[url]['checked_at'] = time.time()
+
+    def store(self, url, etag, last_modified, text):
+        """Cache an article's text under URL + ETag"""
+        key = self.cache_key(url, etag)
+        path = self.cache_dir / f"{key}.txt"
+        tmp_path = path.with_suffix('.tmp')
+        tmp_path.write_text(text, encoding='utf-8')
+        os.replace(tmp_path, path)
+
+        with self._lock:
+            old = self._index.get(url)
+            self._index[url] = {
+                'key': key,
+                'etag': etag,
+                'last_modified': last_modified,
+                'checked_at': time.time()
+            }
+        if old and old['key'] != key:
+            (self.cache_dir / f"{old['key']}.txt").unlink(missing_ok=True)
+
+    def evict(self):
+        """Delete least recently used articles until the cache fits in max_bytes"""
+        files = sorted(
+            (path.stat().st_mtime, path.stat().st_size, path) for path in self.cache_dir.glob('*.txt')
+        )
+        total = sum(size for _, size, _ in files)
+        removed = 0
+
+        for _, size, path in files:
+            if total <= self.max_bytes:
+                break
+            path.unlink(missing_ok=True)
+            total -= size
+            removed += 1
+
+        if removed:
+            keys = {path.stem for path in self.cache_dir.glob('*.txt')}
+            with self._lock:
+                self._index = {url: record for url, record in self._index.items() if record['key'] in keys}
+            logger.info(f"🧹 Evicted {removed} cached articles to stay under {self.max_bytes:,} bytes")
+
+    def save(self):
+        """Persist the URL index"""
+        with self._lock:
+            tmp_path = self.index_path.with_suffix('.tmp')
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(self._index, f)
+            os.replace(tmp_path, self.index_path)
+
+class ArticleFetcher:
+    """Fetches articles concurrently, never more than per_host at a time for one site"""
+
+    def __init__(self, session, cache, timeout=15):
+        self.session = session
+        self.cache = cache
+        self.timeout = timeout
+        self._host_slots = {}
+        self._slots_lock = threading.Lock()
+
+    def _host_slot(self, url):
+        host = urlparse(url).netloc.lower()
+        with self._slots_lock:
+            if host not in self._host_slots:
+                self._host_slots[host] = threading.BoundedSemaphore(ARTICLE_CONFIG['per_host'])
+            return self._host_slots[host]
+
+    def fetch(self, url):
+        """Main text of the article at url, from cache when possible; None on failure"""
+        record, _ = self.cache.lookup(url)
+        if record and time.time() - record.get('checked_at', 0) < ARTICLE_CONFIG['fresh_seconds']:
+            return self.cache.read(url)
+
+        # Revalidate: an unchanged article costs a 304, never a second download
+        headers = {}
+        if record and record.get('etag'):
+            headers['If-None-Match'] = record['etag']
+        if record and record.get('last_modified'):
+            headers['If-Modified-Since'] = record['last_modified']
+
+        try:
+            with self._host_slot(url):
+                response, body, _ = download_body(
+                    self.session, url, headers,
+                    timeout=self.timeout,
+                    max_bytes=ARTICLE_CONFIG['max_page_bytes'],
+                    max_seconds=self.timeout * 2
+                )
+        except (requests.RequestException, urllib3.exceptions.HTTPError) as e:
+            logger.warning(f"   ⚠️ Could not fetch article {url}: {e}")
+            return self.cache.read(url)
+
+        if response.status_code == 304 and record:
+            self.cache.touch(url)
+            return self.cache.read(url)
+        if response.status_code >= 400:
+            logger.warning(f"   ⚠️ Article {url} returned HTTP {response.status_code}")
+            return self.cache.read(url)
+
+        charset = re.search(r'charset=["\']?([\w-]+)', response.headers.get('Content-Type', ''))
+        try:
+            html = body.decode(charset.group(1) if charset else 'utf-8', errors='replace')
+        except LookupError:
+            html = body.decode('utf-8', errors='replace')
+
+        text = extract_main_text(html)
+        self.cache.store(url, response.headers.get('ETag'), response.headers.get('Last-Modified'), text)
+        return text
+
+    def fetch_or_none(self, url):
+        """fetch(), except that any failure leaves the story on its feed summary"""
+        try:
+            return self.fetch(url)
+        except Exception as e:
+            # A broken page or cache file must not cost the run its selected stories
+            logger.warning(f"   ⚠️ Could not extract article {url}: {type(e).__name__}: {e}")
+            return None
+
+    def fetch_all(self, urls):
+        """Fetch many articles concurrently; returns {url: text or None}"""
+        urls = list(dict.fromkeys(url for url in urls if url))
+        if not urls:
+            return {}
+
+        with ThreadPoolExecutor(max_workers=ARTICLE_CONFIG['fetch_workers'], thread_name_prefix='article') as executor:
+            texts = dict(zip(urls, executor.map(self.fetch_or_none, urls)))
+
+        try:
+            self.cache.evict()
+            self.cache.save()
+        except OSError as e:
+            logger.warning(f"   ⚠️ Could not save the article cache: {e}")
+        return texts
+
+def attach_article_text(entries, session, data_dir, timeout=15):
+    """Set article_text on each entry whose linked page yields readable text"""
+    cache = ArticleCache(Path(data_dir) / ARTICLE_CONFIG['cache_dir'])
+    fetcher = ArticleFetcher(session, cache, timeout)
+
+    logger.info(f"📰 Extracting full articles for {len(entries)} stories...")
+    texts = fetcher.fetch_all(entry.link for entry in entries)
+
+    extracted = 0
+    for entry in entries:
+        text = texts.get(entry.link)
+        if text:
+            entry.article_text = text
+            extracted += 1
+
+    logger.info(f"📰 Extracted full text for {extracted}/{len(entries)} stories")
+    return extracted
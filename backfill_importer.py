@@ -0,0 +1,285 @@
+#!/usr/bin/env python3
+"""
+Backfill Importer for mytribal.ai
+Streams historical outline, raw content and site RSS files, plus archived raw content,
+into the content store, normalizing their older schemas and deduplicating by link
+"""
+
+import argparse
+import json
+import logging
+import os
+import re
+import time
+from datetime import datetime
+from pathlib import Path
+from urllib.parse import urlparse
+
+from content_archive import open_archive
+from content_entry import ContentEntry
+from content_store import ContentStore
+
+logger = logging.getLogger(__name__)
+
+# The generator module configures logging to its own file on import, so its
+# defaults are mirrored here: data_dir, content_store_file and published_history_files
+BACKFILL_CONFIG = {
+    'batch_size': 2000,               # Rows per transaction
+    'read_chunk_bytes': 256 * 1024,
+    'data_dir': 'content_for_mytribal',
+    'content_store_file': 'content_store.db',  # Stored inside data_dir
+    'site_files': ['mytribal_rss_data.json', 'rss_data/mytribal_rss_master.json']
+}
+
+DATED_FILE = re.compile(r'(mytribal_stories|raw_content)_(\d{4}-\d{2}-\d{2})\.json$')
+ARRAY_SEPARATORS = ' \t\r\n,'
+
+def iter_json_array(path, chunk_bytes=None):
+    """Yield the items of a top-level JSON array without loading the whole file"""
+    decoder = json.JSONDecoder()
+    chunk_bytes = chunk_bytes or BACKFILL_CONFIG['read_chunk_bytes']
+
+    with open(path, 'r', encoding='utf-8') as f:
+        buffer = ''
+        while not buffer:
+            chunk = f.read(chunk_bytes)
+            if not chunk:
+                break
+            buffer = chunk.lstrip()
+        if not buffer.startswith('['):
+            raise ValueError(f"{path} does not hold a JSON array")
+        pos, eof = 1, False
+
+        while True:
+            while pos < len(buffer) and buffer[pos] in ARRAY_SEPARATORS:
+                pos += 1
+            if pos < len(buffer) and buffer[pos] == ']':
+                return
+
+            if pos < len(buffer):
+                try:
+                    item, end = decoder.raw_decode(buffer, pos)
+                except json.JSONDecodeError:
+                    if eof:
+                        raise
+                else:
+                    # A number cut at the chunk end ("3." or "2e") decodes as a shorter
+                    # number, so only trust a value once the "," or "]" after it is read
+                    after = end
+                    while after < len(buffer) and buffer[after] in ' \t\r\n':
+                        after += 1
+                    if (after < len(buffer) and buffer[after] in ',]') or eof:
+                        yield item
+                        pos = end
+                        continue
+
+            if eof:
+                raise ValueError(f"{path} ends inside its JSON array")
+            chunk = f.read(chunk_bytes)
+            buffer, pos, eof = buffer[pos:] + chunk, 0, not chunk
+
+def normalize_raw_entry(data):
+    """Canonical raw entry dict for the current shape or the older site-feed shape"""
+    if 'source_name' not in data and 'feed_url' in data:
+        # mytribal_rss_data.json / rss_data: our own posts as read back FROM the site feed
+        data = dict(
+            data,
+            source_name=data.get('feed_title') or urlparse(data['feed_url']).netloc,
+            source_url=data['feed_url'],
+            category='published_post'
+        )
+    return ContentEntry.from_dict(data).to_dict()
+
+def entry_day(entry, default):
+    """Day a site post belongs to: its publication date, else when it was read"""
+    for value in (entry.get('parsed_date'), entry.get('timestamp')):
+        if value and re.match(r'\d{4}-\d{2}-\d{2}', str(value)):
+            return str(value)[:10]
+    return default
+
+def classify_file(path):
+    """(kind, day) for a backfill file; kind is 'outlines', 'raw' or 'site'"""
+    match = DATED_FILE.search(Path(path).name)
+    if match:
+        return ('outlines' if match.group(1) == 'mytribal_stories' else 'raw'), match.group(2)
+    return 'site', datetime.fromtimestamp(os.path.getmtime(path)).strftime("%Y-%m-%d")
+
+def find_backfill_files(paths):
+    """Expand directories into their dated outline and raw content files"""
+    files = []
+    for path in map(Path, paths):
+        if path.is_dir():
+            files.extend(list(path.glob('mytribal_stories_*.json')) + list(path.glob('raw_content_*.json')))
+        elif path.exists():
+            files.append(path)
+        else:
+            logger.warning(f"⚠️ Skipping missing backfill path {path}")
+    return files
+
+def plan_imports(files):
+    """(day, path, entries) import steps across all files, oldest day first
+
+    The earliest day a link is stored under wins, so that must also be the first
+    day imported, whatever order the files were given in. Dated files are one step
+    each, streamed later (entries None); a site file's posts span many days, so it
+    is read here and split into a step per day.
+    """
+    steps = []
+    for path in files:
+        kind, day = classify_file(path)
+        if kind != 'site':
+            steps.append((day, path, None))
+            continue
+
+        by_day = {}
+        try:
+            for entry in iter_json_array(path):
+                by_day.setdefault(entry_day(entry, day), []).append(entry)
+        except (OSError, ValueError) as e:
+            logger.error(f"❌ Could not import {path}: {e}")
+            continue
+        steps.extend((entries_day, path, entries) for entries_day, entries in by_day.items())
+    return sorted(steps, key=lambda step: (step[0], step[1].name, str(step[1])))
+
+def _batches(items, size):
+    batch = []
+    for item in items:
+        batch.append(item)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+def import_file(store, path, day=None, entries=None):
+    """Stream a dated file, or one day of a site file's entries, into the store in
+    batched transactions; returns (read, added)"""
+    kind, file_day = classify_file(path)
+    day = day or file_day
+    read = added = 0
+
+    for batch in _batches(iter_json_array(path) if entries is None else entries, BACKFILL_CONFIG['batch_size']):
+        read += len(batch)
+        if kind == 'outlines':
+            added += store.backfill_outlines(batch, day)
+        else:
+            added += store.backfill_raw_entries((day, normalize_raw_entry(entry)) for entry in batch)
+    return read, added
+
+def import_archive(store, archive, force=False):
+    """Import archived raw content days FROM segments not imported yet; returns (segments, read, added)
+
+    Covers days whose raw_content file was pruned after archiving. The whole archive
+    is replayed once, since each day is a delta against the day before.
+    """
+    pending = {}
+    for first_day, last_day, path in archive.segments():
+        stat = path.stat()
+        if force or not store.is_imported(path, stat.st_size, stat.st_mtime):
+            pending[path] = (first_day, last_day, stat)
+    if not pending:
+        return 0, 0, 0
+
+    rows = dict.fromkeys(pending, 0)
+    read = added = 0
+    for day, entries in archive.iter_days(until=max(last_day for _, last_day, _ in pending.values())):
+        segment = next((path for path, (first_day, last_day, _) in pending.items() if first_day <= day <= last_day), None)
+        if segment is None:
+            continue
+
+        rows[segment] += len(entries)
+        read += len(entries)
+        for batch in _batches(entries, BACKFILL_CONFIG['batch_size']):
+            added += store.backfill_raw_entries((day, normalize_raw_entry(entry)) for entry in batch)
+
+    for path, (_, _, stat) in pending.items():
+        store.mark_imported(path, stat.st_size, stat.st_mtime, rows[path])
+        logger.info(f"   🗄️ {path.name}: {rows[path]} archived items")
+    return len(pending), read, added
+
+def run_backfill(store, paths, force=False):
+    """Import every file not yet imported; safe to stop and rerun at any point"""
+    started = time.perf_counter()
+    files = find_backfill_files(paths)
+    imported = skipped = read_total = added_total = 0
+    logger.info(f"📦 Backfilling {len(files)} files into {store.path}...")
+
+    # Archived days first: they are the oldest, and the earliest day of a link wins
+    for archive in filter(None, (open_archive(path) for path in map(Path, paths) if path.is_dir())):
+        try:
+            segments, read, added = import_archive(store, archive, force)
+        except (OSError, ValueError, RuntimeError) as e:
+            logger.error(f"❌ Could not import archive {archive.archive_dir}: {e}")
+            continue
+        imported += segments
+        read_total += read
+        added_total += added
+
+    pending = {}
+    for path in files:
+        stat = path.stat()
+        if not force and store.is_imported(path, stat.st_size, stat.st_mtime):
+            skipped += 1
+        else:
+            pending[path] = stat
+
+    steps = plan_imports(pending)
+    remaining = {}
+    for _, path, _ in steps:
+        remaining[path] = remaining.get(path, 0) + 1
+    counts = {path: [0, 0] for path in remaining}
+    failed = set()
+
+    for day, path, entries in steps:
+        if path in failed:
+            continue
+        try:
+            read, added = import_file(store, path, day, entries)
+        except (OSError, ValueError) as e:
+            logger.error(f"❌ Could not import {path}: {e}")
+            failed.add(path)
+            continue
+
+        counts[path][0] += read
+        counts[path][1] += added
+        remaining[path] -= 1
+        if remaining[path]:
+            continue
+
+        # Only a completely imported file is marked; an interrupted one is redone,
+        # and rows it already added are deduplicated on the way in
+        read, added = counts[path]
+        stat = pending[path]
+        store.mark_imported(path, stat.st_size, stat.st_mtime, read)
+        imported += 1
+        read_total += read
+        added_total += added
+        logger.info(f"   📄 {path.name}: {read} items, {added} new")
+
+    elapsed = time.perf_counter() - started
+    logger.info(
+        f"✅ Backfill done in {elapsed:.2f}s: {imported} files imported, {skipped} already imported, "
+        f"{read_total} items read, {added_total} new rows"
+    )
+    return {'imported': imported, 'skipped': skipped, 'read': read_total, 'added': added_total}
+
+def main():
+    """Command line entry point for the backfill importer"""
+    parser = argparse.ArgumentParser(description="Import historical mytribal.ai content into the content store")
+    parser.add_argument('paths', nargs='*',
+                        help="directories of dated files or individual JSON files "
+                             "(default: the data directory and the site RSS exports)")
+    parser.add_argument('--data-dir', default=BACKFILL_CONFIG['data_dir'], help="directory holding the content store")
+    parser.add_argument('--force', action='store_true', help="re-read files that were already imported")
+    args = parser.parse_args()
+
+    paths = args.paths or [args.data_dir, *BACKFILL_CONFIG['site_files']]
+    Path(args.data_dir).mkdir(exist_ok=True)
+    store = ContentStore(Path(args.data_dir) / BACKFILL_CONFIG['content_store_file'])
+    try:
+        run_backfill(store, paths, args.force)
+    finally:
+        store.close()
+
+if __name__ == "__main__":
+    main()
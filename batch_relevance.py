@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+Batch Relevance Scoring
+Scores many entries at once from a sparse entry x keyword matrix, and re-scores saved history
+"""
+
+import argparse
+import json
+import logging
+import time
+
+import numpy as np
+from scipy import sparse
+
+from content_archive import iter_raw_history
+from keyword_matcher import KeywordMatcher
+from normalized_text import entry_text
+
+logger = logging.getLogger(__name__)
+
+# Matching this many keywords (or keyword weight) gives the maximum score of 1.0
+RELEVANCE_SATURATION = 5.0
+
+class RelevanceScorer:
+    """Vectorized AI relevance scoring against a fixed keyword vocabulary"""
+
+    def __init__(self, keywords, weights=None, saturation=RELEVANCE_SATURATION):
+        self.vocabulary = list(dict.fromkeys(keywords))
+        self._columns = {keyword: i for i, keyword in enumerate(self.vocabulary)}
+        self._matcher = KeywordMatcher(self.vocabulary)
+        self.saturation = saturation
+
+        weights = weights or {}
+        self.weights = np.array([weights.get(keyword, 1.0) for keyword in self.vocabulary], dtype=np.float64)
+
+    def term_matrix_from_hits(self, hit_lists):
+        """Build a binary CSR matrix from per-entry keyword hits; unknown keywords are ignored"""
+        indptr = [0]
+        indices = []
+        for hits in hit_lists:
+            indices.extend(self._columns[keyword] for keyword in hits if keyword in self._columns)
+            indptr.append(len(indices))
+
+        data = np.ones(len(indices), dtype=np.float64)
+        return sparse.csr_matrix(
+            (data, np.array(indices, dtype=np.int32), np.array(indptr, dtype=np.int64)),
+            shape=(len(indptr) - 1, len(self.vocabulary))
+        )
+
+    def term_matrix(self, texts):
+        """Build the entry x keyword matrix for (title, summary) pairs"""
+        # The same normalized text find_keyword_hits matches, so markup and entities never count
+        return self.term_matrix_from_hits(
+            self._matcher.find(entry_text(title, summary).lower, lowered=True) for title, summary in texts
+        )
+
+    def score_matrix(self, matrix):
+        """Weighted relevance on the 0-1 scale used by filter_and_rank_content"""
+        return np.minimum(matrix @ self.weights / self.saturation, 1.0)
+
+    def score(self, texts):
+        """Score (title, summary) pairs in one vectorized pass"""
+        return self.score_matrix(self.term_matrix(texts))
+
+def load_raw_history(data_dir):
+    """Load every day of saved raw content as {day: (path, entries)}
+
+    Days pruned to the archive are rebuilt FROM it and have no path.
+    """
+    return {day: (path, entries) for day, path, entries in iter_raw_history(data_dir)}
+
+def rescore_history(data_dir, scorer, write=False):
+    """Re-score all saved raw content with the scorer; optionally write scores back"""
+    history = load_raw_history(data_dir)
+    entries = [entry for _, day_entries in history.values() for entry in day_entries]
+
+    if not entries:
+        logger.warning(f"❌ No raw content found in {data_dir}")
+        return {}
+
+    start = time.perf_counter()
+    scores = scorer.score([(entry.get('title', ''), entry.get('summary', '')) for entry in entries])
+    logger.info(f"⚡ Scored {len(entries)} entries in {time.perf_counter() - start:.2f}s")
+
+    results = {}
+    offset = 0
+    archived_only = 0
+    for day, (path, day_entries) in history.items():
+        day_scores = scores[offset:offset + len(day_entries)]
+        offset += len(day_entries)
+        results[day] = day_scores
+
+        if write and path is None:
+            archived_only += 1
+        elif write:
+            for entry, score in zip(day_entries, day_scores):
+                entry['ai_relevance_score'] = float(score)
+            with open(path, 'w', encoding='utf-8') as f:
+                json.dump(day_entries, f, indent=2, ensure_ascii=False, default=str)
+
+    if archived_only:
+        logger.info(f"🗄️ Left {archived_only} archived days unchanged; the archive is not rewritten")
+    return results
+
+def main():
+    """Re-score saved raw content history against the current AI keywords"""
+    from daily_ai_content_generator import AI_KEYWORDS, CONFIG
+
+    parser = argparse.ArgumentParser(description="Re-score saved raw content with the current AI keywords")
+    parser.add_argument('--data-dir', default=CONFIG['data_dir'], help="directory holding raw_content_*.json and the archive")
+    parser.add_argument('--write', action='store_true', help="write the new scores back into the files")
+    args = parser.parse_args()
+
+    scorer = RelevanceScorer(AI_KEYWORDS)
+    results = rescore_history(args.data_dir, scorer, write=args.write)
+
+    threshold = CONFIG['min_ai_relevance_score']
+    for day, day_scores in results.items():
+        passing = int(np.count_nonzero(day_scores >= threshold))
+        logger.info(f"   {day}: {passing}/{len(day_scores)} entries >= {threshold}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark for the compiled keyword matcher.
+Compares the old per-keyword substring scans against the single-pass matcher
+on a 10k-entry corpus built from saved raw content.
+"""
+
+import glob
+import json
+import time
+from types import SimpleNamespace
+
+from daily_ai_content_generator import (
+    AI_KEYWORDS, TRENDING_TERMS, calculate_ai_relevance, extract_seo_keywords, find_keyword_hits
+)
+from keyword_matcher import KeywordMatcher
+from normalized_text import entry_text, normalize_text
+
+CORPUS_SIZE = 10000
+
+# Terms we are likely to add to AI_KEYWORDS, used to show how each approach scales
+EXTRA_KEYWORDS = [
+    'large language model', 'LLM', 'transformer', 'diffusion model', 'reinforcement learning',
+    'generative AI', 'foundation model', 'fine-tuning', 'inference', 'chatbot', 'copilot',
+    'Gemini', 'Claude', 'Anthropic', 'Llama', 'Mistral', 'Nvidia', 'GPU', 'TPU', 'AI agent',
+    'agentic', 'multimodal', 'embedding', 'vector database', 'prompt engineering',
+    'hallucination', 'AI safety', 'alignment', 'open-weight', 'benchmark', 'speech recognition',
+    'text-to-image', 'text-to-speech', 'self-driving', 'humanoid', 'semiconductor', 'data center',
+    'AI regulation', 'deepfake', 'recommendation system'
+]
+
+def load_corpus(size=CORPUS_SIZE):
+    """Build a corpus of unique (title, summary) pairs from saved raw content"""
+    entries = []
+    for path in sorted(glob.glob('content_for_mytribal/raw_content_*.json')):
+        with open(path, 'r', encoding='utf-8') as f:
+            entries.extend(json.load(f))
+
+    if not entries:
+        raise SystemExit("❌ No raw_content_*.json files found in content_for_mytribal/")
+
+    # Suffix an index so no entry repeats and the matcher's cache never helps
+    return [
+        (f"{entries[i % len(entries)]['title']} #{i}", entries[i % len(entries)].get('summary', ''))
+        for i in range(size)
+    ]
+
+def legacy_relevance_and_keywords(title, summary):
+    """The previous implementation: one substring scan per keyword, text built twice"""
+    text = f"{title} {summary}".lower()
+    ai_matches = 0
+    for keyword in AI_KEYWORDS:
+        if keyword.lower() in text:
+            ai_matches += 1
+
+    text = f"{title} {summary}".lower()
+    found_keywords = []
+    for keyword in AI_KEYWORDS:
+        if keyword.lower() in text:
+            found_keywords.append(keyword)
+    for term in TRENDING_TERMS:
+        if term.lower() in text:
+            found_keywords.append(term)
+
+    return ai_matches, list(set(found_keywords))[:10]
+
+def compiled_relevance_and_keywords(title, summary):
+    """The current implementation: one matcher pass shared by both functions"""
+    return calculate_ai_relevance(title, summary), extract_seo_keywords(
+        SimpleNamespace(title=title, summary=summary)
+    )
+
+def time_run(label, func, corpus):
+    find_keyword_hits.cache_clear()
+    entry_text.cache_clear()
+    normalize_text.cache_clear()
+    start = time.perf_counter()
+    for title, summary in corpus:
+        func(title, summary)
+    elapsed = time.perf_counter() - start
+    print(f"   {label:<32} {elapsed * 1000:8.1f} ms  ({elapsed / len(corpus) * 1e6:6.1f} µs/entry)")
+    return elapsed
+
+def compare_keyword_scaling(corpus, keywords):
+    """Time one substring scan per keyword against one matcher pass for a keyword list"""
+    lowered = [keyword.lower() for keyword in keywords]
+    matcher = KeywordMatcher(keywords)
+
+    def substring_scan(title, summary):
+        text = f"{title} {summary}".lower()
+        return [keyword for keyword in lowered if keyword in text]
+
+    def matcher_pass(title, summary):
+        return matcher.find(f"{title} {summary}")
+
+    print(f"\n📈 {len(keywords)} keywords:")
+    legacy = time_run("per-keyword substring scans", substring_scan, corpus)
+    compiled = time_run("compiled single-pass matcher", matcher_pass, corpus)
+    print(f"   ⚡ Speedup: {legacy / compiled:.1f}x")
+
+def main():
+    corpus = load_corpus()
+    print(f"🧪 Keyword matching benchmark on {len(corpus)} entries ({len(AI_KEYWORDS)} AI keywords)")
+    print("=" * 70)
+
+    print("\n📊 calculate_ai_relevance + extract_seo_keywords per entry:")
+    legacy = time_run("per-keyword substring scans", legacy_relevance_and_keywords, corpus)
+    compiled = time_run("compiled single-pass matcher", compiled_relevance_and_keywords, corpus)
+    print(f"   ⚡ Speedup: {legacy / compiled:.1f}x")
+
+    # Substring scans grow with the keyword count; the matcher pass barely does
+    compare_keyword_scaling(corpus, AI_KEYWORDS + TRENDING_TERMS)
+    compare_keyword_scaling(corpus, AI_KEYWORDS + TRENDING_TERMS + EXTRA_KEYWORDS)
+    print("=" * 70)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""
+Bounded Download
+Streams compressed feed bodies with a hard size cap and a wall-clock deadline
+"""
+
+import time
+import logging
+
+import requests
+import urllib3
+
+logger = logging.getLogger(__name__)
+
+# Brotli is optional: urllib3 only decodes "br" when one of these is installed
+try:
+    import brotli  # noqa: F401
+    BROTLI_AVAILABLE = True
+except ImportError:
+    try:
+        import brotlicffi  # noqa: F401
+        BROTLI_AVAILABLE = True
+    except ImportError:
+        BROTLI_AVAILABLE = False
+
+ACCEPT_ENCODING = 'gzip, deflate, br' if BROTLI_AVAILABLE else 'gzip, deflate'
+
+CHUNK_SIZE = 64 * 1024
+
+class DownloadTooLarge(requests.RequestException):
+    """The body exceeded the allowed size"""
+
+class DownloadTooSlow(requests.RequestException):
+    """The body did not arrive within the allowed time"""
+
+def download_body(session, url, headers=None, timeout=15, max_bytes=5 * 1024 * 1024, max_seconds=30):
+    """
+    GET a URL and stream its body, returning (response, body, wire_bytes).
+
+    The body is decompressed as it arrives and capped at max_bytes (which also stops
+    compression bombs); wire_bytes is what actually crossed the network. Error and
+    304 responses are returned with an empty body without reading it.
+    """
+    headers = {'Accept-Encoding': ACCEPT_ENCODING, **(headers or {})}
+    start = time.monotonic()
+
+    with session.get(url, headers=headers, timeout=timeout, stream=True) as response:
+        if response.status_code >= 400 or response.status_code == 304:
+            return response, b'', 0
+
+        # Refuse early when the server announces an oversized body
+        content_length = response.headers.get('Content-Length')
+        if content_length and content_length.isdigit() and int(content_length) > max_bytes:
+            raise DownloadTooLarge(f"{url} announced {int(content_length)} bytes (limit {max_bytes})")
+
+        chunks = []
+        received = 0
+        try:
+            for chunk in response.raw.stream(CHUNK_SIZE, decode_content=True):
+                received += len(chunk)
+                if received > max_bytes:
+                    raise DownloadTooLarge(f"{url} exceeded {max_bytes} bytes")
+                if time.monotonic() - start > max_seconds:
+                    raise DownloadTooSlow(f"{url} took longer than {max_seconds}s")
+                chunks.append(chunk)
+        # Reading raw bypasses requests, so translate urllib3's errors the way iter_content does
+        except urllib3.exceptions.DecodeError as e:
+            raise requests.exceptions.ContentDecodingError(e, response=response) from e
+        except urllib3.exceptions.ProtocolError as e:
+            raise requests.exceptions.ChunkedEncodingError(e, response=response) from e
+        except urllib3.exceptions.HTTPError as e:
+            raise requests.ConnectionError(e, response=response) from e
+
+        return response, b''.join(chunks), response.raw.tell()
@@ -0,0 +1,356 @@
+#!/usr/bin/env python3
+"""
+Content Archive for mytribal.ai
+Delta-compressed archive of the daily raw content snapshots: each day stores only
+the entries that are new, changed or gone since the day before
+"""
+
+import argparse
+import glob
+import gzip
+import hashlib
+import json
+import logging
+import os
+import re
+from datetime import datetime, timedelta
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+# zstd is optional: it compresses noticeably better, gzip works everywhere
+try:
+    import zstandard
+    ZSTD_AVAILABLE = True
+except ImportError:
+    ZSTD_AVAILABLE = False
+
+ARCHIVE_CONFIG = {
+    'archive_dir': 'archive',      # Stored inside data_dir
+    'compact_after_days': 30,      # Daily segments older than this are folded into one segment
+    'retention_days': 365,         # Days older than this can no longer be reconstructed
+    'keep_json_days': 2,           # raw_content_*.json files this recent survive --prune-json
+    'gzip_level': 9,
+    'zstd_level': 19
+}
+
+SEGMENT_NAME = re.compile(r'raw_(\d{4}-\d{2}-\d{2})_(\d{4}-\d{2}-\d{2})\.jsonl\.(gz|zst)$')
+RAW_FILE_DAY = re.compile(r'raw_content_(\d{4}-\d{2}-\d{2})\.json$')
+
+def open_segment(path, mode):
+    """Open a segment as text, compressed according to its extension"""
+    if str(path).removesuffix('.tmp').endswith('.zst'):
+        if not ZSTD_AVAILABLE:
+            raise RuntimeError(f"{path} is zstd-compressed; install zstandard to read it")
+        level = ARCHIVE_CONFIG['zstd_level']
+        cctx = zstandard.ZstdCompressor(level=level) if 'w' in mode else None
+        return zstandard.open(path, mode + 't', cctx=cctx, encoding='utf-8')
+    return gzip.open(path, mode + 't', encoding='utf-8', compresslevel=ARCHIVE_CONFIG['gzip_level'])
+
+def entry_keys(entries):
+    """Stable key per entry: its link hash, numbered when a link repeats within the day"""
+    counts = {}
+    keys = []
+    for entry in entries:
+        identity = entry.get('link') or entry.get('title', '')
+        base = hashlib.blake2b(identity.encode('utf-8'), digest_size=8).hexdigest()
+        n = counts[base] = counts.get(base, 0) + 1
+        keys.append(base if n == 1 else f"{base}#{n}")
+    return keys
+
+def diff_snapshots(previous, entries):
+    """Delta records turning the previous day's {key: entry} view into entries
+
+    Entries missing FROM the closing order record are gone; they need no record of their own.
+    """
+    keys = entry_keys(entries)
+    records = []
+
+    for key, entry in zip(keys, entries):
+        old = previous.get(key)
+        if old is None:
+            records.append({'op': 'put', 'key': key, 'entry': entry})
+        elif old != entry:
+            # Feeds keep old items, so most repeats differ only in fetch fields like timestamp
+            changed = {field: value for field, value in entry.items() if old.get(field, object()) != value}
+            removed = [field for field in old if field not in entry]
+            record = {'op': 'patch', 'key': key, 'set': changed}
+            if removed:
+                record['unset'] = removed
+            records.append(record)
+
+    records.append({'op': 'order', 'keys': keys})
+    return records
+
+def apply_records(view, records):
+    """Apply one day's records to a {key: entry} view; returns the day's entry list"""
+    order = list(view)
+    for record in records:
+        op = record['op']
+        if op == 'put':
+            view[record['key']] = record['entry']
+        elif op == 'patch':
+            entry = dict(view[record['key']])
+            entry.update(record['set'])
+            for field in record.get('unset', ()):
+                entry.pop(field, None)
+            view[record['key']] = entry
+        elif op == 'order':
+            order = record['keys']
+
+    # Keep only the day's entries, in the day's order
+    entries = [view[key] for key in order]
+    view.clear()
+    view.update(zip(order, entries))
+    return entries
+
+class ContentArchive:
+    """
+    A directory of compressed JSONL segments named raw_<first day>_<last day>. Each
+    segment holds one block per day: a header line ({"day", "kind"}) followed by that
+    day's records. A "full" block restates the whole day; a "delta" block only holds
+    differences FROM the block before it.
+    """
+
+    def __init__(self, archive_dir, use_zstd=None):
+        self.archive_dir = Path(archive_dir)
+        self.archive_dir.mkdir(parents=True, exist_ok=True)
+        self.extension = 'zst' if (ZSTD_AVAILABLE if use_zstd is None else use_zstd) else 'gz'
+        self._tail = None  # (day, view) of the newest archived day, saving a replay per add_day
+
+    def segments(self):
+        """(first day, last day, path) of every segment, oldest first"""
+        found = []
+        for path in self.archive_dir.iterdir():
+            match = SEGMENT_NAME.match(path.name)
+            if match:
+                found.append((match.group(1), match.group(2), path))
+        return sorted(found)
+
+    def days(self):
+        return [day for day, _, _ in self.iter_blocks()]
+
+    def iter_blocks(self, until=None):
+        """(day, kind, records) for every archived day up to `until`, oldest first"""
+        for first_day, _, path in self.segments():
+            if until and first_day > until:
+                return
+            with open_segment(path, 'r') as f:
+                day = kind = None
+                records = []
+                for line in f:
+                    record = json.loads(line)
+                    if 'day' in record:
+                        if day is not None:
+                            yield day, kind, records
+                        day, kind, records = record['day'], record['kind'], []
+                        if until and day > until:
+                            return
+                    else:
+                        records.append(record)
+                if day is not None:
+                    yield day, kind, records
+
+    def iter_days(self, until=None):
+        """(day, full raw content list) for every archived day up to `until`, in one replay"""
+        view = {}
+        for day, kind, records in self.iter_blocks(until=until):
+            if kind == 'full':
+                view = {}
+            yield day, apply_records(view, records)
+
+    def reconstruct(self, day):
+        """The full raw content list of an archived day, or None if it is not archived"""
+        for block_day, entries in self.iter_days(until=day):
+            if block_day == day:
+                return entries
+        return None
+
+    def _write_segment(self, blocks):
+        """Write (day, kind, records) blocks as one segment; returns its path"""
+        blocks = list(blocks)
+        path = self.archive_dir / f"raw_{blocks[0][0]}_{blocks[-1][0]}.jsonl.{self.extension}"
+        tmp_path = path.with_name(path.name + '.tmp')
+        with open_segment(tmp_path, 'w') as f:
+            for day, kind, records in blocks:
+                f.write(json.dumps({'day': day, 'kind': kind}) + '\n')
+                for record in records:
+                    f.write(json.dumps(record, ensure_ascii=False, default=str, separators=(',', ':')) + '\n')
+        os.replace(tmp_path, path)
+        return path
+
+    def _full_block(self, entries):
+        keys = entry_keys(entries)
+        records = [{'op': 'put', 'key': key, 'entry': entry} for key, entry in zip(keys, entries)]
+        records.append({'op': 'order', 'keys': keys})
+        return records
+
+    def add_day(self, day, entries):
+        """Archive one day's snapshot as a delta against the latest earlier day"""
+        segments = self.segments()
+        newest = segments[-1][1] if segments else None
+        if newest and (day < newest or (day == newest and segments[-1][0] != day)):
+            raise ValueError(f"{day} is not newer than the newest archived day {newest}")
+
+        if self._tail and self._tail[0] == newest and newest < day:
+            previous_day, view = self._tail[0], dict(self._tail[1])
+        else:
+            view = {}
+            previous_day = None
+            for block_day, kind, records in self.iter_blocks():
+                if block_day >= day:
+                    break
+                if kind == 'full':
+                    view = {}
+                apply_records(view, records)
+                previous_day = block_day
+
+        # Re-archiving the newest day replaces its segment
+        if newest == day:
+            segments[-1][2].unlink()
+
+        if previous_day is None:
+            path = self._write_segment([(day, 'full', self._full_block(entries))])
+        else:
+            path = self._write_segment([(day, 'delta', diff_snapshots(view, entries))])
+
+        self._tail = (day, dict(zip(entry_keys(entries), entries)))
+        return path
+
+    def compact(self, today=None, compact_after_days=None, retention_days=None):
+        """Fold old daily segments into one and drop days past the retention window"""
+        today = today or datetime.now().strftime("%Y-%m-%d")
+        compact_after_days = ARCHIVE_CONFIG['compact_after_days'] if compact_after_days is None else compact_after_days
+        retention_days = ARCHIVE_CONFIG['retention_days'] if retention_days is None else retention_days
+        compact_before = (datetime.strptime(today, "%Y-%m-%d") - timedelta(days=compact_after_days)).strftime("%Y-%m-%d")
+        retain_from = (datetime.strptime(today, "%Y-%m-%d") - timedelta(days=retention_days)).strftime("%Y-%m-%d")
+
+        old_segments = [segment for segment in self.segments() if segment[1] < compact_before]
+        expired = any(first_day < retain_from for first_day, _, _ in old_segments)
+        if len(old_segments) < 2 and not expired:
+            return 0
+        # Always keep the newest folded day: later segments are deltas against it
+        retain_from = min(retain_from, old_segments[-1][1])
+
+        # The first retained day becomes a full block, so nothing before it is needed
+        blocks = []
+        view = {}
+        for day, kind, records in self.iter_blocks(until=old_segments[-1][1]):
+            if kind == 'full':
+                view = {}
+            entries = apply_records(view, records)
+            if day < retain_from:
+                continue
+            if not blocks and kind != 'full':
+                kind, records = 'full', self._full_block(entries)
+            blocks.append((day, kind, records))
+
+        # Write the folded segment before removing what it replaces
+        folded = self._write_segment(blocks)
+        for _, _, path in old_segments:
+            if path != folded:
+                path.unlink()
+        self._tail = None
+
+        logger.info(f"🗜️ Compacted {len(old_segments)} segments into {len(blocks)} archived days")
+        return len(old_segments)
+
+    def size(self):
+        return sum(path.stat().st_size for _, _, path in self.segments())
+
+def open_archive(data_dir):
+    """The data directory's archive, or None if nothing was ever archived"""
+    archive_dir = Path(data_dir) / ARCHIVE_CONFIG['archive_dir']
+    return ContentArchive(archive_dir) if archive_dir.is_dir() else None
+
+def iter_raw_history(data_dir):
+    """(day, path or None, entries) for every day of raw content, oldest first
+
+    A day's raw_content file wins; days pruned FROM disk come FROM the archive.
+    """
+    files = {
+        RAW_FILE_DAY.search(path).group(1): path
+        for path in glob.glob(str(Path(data_dir) / 'raw_content_*.json'))
+    }
+    file_days = sorted(files)
+
+    def read_file(day):
+        with open(files[day], 'r', encoding='utf-8') as f:
+            return day, files[day], json.load(f)
+
+    # Both are oldest first: merge them while the archive replays
+    archive = open_archive(data_dir)
+    for day, entries in (archive.iter_days() if archive else ()):
+        while file_days and file_days[0] <= day:
+            yield read_file(file_days.pop(0))
+        if day not in files:
+            yield day, None, entries
+    for day in file_days:
+        yield read_file(day)
+
+def archive_raw_files(data_dir, archive, prune_json=False):
+    """Archive every raw_content_*.json newer than the archive, oldest first"""
+    segments = archive.segments()
+    newest = segments[-1][1] if segments else ''
+    archived = 0
+
+    files = sorted(glob.glob(str(Path(data_dir) / 'raw_content_*.json')))
+    for path in files:
+        day = RAW_FILE_DAY.search(path).group(1)
+        if day < newest or (day == newest and segments[-1][0] != newest):
+            continue
+        with open(path, 'r', encoding='utf-8') as f:
+            entries = json.load(f)
+        archive.add_day(day, entries)
+        archived += 1
+
+    if archived:
+        logger.info(f"🗄️ Archived {archived} days of raw content ({archive.size():,} bytes archived in total)")
+
+    if prune_json:
+        keep_from = (datetime.now() - timedelta(days=ARCHIVE_CONFIG['keep_json_days'])).strftime("%Y-%m-%d")
+        archived_days = set(archive.days())
+        for path in files:
+            day = RAW_FILE_DAY.search(path).group(1)
+            if day >= keep_from or day not in archived_days:
+                continue
+            # Only delete a snapshot the archive reproduces exactly
+            with open(path, 'r', encoding='utf-8') as f:
+                if archive.reconstruct(day) != json.load(f):
+                    logger.warning(f"⚠️ Keeping {path}: the archive does not reproduce it")
+                    continue
+            os.remove(path)
+            logger.info(f"   🧹 Removed {path}; it is in the archive")
+    return archived
+
+def main():
+    """Command line entry point for the raw content archive"""
+    # Imported here, for its defaults and logging setup: the backfill importer and
+    # rescoring use this module without starting the generator's log file
+    import daily_ai_content_generator as generator
+
+    parser = argparse.ArgumentParser(description="Delta-compressed archive of mytribal.ai raw content")
+    parser.add_argument('command', choices=('archive', 'compact', 'show'),
+                        help="archive: add new raw_content files; compact: fold and expire old days; "
+                             "show: print one day's raw content")
+    parser.add_argument('day', nargs='?', help="day to show (YYYY-MM-DD)")
+    parser.add_argument('--data-dir', default=generator.CONFIG['data_dir'], help="directory holding raw content")
+    parser.add_argument('--prune-json', action='store_true',
+                        help="after archiving, delete raw_content files the archive reproduces exactly "
+                             "(rescoring and backfill read pruned days back FROM the archive)")
+    parser.add_argument('--retention-days', type=int, default=ARCHIVE_CONFIG['retention_days'])
+    args = parser.parse_args()
+
+    archive = ContentArchive(Path(args.data_dir) / ARCHIVE_CONFIG['archive_dir'])
+    if args.command == 'archive':
+        archive_raw_files(args.data_dir, archive, args.prune_json)
+    elif args.command == 'compact':
+        archive.compact(retention_days=args.retention_days)
+    else:
+        entries = archive.reconstruct(args.day or datetime.now().strftime("%Y-%m-%d"))
+        if entries is None:
+            parser.error(f"{args.day} is not in the archive")
+        print(json.dumps(entries, indent=2, ensure_ascii=False))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+Content Entry
+Compact record for one fetched feed entry, used from scoring through serialization
+"""
+
+import sys
+
+class ContentEntry:
+    """A fetched, scored feed entry; __slots__ keeps per-entry memory small"""
+
+    __slots__ = (
+        'title', 'link', 'summary', 'published', 'source_name', 'source_url', 'category',
+        'weight', 'ai_relevance_score', 'timestamp', 'entry_status', 'parsed_date', 'days_old',
+        'priority_score', 'popularity', 'article_text', 'feed_position'
+    )
+
+    # Every entry that survives scoring is ready for publishing
+    ready_for_mytribal = True
+
+    def __init__(self, title, link, summary, published, source_name, source_url, category, weight,
+                 ai_relevance_score, timestamp, entry_status=None, parsed_date=None, days_old=999,
+                 priority_score=None, popularity=None, article_text=None, feed_position=None):
+        self.title = title
+        self.link = link
+        self.summary = summary
+        self.published = published
+        # Thousands of entries share a handful of sources, so share the strings too
+        self.source_name = sys.intern(source_name)
+        self.source_url = sys.intern(source_url)
+        self.category = sys.intern(category)
+        self.weight = weight
+        self.ai_relevance_score = ai_relevance_score
+        self.timestamp = timestamp
+        self.entry_status = entry_status
+        self.parsed_date = parsed_date
+        self.days_old = days_old
+        self.priority_score = priority_score
+        self.popularity = popularity  # 0-1 from upvotes/points, for sources that report them
+        self.article_text = article_text  # Full article text, for selected stories when extracted
+        self.feed_position = feed_position  # (source index, entry index) within a fetch run; never serialized
+
+    def to_dict(self):
+        """The JSON form written to raw_content_*.json, in the historical key order"""
+        data = {
+            'title': self.title,
+            'link': self.link,
+            'summary': self.summary,
+            'published': self.published,
+            'source_name': self.source_name,
+            'source_url': self.source_url,
+            'category': self.category,
+            'weight': self.weight,
+            'ai_relevance_score': self.ai_relevance_score,
+            'timestamp': self.timestamp,
+            'ready_for_mytribal': self.ready_for_mytribal
+        }
+        if self.entry_status is not None:
+            data['entry_status'] = self.entry_status
+        data['parsed_date'] = self.parsed_date
+        data['days_old'] = self.days_old
+        if self.priority_score is not None:
+            data['priority_score'] = self.priority_score
+        if self.popularity is not None:
+            data['popularity'] = self.popularity
+        if self.article_text is not None:
+            data['article_text'] = self.article_text
+        return data
+
+    @classmethod
+    def from_dict(cls, data):
+        """Rebuild an entry from its JSON form"""
+        return cls(
+            title=data.get('title', ''),
+            link=data.get('link', ''),
+            summary=data.get('summary', ''),
+            published=data.get('published', ''),
+            source_name=data.get('source_name', ''),
+            source_url=data.get('source_url', ''),
+            category=data.get('category', ''),
+            weight=data.get('weight', 0.0),
+            ai_relevance_score=data.get('ai_relevance_score', 0.0),
+            timestamp=data.get('timestamp', ''),
+            entry_status=data.get('entry_status'),
+            parsed_date=data.get('parsed_date'),
+            days_old=data.get('days_old', 999),
+            priority_score=data.get('priority_score'),
+            popularity=data.get('popularity'),
+            article_text=data.get('article_text')
+        )
+
+    def __repr__(self):
+        return f"ContentEntry({self.source_name!r}, {self.title[:40]!r}, score={self.ai_relevance_score})"
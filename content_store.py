@@ -0,0 +1,305 @@
+#!/usr/bin/env python3
+"""
+Content Store
+One SQLite database (WAL mode) holding raw entries, story outlines and their publish
+state, shared by the generator and the publisher
+"""
+
+import hashlib
+import json
+import logging
+import sqlite3
+import threading
+import time
+from datetime import datetime, timedelta
+from functools import lru_cache
+
+from seen_entry_index import normalize_link
+
+logger = logging.getLogger(__name__)
+
+PUBLISH_PUBLISHED = 'published'
+PUBLISH_FAILED = 'failed'
+PUBLISH_BACKFILLED = 'backfilled'  # Imported FROM before the store existed; never offered for publishing
+
+SCHEMA = """
+    CREATE TABLE IF NOT EXISTS raw_entries (
+        id INTEGER PRIMARY KEY,
+        day TEXT NOT NULL,
+        link_hash BLOB NOT NULL,
+        link TEXT,
+        source_name TEXT,
+        title TEXT,
+        fetched_at REAL NOT NULL,
+        data TEXT NOT NULL,
+        UNIQUE (day, link_hash)
+    );
+    CREATE INDEX IF NOT EXISTS idx_raw_link_hash ON raw_entries(link_hash);
+    CREATE INDEX IF NOT EXISTS idx_raw_source_day ON raw_entries(source_name, day);
+
+    CREATE TABLE IF NOT EXISTS outlines (
+        id INTEGER PRIMARY KEY,
+        day TEXT NOT NULL,
+        link_hash BLOB NOT NULL,
+        story_number INTEGER,
+        source_name TEXT,
+        title TEXT,
+        priority_score REAL,
+        created_at REAL NOT NULL,
+        data TEXT NOT NULL,
+        UNIQUE (day, link_hash)
+    );
+    CREATE INDEX IF NOT EXISTS idx_outlines_link_hash ON outlines(link_hash);
+    CREATE INDEX IF NOT EXISTS idx_outlines_source_day ON outlines(source_name, day);
+
+    CREATE TABLE IF NOT EXISTS publish_state (
+        outline_id INTEGER PRIMARY KEY REFERENCES outlines(id),
+        status TEXT NOT NULL,
+        attempts INTEGER NOT NULL DEFAULT 0,
+        post_url TEXT,
+        error TEXT,
+        updated_at REAL NOT NULL
+    );
+    CREATE INDEX IF NOT EXISTS idx_publish_status ON publish_state(status);
+
+    CREATE TABLE IF NOT EXISTS imported_files (
+        path TEXT PRIMARY KEY,
+        size INTEGER NOT NULL,
+        mtime REAL NOT NULL,
+        rows INTEGER NOT NULL,
+        imported_at REAL NOT NULL
+    );
+"""
+
+@lru_cache(maxsize=65536)
+def link_hash(link, fallback=''):
+    """16-byte key for a link, equal for trivially different URLs of one article"""
+    identity = normalize_link(link) or fallback.strip().lower()
+    return hashlib.blake2b(identity.encode('utf-8'), digest_size=16).digest()
+
+def today():
+    return datetime.now().strftime("%Y-%m-%d")
+
+class ContentStore:
+    """
+    Raw entries and outlines are keyed by (day, link), so a rerun updates rows in
+    place instead of rewriting a day's snapshot. WAL mode lets the publisher read
+    while the generator writes; concurrent writers wait on the busy timeout.
+
+    Writes only ever add rows or update one (day, link) row, never rewrite a day.
+    Updating in place, not appending versions, keeps one row per story a day: the
+    publish state points at an outline's id, which the upsert preserves, and an
+    entry edited at its source replaces the stale copy instead of ranking twice.
+    Past days are only ever added to (see backfill_raw_entries).
+    """
+
+    def __init__(self, path, timeout=30):
+        self.path = str(path)
+        self._lock = threading.Lock()
+
+        self._conn = sqlite3.connect(self.path, timeout=timeout, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(SCHEMA)
+        self._conn.commit()
+
+    @staticmethod
+    def _raw_row(entry, day, now):
+        return (
+            day, link_hash(entry.get('link'), entry.get('title', '')), entry.get('link'),
+            entry.get('source_name'), entry.get('title'), now,
+            json.dumps(entry, ensure_ascii=False, default=str)
+        )
+
+    def add_raw_entries(self, entries, day=None):
+        """Insert raw entry dicts for a day in one transaction, updating only entries that changed"""
+        day = day or today()
+        now = time.time()
+        rows = [self._raw_row(entry, day, now) for entry in entries]
+
+        with self._lock, self._conn:
+            self._conn.executemany("""
+                INSERT INTO raw_entries (day, link_hash, link, source_name, title, fetched_at, data)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT (day, link_hash) DO UPDATE SET
+                    title = excluded.title, fetched_at = excluded.fetched_at, data = excluded.data
+                WHERE raw_entries.data != excluded.data
+            """, rows)
+        return len(rows)
+
+    def backfill_raw_entries(self, dated_entries):
+        """Insert (day, entry dict) pairs in one transaction, never overwriting stored rows
+
+        A link already stored under any day is skipped: feeds repeat their items for
+        days, and the earliest day seen is the one that counts. Returns how many rows were new.
+        """
+        now = time.time()
+        rows = [self._raw_row(entry, day, now) for day, entry in dated_entries]
+
+        with self._lock, self._conn:
+            before = self._conn.total_changes
+            self._conn.executemany("""
+                INSERT INTO raw_entries (day, link_hash, link, source_name, title, fetched_at, data)
+                SELECT ?1, ?2, ?3, ?4, ?5, ?6, ?7
+                WHERE NOT EXISTS (SELECT 1 FROM raw_entries WHERE link_hash = ?2)
+                ON CONFLICT (day, link_hash) DO NOTHING
+            """, rows)
+            return self._conn.total_changes - before
+
+    def write_through(self, entries, to_json, day=None, batch_size=500):
+        """Store entries in batches as they stream past, yielding each one unchanged"""
+        batch = []
+        for entry in entries:
+            batch.append(to_json(entry))
+            if len(batch) >= batch_size:
+                self.add_raw_entries(batch, day)
+                batch = []
+            yield entry
+
+        if batch:
+            self.add_raw_entries(batch, day)
+
+    def raw_entries(self, day=None, source_name=None):
+        """Raw entry dicts stored for a day, optionally from one source"""
+        query = "SELECT data FROM raw_entries WHERE day = ?"
+        params = [day or today()]
+        if source_name:
+            query += " AND source_name = ?"
+            params.append(source_name)
+
+        with self._lock:
+            rows = self._conn.execute(query + " ORDER BY id", params).fetchall()
+        return [json.loads(row[0]) for row in rows]
+
+    def add_outlines(self, outlines, day=None, replace=False):
+        """Store a day's story outlines; returns their row ids
+
+        With replace=True the day's other outlines are dropped first, unless they
+        already have a publish state, mirroring a fresh run rewriting the day's file.
+        """
+        day = day or today()
+        now = time.time()
+        ids = []
+
+        with self._lock, self._conn:
+            if replace:
+                self._conn.execute("""
+                    DELETE FROM outlines
+                    WHERE day = ? AND id NOT IN (SELECT outline_id FROM publish_state)
+                """, (day,))
+
+            for outline in outlines:
+                content = outline.get('content', {})
+                key = link_hash(content.get('original_link'), content.get('title', ''))
+                self._conn.execute("""
+                    INSERT INTO outlines (day, link_hash, story_number, source_name, title, priority_score, created_at, data)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                    ON CONFLICT (day, link_hash) DO UPDATE SET
+                        story_number = excluded.story_number, priority_score = excluded.priority_score,
+                        data = excluded.data
+                """, (
+                    day, key, outline.get('story_number'), outline.get('source_info', {}).get('name'),
+                    content.get('title'), outline.get('priority_score'), now,
+                    json.dumps(outline, ensure_ascii=False, default=str)
+                ))
+                ids.append(self._conn.execute(
+                    "SELECT id FROM outlines WHERE day = ? AND link_hash = ?", (day, key)
+                ).fetchone()[0])
+        return ids
+
+    def backfill_outlines(self, outlines, day):
+        """Insert a past day's outlines without touching stored ones; returns how many were new
+
+        New rows get the backfilled publish state: whether they were published is unknown.
+        """
+        now = time.time()
+        added = 0
+
+        with self._lock, self._conn:
+            for outline in outlines:
+                content = outline.get('content', {})
+                cursor = self._conn.execute("""
+                    INSERT INTO outlines (day, link_hash, story_number, source_name, title, priority_score, created_at, data)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                    ON CONFLICT (day, link_hash) DO NOTHING
+                """, (
+                    day, link_hash(content.get('original_link'), content.get('title', '')),
+                    outline.get('story_number'), outline.get('source_info', {}).get('name'),
+                    content.get('title'), outline.get('priority_score'), now,
+                    json.dumps(outline, ensure_ascii=False, default=str)
+                ))
+                if cursor.rowcount:
+                    self._conn.execute("""
+                        INSERT INTO publish_state (outline_id, status, attempts, updated_at) VALUES (?, ?, 0, ?)
+                    """, (cursor.lastrowid, PUBLISH_BACKFILLED, now))
+                    added += 1
+        return added
+
+    def is_imported(self, path, size, mtime):
+        """Whether a file with this size and mtime was already fully imported"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT size, mtime FROM imported_files WHERE path = ?", (str(path),)
+            ).fetchone()
+        return row == (size, mtime)
+
+    def mark_imported(self, path, size, mtime, rows):
+        with self._lock, self._conn:
+            self._conn.execute("""
+                INSERT OR REPLACE INTO imported_files (path, size, mtime, rows, imported_at) VALUES (?, ?, ?, ?, ?)
+            """, (str(path), size, mtime, rows, time.time()))
+
+    def day_outlines(self, day=None):
+        """A day's outline dicts in story order"""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT data FROM outlines WHERE day = ? ORDER BY story_number, id", (day or today(),)
+            ).fetchall()
+        return [json.loads(row[0]) for row in rows]
+
+    def unpublished_outlines(self, days=3, max_attempts=3):
+        """(outline_id, outline) for recent outlines never published, oldest day first
+
+        Failed outlines come back until they have been tried max_attempts times.
+        """
+        since = (datetime.now() - timedelta(days=days - 1)).strftime("%Y-%m-%d")
+        with self._lock:
+            rows = self._conn.execute("""
+                SELECT o.id, o.data FROM outlines o
+                LEFT JOIN publish_state p ON p.outline_id = o.id
+                WHERE o.day >= ? AND (p.status IS NULL OR (p.status = ? AND p.attempts < ?))
+                ORDER BY o.day, o.story_number, o.id
+            """, (since, PUBLISH_FAILED, max_attempts)).fetchall()
+        return [(outline_id, json.loads(data)) for outline_id, data in rows]
+
+    def outline_state(self, outline):
+        """(outline_id, publish status) of the newest stored copy of an outline, or (None, None)"""
+        content = outline.get('content', {})
+        with self._lock:
+            row = self._conn.execute("""
+                SELECT o.id, p.status FROM outlines o
+                LEFT JOIN publish_state p ON p.outline_id = o.id
+                WHERE o.link_hash = ?
+                ORDER BY o.day DESC LIMIT 1
+            """, (link_hash(content.get('original_link'), content.get('title', '')),)).fetchone()
+        return row or (None, None)
+
+    def _set_publish_state(self, outline_id, status, post_url=None, error=None):
+        with self._lock, self._conn:
+            self._conn.execute("""
+                INSERT INTO publish_state (outline_id, status, attempts, post_url, error, updated_at)
+                VALUES (?, ?, 1, ?, ?, ?)
+                ON CONFLICT (outline_id) DO UPDATE SET
+                    status = excluded.status, attempts = attempts + 1, post_url = excluded.post_url,
+                    error = excluded.error, updated_at = excluded.updated_at
+            """, (outline_id, status, post_url, error, time.time()))
+
+    def mark_published(self, outline_id, post_url=None):
+        self._set_publish_state(outline_id, PUBLISH_PUBLISHED, post_url=post_url)
+
+    def mark_failed(self, outline_id, error=None):
+        self._set_publish_state(outline_id, PUBLISH_FAILED, error=error)
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
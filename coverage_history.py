@@ -0,0 +1,208 @@
+#!/usr/bin/env python3
+"""
+Coverage History
+Persistent LSH index over past story outlines and published posts, so ranking can
+skip topics mytribal.ai already covered
+"""
+
+import glob
+import hashlib
+import json
+import logging
+import os
+import re
+import sqlite3
+import threading
+import time
+from datetime import datetime
+from email.utils import parsedate_to_datetime
+from pathlib import Path
+
+from near_duplicates import MinHasher, shingle_text, jaccard_similarity
+
+logger = logging.getLogger(__name__)
+
+# Prefixes our own titles gain on publishing; they say nothing about the topic
+PUBLISHED_TITLE_PREFIX = re.compile(r'^(AI Update|Breaking|Latest):\s*', re.IGNORECASE)
+
+def _parse_time(value, default):
+    """Epoch seconds from an ISO or RFC 822 date string"""
+    if value:
+        try:
+            return datetime.fromisoformat(value.replace('Z', '+00:00')).timestamp()
+        except ValueError:
+            pass
+        try:
+            return parsedate_to_datetime(value).timestamp()
+        except (TypeError, ValueError):
+            pass
+    return default
+
+def load_outline_stories(path):
+    """(title, summary, link, covered_at) for each outline in a mytribal_stories_*.json file"""
+    with open(path, 'r', encoding='utf-8') as f:
+        outlines = json.load(f)
+
+    file_time = os.path.getmtime(path)
+    for outline in outlines:
+        content = outline.get('content', {})
+        yield (
+            content.get('title', ''),
+            content.get('summary', ''),
+            content.get('original_link', ''),
+            _parse_time(outline.get('timestamp'), file_time)
+        )
+
+def load_published_posts(path):
+    """(title, summary, link, covered_at) for each post in an exported site RSS file"""
+    with open(path, 'r', encoding='utf-8') as f:
+        posts = json.load(f)
+
+    file_time = os.path.getmtime(path)
+    for post in posts:
+        yield (
+            PUBLISHED_TITLE_PREFIX.sub('', post.get('title', '')),
+            post.get('summary', ''),
+            post.get('link', ''),
+            _parse_time(post.get('published'), file_time)
+        )
+
+class CoverageHistory:
+    """SQLite-backed MinHash/LSH index answering "did we cover this in the last N days?"."""
+
+    def __init__(self, path, num_perm=64, bands=32):
+        self.path = str(path)
+        self.hasher = MinHasher(num_perm)
+        self.bands = bands
+        self.rows = num_perm // bands
+        self._lock = threading.Lock()
+
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.executescript("""
+            CREATE TABLE IF NOT EXISTS covered_stories (
+                id INTEGER PRIMARY KEY,
+                source TEXT NOT NULL,
+                fingerprint BLOB NOT NULL,
+                title TEXT NOT NULL,
+                link TEXT,
+                shingles TEXT NOT NULL,
+                covered_at REAL NOT NULL,
+                UNIQUE (source, fingerprint)
+            );
+            CREATE TABLE IF NOT EXISTS story_bands (
+                band_key BLOB NOT NULL,
+                story_id INTEGER NOT NULL,
+                PRIMARY KEY (band_key, story_id)
+            ) WITHOUT ROWID;
+            CREATE TABLE IF NOT EXISTS indexed_files (
+                source TEXT PRIMARY KEY,
+                mtime REAL NOT NULL
+            );
+        """)
+        self._conn.commit()
+
+    def _band_keys(self, signature):
+        """One 8-byte key per LSH band of a signature"""
+        keys = []
+        for band in range(self.bands):
+            values = signature[band * self.rows:(band + 1) * self.rows]
+            data = band.to_bytes(2, 'little') + b''.join(value.to_bytes(4, 'little') for value in values)
+            keys.append(hashlib.blake2b(data, digest_size=8).digest())
+        return keys
+
+    def _index_file(self, source, stories):
+        """Replace everything indexed from one source file with its current stories"""
+        rows = 0
+        self._conn.execute(
+            "DELETE FROM story_bands WHERE story_id IN (SELECT id FROM covered_stories WHERE source = ?)", (source,)
+        )
+        self._conn.execute("DELETE FROM covered_stories WHERE source = ?", (source,))
+
+        for title, summary, link, covered_at in stories:
+            shingles = shingle_text(title, summary)
+            signature = self.hasher.signature(shingles)
+            if signature is None:
+                continue
+
+            fingerprint = hashlib.blake2b((link or title).encode('utf-8'), digest_size=16).digest()
+            cursor = self._conn.execute(
+                """INSERT OR IGNORE INTO covered_stories (source, fingerprint, title, link, shingles, covered_at)
+                   VALUES (?, ?, ?, ?, ?, ?)""",
+                (source, fingerprint, title, link, ' '.join(sorted(shingles)), covered_at)
+            )
+            if cursor.rowcount:
+                self._conn.executemany(
+                    "INSERT OR IGNORE INTO story_bands (band_key, story_id) VALUES (?, ?)",
+                    [(band_key, cursor.lastrowid) for band_key in self._band_keys(signature)]
+                )
+                rows += 1
+        return rows
+
+    def sync(self, outline_files=(), published_files=()):
+        """Index new or changed files; unchanged files (by mtime) are skipped"""
+        indexed = 0
+        with self._lock:
+            known = dict(self._conn.execute("SELECT source, mtime FROM indexed_files"))
+            for paths, loader in ((outline_files, load_outline_stories), (published_files, load_published_posts)):
+                for path in paths:
+                    source = str(path)
+                    try:
+                        mtime = os.path.getmtime(path)
+                        if known.get(source) == mtime:
+                            continue
+                        indexed += self._index_file(source, loader(path))
+                    except (OSError, ValueError) as e:
+                        logger.warning(f"⚠️ Could not index coverage history FROM {path}: {e}")
+                        continue
+                    self._conn.execute(
+                        "INSERT OR REPLACE INTO indexed_files (source, mtime) VALUES (?, ?)", (source, mtime)
+                    )
+            self._conn.commit()
+
+        if indexed:
+            logger.info(f"🗂️ Indexed {indexed} past stories into coverage history")
+        return indexed
+
+    def find_similar(self, title, summary, days, threshold, exclude_sources=()):
+        """The most similar story covered in the last `days` days as (title, link, similarity), or None"""
+        shingles = shingle_text(title, summary)
+        signature = self.hasher.signature(shingles)
+        if signature is None:
+            return None
+
+        band_keys = self._band_keys(signature)
+        cutoff = time.time() - days * 86400
+        with self._lock:
+            rows = self._conn.execute(
+                f"""SELECT DISTINCT s.source, s.title, s.link, s.shingles
+                    FROM story_bands b JOIN covered_stories s ON s.id = b.story_id
+                    WHERE b.band_key IN ({','.join('?' * len(band_keys))}) AND s.covered_at >= ?""",
+                (*band_keys, cutoff)
+            ).fetchall()
+
+        best = None
+        for source, covered_title, link, covered_shingles in rows:
+            if source in exclude_sources:
+                continue
+            # Band collisions are only candidates; confirm with exact Jaccard
+            similarity = jaccard_similarity(shingles, set(covered_shingles.split(' ')))
+            if similarity >= threshold and (best is None or similarity > best[2]):
+                best = (covered_title, link, similarity)
+        return best
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+    def __len__(self):
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM covered_stories").fetchone()[0]
+
+def open_coverage_history(data_dir, index_file, published_files=()):
+    """Open the history index in data_dir and bring it up to date with every past outline file"""
+    history = CoverageHistory(Path(data_dir) / index_file)
+    history.sync(
+        sorted(glob.glob(str(Path(data_dir) / 'mytribal_stories_*.json'))),
+        [path for path in published_files if os.path.exists(path)]
+    )
+    return history
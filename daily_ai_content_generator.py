@@ -4,15 +4,44 @@ Daily AI Content Generator
 Pulls data FROM external RSS feeds and prepares it for publishing TO mytribal.ai website
 """
 
+import argparse
+import fcntl
 import feedparser
 import requests
+from requests.adapters import HTTPAdapter
 from datetime import datetime, timedelta
 import json
 import time
 import os
+import sys
 import logging
+import multiprocessing
 from pathlib import Path
 import re
+import calendar
+import heapq
+import itertools
+import textwrap
+import threading
+from contextlib import contextmanager
+from functools import lru_cache, partial
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, as_completed
+from urllib.parse import urlparse
+from feed_state import FeedStateStore, conditional_headers
+from feed_health import backoff_remaining, record_success, record_failure
+from bounded_download import download_body
+from pull_feed_parser import parse_feed
+from feed_fixtures import RecordingSession, ReplaySession
+from source_connectors import get_connector, json_fetcher
+from article_extractor import attach_article_text
+from seen_entry_index import SeenEntryIndex, ENTRY_UNCHANGED, entry_fingerprint
+from near_duplicates import LSHIndex, MinHasher, shingle_text, jaccard_similarity
+from coverage_history import open_coverage_history
+from content_store import ContentStore
+from keyword_matcher import KeywordMatcher
+from batch_relevance import RelevanceScorer
+from content_entry import ContentEntry
+from normalized_text import normalize_text, entry_text
 
 # Configure logging
 logging.basicConfig(
@@ -52,16 +81,20 @@ EXTERNAL_RSS_SOURCES = {
         'max_entries': 10
     },
     'reddit_ai': {
-        'url': 'https://www.reddit.com/r/artificial/hot.rss?limit=10',
+        'url': 'https://www.reddit.com/r/artificial/hot.json?limit=25',
+        'connector': 'reddit_json',
         'category': 'community_discussion',
         'weight': 0.7,
-        'max_entries': 10
+        'max_entries': 10,
+        'min_score': 10
     },
     'hacker_news': {
-        'url': 'https://news.ycombinator.com/rss',
+        'url': 'https://hacker-news.firebaseio.com/v0/topstories.json',
+        'connector': 'hacker_news_api',
         'category': 'tech_community',
         'weight': 0.8,
-        'max_entries': 15
+        'max_entries': 15,
+        'min_score': 50
     },
     'wired_ai': {
         'url': 'https://www.wired.com/feed/rss',
@@ -87,12 +120,42 @@ AI_KEYWORDS = [
     'predictive', 'analytics', 'big data', 'cloud computing', 'edge computing'
 ]
 
+# Trending terms added to SEO keywords when present
+TRENDING_TERMS = ['2025', 'trending', 'latest', 'breakthrough', 'innovation']
+
+# Compiled once; finds AI keywords and trending terms in a single pass
+KEYWORD_MATCHER = KeywordMatcher(AI_KEYWORDS + TRENDING_TERMS)
+AI_KEYWORD_SET = frozenset(AI_KEYWORDS)
+RELEVANCE_SCORER = RelevanceScorer(AI_KEYWORDS)
+
+REQUEST_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36'
+}
+
 # Configuration
 CONFIG = {
     'data_dir': 'content_for_mytribal',
     'max_stories_per_day': 5,
     'min_ai_relevance_score': 0.6,
-    'request_delay': 1,
+    'request_delay': 1,  # Minimum seconds between requests to the same host
+    'request_timeout': 15,
+    'max_feed_bytes': 5 * 1024 * 1024,  # Decompressed feed body cap
+    'max_download_seconds': 30,  # Wall-clock cap for one feed download
+    'incremental_parsing': True,  # Pull-parse only max_entries; feedparser handles malformed feeds
+    'max_fetch_workers': 16,
+    'parse_workers': 0,  # Processes for parsing and scoring; 0 parses on the fetch threads
+    'feed_state_file': 'feed_state.json',  # Stored inside data_dir
+    'seen_index_file': 'seen_entries.db',  # Stored inside data_dir
+    'seen_index_max_age_days': 30,
+    'content_store_file': 'content_store.db',  # Stored inside data_dir; shared with the publisher
+    'write_lock_file': 'content_write.lock',  # Stored inside data_dir; serializes writers of today's files
+    'near_duplicate_threshold': 0.22,  # Jaccard similarity of title/summary shingles
+    'history_index_file': 'coverage_history.db',  # Stored inside data_dir
+    'history_window_days': 30,  # Skip stories covered by an outline or post this recently
+    'history_threshold': 0.3,  # Stricter than near_duplicate_threshold: follow-ups to a topic still pass
+    'published_history_files': ['mytribal_rss_data.json', 'rss_data/mytribal_rss_master.json'],
+    'extract_articles': False,  # Fetch full article text for selected stories (cached in data_dir)
+    'popularity_boost': 0.5,  # Fully popular entries (HN points, Reddit upvotes) rank up to 50% higher
     'backup_count': 5
 }
 
@@ -101,95 +164,399 @@ def ensure_data_directory():
     Path(CONFIG['data_dir']).mkdir(exist_ok=True)
     return CONFIG['data_dir']
 
-def fetch_external_rss_content():
-    """Fetch content FROM external RSS feeds"""
-    logger.info("🔍 Fetching content FROM external RSS feeds...")
+def create_http_session():
+    """Create a pooled HTTP session shared by all feed fetches"""
+    session = requests.Session()
+    session.headers.update(REQUEST_HEADERS)
     
-    all_external_content = []
+    # Keep one connection pool per host and enough slots for every worker
+    adapter = HTTPAdapter(
+        pool_connections=CONFIG['max_fetch_workers'],
+        pool_maxsize=CONFIG['max_fetch_workers']
+    )
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    return session
+
+class HostThrottle:
+    """Enforce a minimum delay between requests to the same host"""
     
-    for source_name, source_info in EXTERNAL_RSS_SOURCES.items():
-        try:
-            logger.info(f"📡 Fetching FROM: {source_name}")
+    def __init__(self, delay):
+        self.delay = delay
+        self._lock = threading.Lock()
+        self._next_slot = {}
+    
+    def wait(self, url):
+        """Block until this host may be contacted again"""
+        host = urlparse(url).netloc.lower()
+        
+        # Reserve the next free slot for the host, then sleep outside the lock
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot.get(host, now))
+            self._next_slot[host] = slot + self.delay
+        
+        if slot > now:
+            time.sleep(slot - now)
+
+def parse_entry_date(published, title):
+    """Return (parsed_date, days_old) for an entry's published string"""
+    try:
+        if published:
+            if 'T' in published:
+                pub_date = datetime.fromisoformat(published.replace('Z', '+00:00'))
+            else:
+                # Handle RSS date format
+                pub_date = datetime.strptime(published, '%a, %d %b %Y %H:%M:%S %z')
             
-            headers = {
-                'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36'
-            }
+            return pub_date.isoformat(), (datetime.now(pub_date.tzinfo) - pub_date).days
             
-            response = requests.get(source_info['url'], headers=headers, timeout=15)
-            response.raise_for_status()
+    except Exception as e:
+        logger.warning(f"Could not parse date for entry: {title[:50]}... Error: {e}")
+    
+    return None, 999  # Default to old content
+
+def build_content_entries(entries, source_name, source_info, statuses=None):
+    """Score parsed entries in one batch; returns a ContentEntry, or None if not AI-relevant, per entry"""
+    results = []
+    
+    # Calculate AI relevance scores for the whole batch at once
+    scores = calculate_ai_relevance_batch(
+        [(entry.title, entry.get('summary', '')) for entry in entries]
+    )
+    
+    for entry, entry_status, ai_relevance in zip(entries, statuses or itertools.repeat(None), scores):
+        ai_relevance = float(ai_relevance)
+        
+        if ai_relevance >= CONFIG['min_ai_relevance_score']:
+            published = entry.get('published', entry.get('updated', ''))
             
-            feed = feedparser.parse(response.content)
+            # Parse publication date
+            parsed_date, days_old = parse_entry_date(published, entry.title)
             
-            if feed.entries:
-                logger.info(f"✅ Found {len(feed.entries)} entries FROM {source_name}")
-                
-                # Process entries up to max limit
-                for entry in feed.entries[:source_info['max_entries']]:
-                    # Calculate AI relevance score
-                    ai_relevance = calculate_ai_relevance(entry.title, entry.get('summary', ''))
-                    
-                    if ai_relevance >= CONFIG['min_ai_relevance_score']:
-                        content_entry = {
-                            'title': entry.title,
-                            'link': entry.get('link', ''),
-                            'summary': entry.get('summary', entry.get('contentSnippet', '')),
-                            'published': entry.get('published', entry.get('updated', '')),
-                            'source_name': source_name,
-                            'source_url': source_info['url'],
-                            'category': source_info['category'],
-                            'weight': source_info['weight'],
-                            'ai_relevance_score': ai_relevance,
-                            'timestamp': datetime.now().isoformat(),
-                            'ready_for_mytribal': True
-                        }
-                        
-                        # Parse publication date
-                        try:
-                            if content_entry['published']:
-                                if 'T' in content_entry['published']:
-                                    pub_date = datetime.fromisoformat(content_entry['published'].replace('Z', '+00:00'))
-                                else:
-                                    # Handle RSS date format
-                                    pub_date = datetime.strptime(content_entry['published'], '%a, %d %b %Y %H:%M:%S %z')
-                                
-                                content_entry['parsed_date'] = pub_date.isoformat()
-                                content_entry['days_old'] = (datetime.now(pub_date.tzinfo) - pub_date).days
-                            else:
-                                content_entry['parsed_date'] = None
-                                content_entry['days_old'] = 999  # Default to old content
-                                
-                        except Exception as e:
-                            logger.warning(f"Could not parse date for entry: {entry.title[:50]}... Error: {e}")
-                            content_entry['parsed_date'] = None
-                            content_entry['days_old'] = 999  # Default to old content
-                        
-                        all_external_content.append(content_entry)
-                        
-                        logger.info(f"   📝 AI Content: {entry.title[:60]}... (Score: {ai_relevance:.2f})")
-                    else:
-                        logger.debug(f"   ⚠️ Low AI relevance: {entry.title[:60]}... (Score: {ai_relevance:.2f})")
-                
-            else:
-                logger.warning(f"❌ No entries found FROM {source_name}")
-                
-        except Exception as e:
-            logger.error(f"❌ Error fetching FROM {source_name}: {e}")
-            continue
+            content_entry = ContentEntry(
+                title=entry.title,
+                link=entry.get('link', ''),
+                summary=entry.get('summary', entry.get('contentSnippet', '')),
+                published=published,
+                source_name=source_name,
+                source_url=source_info['url'],
+                category=source_info['category'],
+                weight=source_info['weight'],
+                ai_relevance_score=ai_relevance,
+                timestamp=datetime.now().isoformat(),
+                entry_status=entry_status,
+                parsed_date=parsed_date,
+                days_old=days_old,
+                popularity=entry.get('popularity')
+            )
+            
+            results.append(content_entry)
+            
+            logger.info(f"   📝 AI Content: {entry.title[:60]}... (Score: {ai_relevance:.2f})")
+        else:
+            results.append(None)
+            logger.debug(f"   ⚠️ Low AI relevance: {entry.title[:60]}... (Score: {ai_relevance:.2f})")
+    
+    return results
+
+def process_feed_entries(feed, source_name, source_info, seen_index=None):
+    """Score parsed feed entries and build content entries for AI-relevant ones"""
+    # Process entries up to max limit, skipping ones already handled on earlier runs
+    pending = []
+    statuses = []
+    for entry in feed.entries[:source_info['max_entries']]:
+        entry_status = None
+        if seen_index is not None:
+            entry_status = seen_index.classify(
+                entry.get('id', ''), entry.get('link', ''), entry.title, entry.get('summary', '')
+            )
+            if entry_status == ENTRY_UNCHANGED:
+                logger.debug(f"   ♻️ Already processed: {entry.title[:60]}...")
+                continue
+        pending.append(entry)
+        statuses.append(entry_status)
+    
+    content = build_content_entries(pending, source_name, source_info, statuses)
+    return [content_entry for content_entry in content if content_entry is not None]
+
+def parse_source_body(body, source_info):
+    """Parse a downloaded feed body, only as far as the source's entry cap"""
+    if CONFIG['incremental_parsing']:
+        return parse_feed(body, source_info['max_entries'])
+    return feedparser.parse(body)
+
+def init_parse_worker(config):
+    """Process-pool initializer: a spawned worker starts FROM the module defaults"""
+    CONFIG.update(config)
+
+def parse_and_score_feed(body, source_name, source_info):
+    """Process-pool task: parse and score a feed body into compact, picklable records
+    
+    Returns (entry_times, records) with one (key, content_hash, ContentEntry or None)
+    record per entry. Classification against the seen-entry index stays in the
+    parent process, which owns the SQLite connection.
+    """
+    feed = parse_source_body(body, source_info)
+    entries = feed.entries[:source_info['max_entries']]
+    
+    fingerprints = [
+        entry_fingerprint(entry.get('id', ''), entry.get('link', ''), entry.title, entry.get('summary', ''))
+        for entry in entries
+    ]
+    content = build_content_entries(entries, source_name, source_info)
+    
+    return entry_timestamps(feed), [
+        (key, content_hash, content_entry) for (key, content_hash), content_entry in zip(fingerprints, content)
+    ]
+
+def merge_scored_records(records, seen_index=None):
+    """Classify records from parse_and_score_feed, keeping AI-relevant entries not seen unchanged"""
+    source_content = []
+    for key, content_hash, content_entry in records:
+        entry_status = None
+        if seen_index is not None:
+            entry_status = seen_index.classify_fingerprint(key, content_hash)
+            if entry_status == ENTRY_UNCHANGED:
+                continue
+        if content_entry is not None:
+            content_entry.entry_status = entry_status
+            source_content.append(content_entry)
+    return source_content
+
+def entry_timestamps(feed):
+    """Publication times of all entries in a parsed feed, as epoch seconds"""
+    timestamps = []
+    for entry in feed.entries:
+        parsed = entry.get('published_parsed') or entry.get('updated_parsed')
+        if parsed:
+            timestamps.append(calendar.timegm(parsed))
+    return timestamps
+
+def fetch_connector_source(session, throttle, feed_state, seen_index, source_name, source_info):
+    """Fetch a source through its JSON API connector instead of RSS"""
+    url = source_info['url']
+    fetch_json = json_fetcher(
+        session,
+        timeout=CONFIG['request_timeout'],
+        max_bytes=CONFIG['max_feed_bytes'],
+        max_seconds=CONFIG['max_download_seconds'],
+        throttle=throttle
+    )
+    
+    try:
+        logger.info(f"📡 Fetching FROM: {source_name} ({source_info['connector']})")
+        feed = get_connector(source_info['connector'])(fetch_json, source_info)
+    except requests.RequestException as e:
+        response = e.response
+        logger.error(f"❌ Error fetching FROM {source_name}: {e}")
+        if response is not None:
+            record_failure(feed_state, url, response.status_code, response.headers.get('Retry-After'))
+        else:
+            record_failure(feed_state, url, type(e).__name__)
+        return []
+    except Exception as e:
+        # Malformed JSON, an oversized or stalled download: back off like any other failure
+        logger.error(f"❌ Error fetching FROM {source_name}: {e}")
+        record_failure(feed_state, url, type(e).__name__)
+        return []
+    
+    record_success(feed_state, url, 200)
+    feed_state.record_poll(url, entry_timestamps(feed))
+    
+    if feed.entries:
+        logger.info(f"✅ Found {len(feed.entries)} entries FROM {source_name}")
+        return process_feed_entries(feed, source_name, source_info, seen_index)
+    
+    logger.warning(f"❌ No entries found FROM {source_name}")
+    return []
+
+def fetch_source_content(session, throttle, feed_state, seen_index, source_name, source_info, parse_pool=None):
+    """Fetch and process a single external RSS source
+    
+    With a parse_pool (a ProcessPoolExecutor) parsing and scoring run in another
+    process while this fetch thread only waits on the result.
+    """
+    url = source_info['url']
+    state = feed_state.get(url)
+    
+    # Circuit breaker: leave failing feeds alone until their backoff expires
+    remaining = backoff_remaining(state)
+    if remaining:
+        logger.info(f"⏭️ Skipping {source_name}: backing off for {remaining / 60:.0f} more minutes "
+                    f"after {state.get('failures', 0)} failures (last status {state.get('last_status')})")
+        return []
+    
+    if source_info.get('connector'):
+        return fetch_connector_source(session, throttle, feed_state, seen_index, source_name, source_info)
+    
+    try:
+        throttle.wait(url)
+        logger.info(f"📡 Fetching FROM: {source_name}")
         
-        time.sleep(CONFIG['request_delay'])
+        # Ask the server to skip the body if the feed has not changed
+        headers = conditional_headers(state)
+        started = time.monotonic()
+        response, body, wire_bytes = download_body(
+            session, url, headers,
+            timeout=CONFIG['request_timeout'],
+            max_bytes=CONFIG['max_feed_bytes'],
+            max_seconds=CONFIG['max_download_seconds']
+        )
+    except requests.RequestException as e:
+        logger.error(f"❌ Error fetching FROM {source_name}: {e}")
+        record_failure(feed_state, url, type(e).__name__)
+        return []
+    
+    if response.status_code >= 400:
+        logger.error(f"❌ HTTP {response.status_code} fetching FROM {source_name}")
+        record_failure(feed_state, url, response.status_code, response.headers.get('Retry-After'))
+        return []
+    
+    record_success(feed_state, url, response.status_code)
+    feed_state.update(url, last_bytes=wire_bytes)
+    if body:
+        encoding = response.headers.get('Content-Encoding', 'identity')
+        logger.info(f"📦 {source_name}: {wire_bytes:,} bytes transferred ({encoding}), "
+                    f"{len(body):,} decoded in {time.monotonic() - started:.2f}s")
+    
+    try:
+        if response.status_code == 304:
+            logger.info(f"♻️ Not modified since last run: {source_name}")
+            feed_state.record_poll(url)
+            return []
+        
+        if parse_pool is not None:
+            entry_times, records = parse_pool.submit(parse_and_score_feed, body, source_name, source_info).result()
+        else:
+            feed = parse_source_body(body, source_info)
+            entry_times, records = entry_timestamps(feed), None
+        
+        # Only remember validators once the body has been handled
+        feed_state.update(
+            url,
+            etag=response.headers.get('ETag'),
+            last_modified=response.headers.get('Last-Modified')
+        )
+        # Entry timestamps let the adaptive scheduler learn the feed's cadence
+        feed_state.record_poll(url, entry_times)
+        
+        if records:
+            logger.info(f"✅ Found {len(records)} entries FROM {source_name}")
+            return merge_scored_records(records, seen_index)
+        
+        if records is None and feed.entries:
+            logger.info(f"✅ Found {len(feed.entries)} entries FROM {source_name}")
+            return process_feed_entries(feed, source_name, source_info, seen_index)
+        
+        logger.warning(f"❌ No entries found FROM {source_name}")
+        
+    except Exception as e:
+        logger.error(f"❌ Error fetching FROM {source_name}: {e}")
+    
+    return []
+
+def state_file_path(data_dir, file_name, state_tag=None):
+    """Path of a state file in data_dir, suffixed with state_tag (e.g. a shard) if given"""
+    path = Path(data_dir) / file_name
+    return path.with_name(f"{path.stem}_{state_tag}{path.suffix}") if state_tag else path
+
+def iter_source_batches(sources=None, session=None, state_tag=None, seen_index=None, feed_state=None):
+    """Fetch sources concurrently, yielding (source_index, entries) as each source completes
+    
+    session defaults to a pooled live session; pass a recording or replay session
+    from feed_fixtures to capture or reproduce a run. state_tag gives the feed state
+    and seen-entry index their own files, so concurrent workers never share them.
+    A caller passing its own seen_index and feed_state commits and saves them
+    itself, e.g. only once the entries are safely stored.
+    """
+    sources = EXTERNAL_RSS_SOURCES if sources is None else sources
+    
+    if not sources:
+        return
+    
+    session = create_http_session() if session is None else session
+    throttle = HostThrottle(CONFIG['request_delay'])
+    data_dir = Path(ensure_data_directory())
+    owns_feed_state = feed_state is None
+    if owns_feed_state:
+        feed_state = FeedStateStore(state_file_path(data_dir, CONFIG['feed_state_file'], state_tag))
+    owns_seen_index = seen_index is None
+    if owns_seen_index:
+        seen_index = SeenEntryIndex(
+            state_file_path(data_dir, CONFIG['seen_index_file'], state_tag),
+            CONFIG['seen_index_max_age_days']
+        )
+    seen_index.evict()
+    max_workers = min(CONFIG['max_fetch_workers'], len(sources))
+    
+    # I/O stays on the fetch threads; parsing and scoring can move to other cores
+    # Spawned, not forked: the pool starts its workers on first use, from a fetch thread,
+    # while other threads may hold logging, connection pool or SQLite locks
+    parse_pool = ProcessPoolExecutor(
+        max_workers=CONFIG['parse_workers'],
+        mp_context=multiprocessing.get_context('spawn'),
+        initializer=init_parse_worker,
+        initargs=(dict(CONFIG),)
+    ) if CONFIG['parse_workers'] else None
+    
+    try:
+        with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='feed') as executor:
+            futures = {
+                executor.submit(
+                    fetch_source_content, session, throttle, feed_state, seen_index, source_name, source_info,
+                    parse_pool
+                ): source_index
+                for source_index, (source_name, source_info) in enumerate(sources.items())
+            }
+            
+            for future in as_completed(futures):
+                yield futures[future], future.result()
+        
+        # Only mark entries as seen, and keep the validators that skip them next
+        # time, once the whole fetch has been consumed
+        if owns_seen_index:
+            seen_index.commit()
+        if owns_feed_state:
+            feed_state.save()
+    finally:
+        if parse_pool is not None:
+            parse_pool.shutdown()
+        session.close()
+        if owns_seen_index:
+            seen_index.close()
+
+def iter_external_rss_content(sources=None, session=None):
+    """Stream content FROM external RSS feeds, one entry at a time as sources complete"""
+    logger.info("🔍 Fetching content FROM external RSS feeds...")
+    
+    for source_index, source_content in iter_source_batches(sources, session):
+        for entry_index, entry in enumerate(source_content):
+            # Completion order varies run to run; the configured order breaks ranking ties
+            entry.feed_position = (source_index, entry_index)
+            yield entry
+
+def fetch_external_rss_content(sources=None, session=None):
+    """Fetch content FROM external RSS feeds"""
+    logger.info("🔍 Fetching content FROM external RSS feeds...")
+    
+    # Reassemble in source order so output matches a sequential run
+    batches = dict(iter_source_batches(sources, session))
+    all_external_content = [entry for index in sorted(batches) for entry in batches[index]]
     
     logger.info(f"📥 Total AI-relevant content fetched: {len(all_external_content)}")
     return all_external_content
 
+@lru_cache(maxsize=4096)
+def find_keyword_hits(title, summary):
+    """Return every AI keyword and trending term in an entry's title and summary"""
+    # Match against the shared normalized text, so markup and entities never count
+    return tuple(KEYWORD_MATCHER.find(entry_text(title, summary).lower, lowered=True))
+
 def calculate_ai_relevance(title, summary):
     """Calculate how relevant content is to AI topics"""
-    text = f"{title} {summary}".lower()
-    
     # Count AI keyword matches
-    ai_matches = 0
-    for keyword in AI_KEYWORDS:
-        if keyword.lower() in text:
-            ai_matches += 1
+    ai_matches = sum(1 for keyword in find_keyword_hits(title, summary) if keyword in AI_KEYWORD_SET)
     
     # Calculate relevance score (0.0 to 1.0)
     if ai_matches == 0:
@@ -199,91 +566,189 @@ def calculate_ai_relevance(title, summary):
     else:
         return min(ai_matches / 5.0, 1.0)
 
-def filter_and_rank_content(content_entries):
-    """Filter and rank content for mytribal.ai publishing"""
-    logger.info("🔍 Filtering and ranking content for mytribal.ai...")
-    
-    # Filter by relevance and recency
-    filtered_content = []
+def calculate_ai_relevance_batch(texts):
+    """Calculate AI relevance for many (title, summary) pairs in one vectorized pass"""
+    hits = [find_keyword_hits(title, summary) for title, summary in texts]
+    return RELEVANCE_SCORER.score_matrix(RELEVANCE_SCORER.term_matrix_from_hits(hits))
+
+def prioritize_content(content_entries):
+    """Yield entries meeting the minimum AI relevance, with their priority score set"""
     for entry in content_entries:
         # Must meet minimum AI relevance
-        if entry['ai_relevance_score'] >= CONFIG['min_ai_relevance_score']:
+        if entry.ai_relevance_score >= CONFIG['min_ai_relevance_score']:
             # Prefer recent content (within last 7 days)
-            if entry.get('days_old', 999) <= 7:
-                entry['priority_score'] = entry['ai_relevance_score'] * entry['weight'] * 1.5
+            if entry.days_old <= 7:
+                entry.priority_score = entry.ai_relevance_score * entry.weight * 1.5
             else:
-                entry['priority_score'] = entry['ai_relevance_score'] * entry['weight']
+                entry.priority_score = entry.ai_relevance_score * entry.weight
+            
+            # Community sources report how popular a story is
+            if entry.popularity:
+                entry.priority_score *= 1 + CONFIG['popularity_boost'] * entry.popularity
             
-            filtered_content.append(entry)
+            yield entry
+
+def rank_top_content(content_entries, limit, duplicate_threshold=None, covered=None):
+    """Keep the top entries by priority score in a bounded heap, highest first
+    
+    With a duplicate_threshold, an entry that is a near-duplicate of a kept entry
+    replaces it only if it ranks higher, so the result holds distinct stories.
+    covered(entry) returns the past story an entry repeats, or None; it is only
+    asked about entries that would otherwise make the heap.
+    """
+    if limit <= 0:
+        # Still drain the stream so upstream stages (raw content, seen index) complete
+        for _ in content_entries:
+            pass
+        return []
+    
+    # (priority, -source index, -entry index, entry); the lowest-ranked entry on top.
+    # Ties go to the earlier feed position, so thread timing never changes picks
+    heap = []
+    duplicates = 0
+    already_covered = 0
     
-    # Sort by priority score (highest first)
-    filtered_content.sort(key=lambda x: x['priority_score'], reverse=True)
+    # Kept entries by feed position, with their shingles and MinHash signatures; a
+    # newcomer is only compared with the kept entries it shares an LSH band with.
+    # One row per band keeps recall high down at the low near-duplicate threshold
+    hasher = MinHasher(64)
+    index = LSHIndex(64, bands=64)
+    kept = {}
+    
+    def drop(item):
+        _, _, signature = kept.pop(item[1:3])
+        if signature is not None:
+            index.remove(item[1:3], signature)
+    
+    for arrival, entry in enumerate(content_entries):
+        source_index, entry_index = entry.feed_position or (0, arrival)
+        item = (entry.priority_score, -source_index, -entry_index, entry)
+        
+        # An entry ranking below the whole full heap can neither enter it nor displace a duplicate
+        if len(heap) >= limit and item[:3] <= heap[0][:3]:
+            continue
+        
+        if covered is not None:
+            past_story = covered(entry)
+            if past_story:
+                already_covered += 1
+                logger.info(f"   🗂️ Already covered as '{past_story[0][:40]}...': {entry.title[:40]}...")
+                continue
+        
+        if duplicate_threshold is not None:
+            shingles = shingle_text(entry.title, entry.summary)
+            signature = hasher.signature(shingles)
+            candidates = index.query(signature) if signature is not None else ()
+            matches = [
+                kept[position][0] for position in candidates
+                if jaccard_similarity(shingles, kept[position][1]) >= duplicate_threshold
+            ]
+            
+            if matches:
+                duplicates += 1
+                if item[:3] <= max(kept_item[:3] for kept_item in matches):
+                    continue
+                for kept_item in matches:
+                    drop(kept_item)
+                heap = [kept_item for kept_item in heap if kept_item not in matches]
+                heapq.heapify(heap)
+            
+            kept[item[1:3]] = (item, shingles, signature)
+            if signature is not None:
+                index.add(item[1:3], signature)
+        
+        if len(heap) < limit:
+            heapq.heappush(heap, item)
+        else:
+            evicted = heapq.heapreplace(heap, item)
+            if duplicate_threshold is not None:
+                drop(evicted)
+    
+    if duplicates:
+        logger.info(f"🔁 Skipped {duplicates} near-duplicate entries across sources")
+    if already_covered:
+        logger.info(f"🗂️ Skipped {already_covered} entries covered in the last {CONFIG['history_window_days']} days")
+    
+    return [item[3] for item in sorted(heap, key=lambda item: item[:3], reverse=True)]
+
+def filter_and_rank_content(content_entries):
+    """Filter and rank content for mytribal.ai publishing"""
+    logger.info("🔍 Filtering and ranking content for mytribal.ai...")
     
     # Limit to max stories per day
-    top_content = filtered_content[:CONFIG['max_stories_per_day']]
+    top_content = rank_top_content(
+        prioritize_content(content_entries),
+        CONFIG['max_stories_per_day'],
+        CONFIG['near_duplicate_threshold']
+    )
     
     logger.info(f"✅ Selected {len(top_content)} top stories for mytribal.ai")
     return top_content
 
 def create_mytribal_story_outlines(selected_content):
     """Create story outlines ready for mytribal.ai publishing"""
+    return list(iter_story_outlines(selected_content))
+
+def iter_story_outlines(selected_content, first_number=1):
+    """Yield story outlines one at a time, so each can be handed on as soon as it is ready"""
     logger.info("📝 Creating story outlines for mytribal.ai...")
     
-    story_outlines = []
-    
-    for i, content in enumerate(selected_content, 1):
+    for i, content in enumerate(selected_content, first_number):
         outline = {
             'story_number': i,
-            'priority_score': content['priority_score'],
-            'ai_relevance_score': content['ai_relevance_score'],
+            'priority_score': content.priority_score,
+            'ai_relevance_score': content.ai_relevance_score,
             'source_info': {
-                'name': content['source_name'],
-                'url': content['source_url'],
-                'category': content['category']
+                'name': content.source_name,
+                'url': content.source_url,
+                'category': content.category
             },
             'content': {
-                'title': content['title'],
-                'summary': content['summary'],
-                'original_link': content['link'],
-                'published_date': content['published']
+                'title': content.title,
+                'summary': content.summary,
+                'original_link': content.link,
+                'published_date': content.published
             },
             'mytribal_adaptation': {
-                'suggested_title': adapt_title_for_mytribal(content['title']),
+                'suggested_title': adapt_title_for_mytribal(content.title),
                 'story_angle': generate_story_angle(content),
-                'key_points': extract_key_points(content['summary']),
+                'key_points': extract_key_points(content.article_text or content.summary),
                 'seo_keywords': extract_seo_keywords(content),
                 'target_audience': determine_target_audience(content)
             },
             'publishing_ready': True,
             'timestamp': datetime.now().isoformat()
         }
-        
-        story_outlines.append(outline)
+        if content.article_text:
+            outline['content']['article_text'] = content.article_text
         
         logger.info(f"   📚 Story {i}: {outline['mytribal_adaptation']['suggested_title'][:60]}...")
-    
-    return story_outlines
+        yield outline
 
 def adapt_title_for_mytribal(original_title):
     """Adapt external titles for mytribal.ai style"""
+    # Start FROM the normalized title so entities like &#8217; never reach the post
+    text = normalize_text(original_title)
+    title, title_lower = text.plain, text.lower
+    
     # Remove source-specific prefixes
-    title = original_title
     prefixes_to_remove = ['TechCrunch:', 'VentureBeat:', 'MIT:', 'Reddit:', 'Hacker News:']
     
     for prefix in prefixes_to_remove:
         if title.startswith(prefix):
             title = title[len(prefix):].strip()
+            title_lower = title.lower()
     
     # Add mytribal.ai style if needed
-    if not any(word in title.lower() for word in ['ai', 'artificial intelligence', 'machine learning']):
+    if not any(word in title_lower for word in ['ai', 'artificial intelligence', 'machine learning']):
         title = f"AI Update: {title}"
     
     return title
 
 def generate_story_angle(content):
     """Generate a story angle for mytribal.ai"""
-    category = content['category']
-    ai_score = content['ai_relevance_score']
+    category = content.category
+    ai_score = content.ai_relevance_score
     
     if category == 'ai_research':
         return "Research breakthrough with real-world implications"
@@ -298,8 +763,8 @@ def generate_story_angle(content):
 
 def extract_key_points(summary):
     """Extract key points from content summary"""
-    # Simple key point extraction
-    sentences = summary.split('.')
+    # Simple key point extraction, FROM text without markup or entities
+    sentences = normalize_text(summary).plain.split('.')
     key_points = []
     
     for sentence in sentences[:3]:  # First 3 sentences
@@ -311,26 +776,15 @@ def extract_key_points(summary):
 
 def extract_seo_keywords(content):
     """Extract SEO keywords for mytribal.ai"""
-    text = f"{content['title']} {content['summary']}".lower()
-    
-    # Find AI-related keywords
-    found_keywords = []
-    for keyword in AI_KEYWORDS:
-        if keyword.lower() in text:
-            found_keywords.append(keyword)
+    # AI keywords first, then trending terms, as found by the shared matcher
+    found_keywords = find_keyword_hits(content.title, content.summary)
     
-    # Add trending terms
-    trending_terms = ['2025', 'trending', 'latest', 'breakthrough', 'innovation']
-    for term in trending_terms:
-        if term.lower() in text:
-            found_keywords.append(term)
-    
-    return list(set(found_keywords))[:10]  # Limit to 10 keywords
+    return list(found_keywords)[:10]  # Limit to 10 keywords
 
 def determine_target_audience(content):
     """Determine target audience for the content"""
-    category = content['category']
-    ai_score = content['ai_relevance_score']
+    category = content.category
+    ai_score = content.ai_relevance_score
     
     if ai_score >= 0.9:
         return "AI professionals and researchers"
@@ -341,19 +795,139 @@ def determine_target_audience(content):
     else:
         return "Curious readers interested in technology"
 
-def save_content_for_mytribal(data_dir, story_outlines, raw_content):
-    """Save content ready for mytribal.ai publishing"""
-    today = datetime.now().strftime("%Y-%m-%d")
+class JsonArrayWriter:
+    """Stream items into a JSON array file laid out exactly like json.dump(..., indent=2)
     
-    # Save story outlines
-    outlines_file = Path(data_dir) / f"mytribal_stories_{today}.json"
+    Items go to a temporary file that replaces the target only if the block
+    succeeds and at least one new item was written. With append=True the
+    target's existing items are carried over first.
+    """
+    
+    def __init__(self, path, to_json=None, append=False):
+        self.path = Path(path)
+        self.to_json = to_json
+        self.append = append
+        self.count = 0
+        self._written = 0
+        self._tmp_path = self.path.with_suffix(self.path.suffix + '.tmp')
+        self._file = None
+    
+    def __enter__(self):
+        self._file = open(self._tmp_path, 'w', encoding='utf-8')
+        self._file.write('[')
+        
+        if self.append and self.path.exists():
+            with open(self.path, 'r', encoding='utf-8') as f:
+                for data in json.load(f):
+                    self._write_data(data)
+        return self
+    
+    def _write_data(self, data):
+        text = json.dumps(data, indent=2, ensure_ascii=False, default=str)
+        self._file.write(('\n' if self._written == 0 else ',\n') + textwrap.indent(text, '  '))
+        self._written += 1
+    
+    def write(self, item):
+        """Append one item to the array"""
+        self._write_data(self.to_json(item) if self.to_json else item)
+        self.count += 1
+    
+    def write_through(self, items):
+        """Write each item as it streams past, yielding it on unchanged"""
+        for item in items:
+            self.write(item)
+            yield item
+    
+    def __exit__(self, exc_type, exc, traceback):
+        self._file.write('\n]' if self._written else ']')
+        self._file.close()
+        
+        if exc_type is None and self.count:
+            os.replace(self._tmp_path, self.path)
+        else:
+            self._tmp_path.unlink()
+        return False
+
+_write_lock_depth = threading.local()
+
+@contextmanager
+def content_write_lock(data_dir):
+    """Hold today's outlines and raw content exclusively until the block exits
+    
+    The daily run, the scheduler and the WebSub receiver all rewrite the same
+    files; an flock serializes them across processes and threads alike. Nested
+    use on one thread is a no-op, so a caller may hold it around generate_content.
+    """
+    if getattr(_write_lock_depth, 'value', 0):
+        _write_lock_depth.value += 1
+        try:
+            yield
+        finally:
+            _write_lock_depth.value -= 1
+        return
+    
+    with open(Path(data_dir) / CONFIG['write_lock_file'], 'a') as lock_file:
+        fcntl.flock(lock_file, fcntl.LOCK_EX)
+        _write_lock_depth.value = 1
+        try:
+            yield
+        finally:
+            _write_lock_depth.value = 0
+            fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+def story_outlines_path(data_dir):
+    """Path of today's story outlines"""
+    today = datetime.now().strftime("%Y-%m-%d")
+    return Path(data_dir) / f"mytribal_stories_{today}.json"
+
+def load_story_outlines(data_dir):
+    """Load today's story outlines, or an empty list if none were saved yet"""
+    try:
+        with open(story_outlines_path(data_dir), 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return []
+
+def save_story_outlines(data_dir, story_outlines):
+    """Save story outlines ready for mytribal.ai publishing"""
+    outlines_file = story_outlines_path(data_dir)
     with open(outlines_file, 'w', encoding='utf-8') as f:
         json.dump(story_outlines, f, indent=2, ensure_ascii=False, default=str)
     
+    return outlines_file
+
+def open_jsonl_output(path):
+    """Open a JSON Lines destination; '-' means stdout (logging already goes to stderr)"""
+    if path == '-':
+        return sys.stdout
+    return open(path, 'a', encoding='utf-8')
+
+def write_jsonl(stream, item):
+    """Write one item as a JSON line and flush it, so a reader downstream sees it at once"""
+    stream.write(json.dumps(item, ensure_ascii=False, default=str) + '\n')
+    stream.flush()
+
+def raw_content_path(data_dir):
+    """Path of today's raw content snapshot"""
+    today = datetime.now().strftime("%Y-%m-%d")
+    return Path(data_dir) / f"raw_content_{today}.json"
+
+def save_content_for_mytribal(data_dir, story_outlines, raw_content):
+    """Save content ready for mytribal.ai publishing"""
+    # Save story outlines
+    outlines_file = save_story_outlines(data_dir, story_outlines)
+    
     # Save raw content for reference
-    raw_file = Path(data_dir) / f"raw_content_{today}.json"
+    raw_file = raw_content_path(data_dir)
     with open(raw_file, 'w', encoding='utf-8') as f:
-        json.dump(raw_content, f, indent=2, ensure_ascii=False, default=str)
+        json.dump([entry.to_dict() for entry in raw_content], f, indent=2, ensure_ascii=False)
+    
+    store = ContentStore(Path(data_dir) / CONFIG['content_store_file'])
+    try:
+        store.add_raw_entries([entry.to_dict() for entry in raw_content])
+        store.add_outlines(story_outlines, replace=True)
+    finally:
+        store.close()
     
     logger.info(f"💾 Content saved for mytribal.ai publishing:")
     logger.info(f"   Story outlines: {outlines_file}")
@@ -361,46 +935,175 @@ def save_content_for_mytribal(data_dir, story_outlines, raw_content):
     
     return outlines_file, raw_file
 
-def main():
+def generate_content(sources=None, append=False, session=None, content=None, on_outline=None):
+    """Fetch, rank and save story outlines; returns the outlines file or None
+    
+    With append=True (used by the adaptive scheduler) today's existing outlines
+    and raw content are kept, and only the remaining daily story budget is filled.
+    content replaces fetching with an already fetched ContentEntry stream, such as
+    the merged shards from sharded_ingest. on_outline is called with each new
+    outline the moment it is ready (and stored), e.g. to stream it as a JSON line.
+    """
+    # Ensure data directory exists
+    data_dir = ensure_data_directory()
+    
+    # Today's files are read, extended and replaced as a whole; one writer at a time
+    with content_write_lock(data_dir):
+        return _generate_content(data_dir, sources, append, session, content, on_outline)
+
+def _generate_content(data_dir, sources, append, session, content, on_outline):
+    """generate_content, with the write lock held"""
+    raw_file = raw_content_path(data_dir)
+    sources = EXTERNAL_RSS_SOURCES if sources is None else sources
+    
+    existing_outlines = load_story_outlines(data_dir) if append else []
+    story_budget = CONFIG['max_stories_per_day'] - len(existing_outlines)
+    if story_budget <= 0:
+        logger.info("📦 Today's story budget is used up; fetching to keep raw content and indexes current")
+    
+    # Past outlines and published posts; a fresh run rewrites today's outlines, so
+    # those don't count, while an append run must not repeat today's picks
+    history = open_coverage_history(data_dir, CONFIG['history_index_file'], CONFIG['published_history_files'])
+    exclude_sources = () if append else (str(story_outlines_path(data_dir)),)
+    
+    def covered(entry):
+        return history.find_similar(
+            entry.title, entry.summary,
+            CONFIG['history_window_days'],
+            CONFIG['history_threshold'],
+            exclude_sources
+        )
+    
+    store = ContentStore(Path(data_dir) / CONFIG['content_store_file'])
+    
+    # Stream content FROM external RSS feeds through scoring into a bounded
+    # top-k ranker, writing raw content to the store and disk as it passes
+    try:
+        with JsonArrayWriter(raw_file, to_json=ContentEntry.to_dict, append=append) as raw_writer:
+            content_stream = raw_writer.write_through(store.write_through(prioritize_content(
+                iter_external_rss_content(sources, session) if content is None else content
+            ), ContentEntry.to_dict))
+            selected_content = rank_top_content(
+                content_stream,
+                story_budget,
+                CONFIG['near_duplicate_threshold'],
+                covered
+            )
+    finally:
+        history.close()
+        store.close()
+    
+    logger.info(f"📥 Total AI-relevant content fetched: {raw_writer.count}")
+    
+    if not raw_writer.count:
+        logger.warning("❌ No external content found. Exiting.")
+        return None
+    
+    if not selected_content:
+        logger.warning("❌ No suitable content selected for mytribal.ai. Exiting.")
+        return None
+    
+    logger.info(f"✅ Selected {len(selected_content)} top stories for mytribal.ai")
+    
+    # Give outlines and the publishing prompt the full article, not a truncated summary
+    if CONFIG['extract_articles']:
+        article_session = create_http_session()
+        try:
+            attach_article_text(selected_content, article_session, data_dir, CONFIG['request_timeout'])
+        finally:
+            article_session.close()
+    
+    # Create story outlines for mytribal.ai, storing each before it is streamed so a
+    # publisher reading the stream can always record its publish state
+    story_outlines = []
+    store = ContentStore(Path(data_dir) / CONFIG['content_store_file'])
+    try:
+        if not append:
+            store.add_outlines([], replace=True)
+        for outline in iter_story_outlines(selected_content, len(existing_outlines) + 1):
+            store.add_outlines([outline])
+            if on_outline is not None:
+                on_outline(outline)
+            story_outlines.append(outline)
+    finally:
+        store.close()
+    
+    # Save content ready for mytribal.ai publishing
+    outlines_file = save_story_outlines(data_dir, existing_outlines + story_outlines)
+    
+    logger.info(f"💾 Content saved for mytribal.ai publishing:")
+    logger.info(f"   Story outlines: {outlines_file}")
+    logger.info(f"   Raw content: {raw_file}")
+    
+    # Display summary
+    logger.info("\n📊 Content Generation Summary:")
+    logger.info(f"   Date: {datetime.now().strftime('%Y-%m-%d')}")
+    logger.info(f"   External sources checked: {len(sources)}")
+    logger.info(f"   Total content fetched: {raw_writer.count}")
+    logger.info(f"   Content selected for mytribal.ai: {len(selected_content)}")
+    logger.info(f"   Story outlines created: {len(story_outlines)}")
+    
+    logger.info(f"\n🎯 Content ready for mytribal.ai publishing!")
+    logger.info(f"   Check: {outlines_file}")
+    logger.info(f"   Each story includes: title, summary, key points, SEO keywords, and publishing guidance")
+    
+    return outlines_file
+
+def parse_args(argv=None):
+    """Command line options for recording and replaying feed fixtures"""
+    parser = argparse.ArgumentParser(description="Generate mytribal.ai story outlines FROM external RSS feeds")
+    parser.add_argument('--data-dir', default=CONFIG['data_dir'], help="directory for generated content and state")
+    parser.add_argument('--extract-articles', action='store_true', default=CONFIG['extract_articles'],
+                        help="fetch and cache the full article text of selected stories")
+    parser.add_argument('--jsonl-out', metavar='PATH',
+                        help="also stream each outline as a JSON line, appended to PATH ('-' for stdout)")
+    parser.add_argument('--parse-workers', type=int, default=CONFIG['parse_workers'],
+                        help="parse and score feeds in this many processes (0 = on the fetch threads)")
+    
+    fixtures = parser.add_mutually_exclusive_group()
+    fixtures.add_argument('--record', metavar='DIR', help="save every raw feed response into DIR")
+    fixtures.add_argument('--replay', metavar='DIR', help="serve feed responses from DIR instead of the network")
+    
+    replay = parser.add_argument_group('replay options')
+    replay.add_argument('--latency', type=float, default=0.0, help="seconds added to every replayed request")
+    replay.add_argument('--jitter', type=float, default=0.0, help="up to this many extra random seconds per request")
+    replay.add_argument('--error-rate', type=float, default=0.0, help="fraction of replayed requests that fail")
+    replay.add_argument('--error-kind', choices=('http', 'timeout'), default='http', help="how injected failures look")
+    replay.add_argument('--error-status', type=int, default=503, help="HTTP status for injected 'http' failures")
+    replay.add_argument('--seed', type=int, default=0, help="seed for jitter and error injection")
+    return parser.parse_args(argv)
+
+def main(argv=None):
     """Main content generation workflow"""
+    args = parse_args(argv)
+    CONFIG['data_dir'] = args.data_dir
+    CONFIG['parse_workers'] = args.parse_workers
+    CONFIG['extract_articles'] = args.extract_articles
+    
+    session = None
+    if args.record:
+        session = RecordingSession(create_http_session(), args.record)
+    elif args.replay:
+        session = ReplaySession(
+            args.replay,
+            latency=args.latency,
+            jitter=args.jitter,
+            error_rate=args.error_rate,
+            error_kind=args.error_kind,
+            error_status=args.error_status,
+            seed=args.seed
+        )
+        logger.info(f"📼 Replaying feed fixtures FROM {args.replay}")
+    
     logger.info("🚀 Starting Daily AI Content Generator for mytribal.ai...")
     start_time = datetime.now()
     
+    outlines_out = open_jsonl_output(args.jsonl_out) if args.jsonl_out else None
     try:
-        # Ensure data directory exists
-        data_dir = ensure_data_directory()
-        
-        # Fetch content FROM external RSS feeds
-        external_content = fetch_external_rss_content()
-        
-        if not external_content:
-            logger.warning("❌ No external content found. Exiting.")
-            return
-        
-        # Filter and rank content for mytribal.ai
-        selected_content = filter_and_rank_content(external_content)
-        
-        if not selected_content:
-            logger.warning("❌ No suitable content selected for mytribal.ai. Exiting.")
-            return
-        
-        # Create story outlines for mytribal.ai
-        story_outlines = create_mytribal_story_outlines(selected_content)
-        
-        # Save content ready for mytribal.ai publishing
-        outlines_file, raw_file = save_content_for_mytribal(data_dir, story_outlines, external_content)
-        
-        # Display summary
-        logger.info("\n📊 Content Generation Summary:")
-        logger.info(f"   Date: {datetime.now().strftime('%Y-%m-%d')}")
-        logger.info(f"   External sources checked: {len(EXTERNAL_RSS_SOURCES)}")
-        logger.info(f"   Total content fetched: {len(external_content)}")
-        logger.info(f"   Content selected for mytribal.ai: {len(selected_content)}")
-        logger.info(f"   Story outlines created: {len(story_outlines)}")
-        
-        logger.info(f"\n🎯 Content ready for mytribal.ai publishing!")
-        logger.info(f"   Check: {outlines_file}")
-        logger.info(f"   Each story includes: title, summary, key points, SEO keywords, and publishing guidance")
+        generate_content(
+            session=session,
+            on_outline=partial(write_jsonl, outlines_out) if outlines_out else None
+        )
         
     except Exception as e:
         logger.error(f"❌ Fatal error in content generation: {e}")
@@ -410,6 +1113,8 @@ def main():
         end_time = datetime.now()
         duration = end_time - start_time
         logger.info(f"⏰ Total runtime: {duration}")
+        if outlines_out not in (None, sys.stdout):
+            outlines_out.close()
 
 if __name__ == "__main__":
     main()
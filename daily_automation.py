@@ -4,12 +4,22 @@ Daily Automation for mytribal.ai
 Combines content generation and publishing in one script
 """
 
+import argparse
+import json
+import queue
 import subprocess
 import sys
+import threading
+import time
 import logging
 from datetime import datetime
 from pathlib import Path
 
+try:
+    import resource
+except ImportError:  # Not available on Windows
+    resource = None
+
 # Configure logging
 logging.basicConfig(
     level=logging.INFO,
@@ -21,6 +31,10 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+AUTOMATION_CONFIG = {
+    'report_file': 'automation_runs.jsonl'  # One JSON line per run, stored inside the generator's data_dir
+}
+
 def run_content_generation():
     """Run the daily AI content generator"""
     try:
@@ -65,8 +79,164 @@ def run_publishing():
         logger.error(f"❌ Error in publishing: {e}")
         return False
 
-def main():
+def peak_memory_mb():
+    """Peak resident memory of this process so far, or None where it cannot be read
+    
+    ru_maxrss never goes down and covers every thread, so with generation and
+    publishing running side by side it cannot be split per stage.
+    """
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes
+    return round(peak / (1024 * 1024 if sys.platform == 'darwin' else 1024), 1)
+
+def stage_result(stage):
+    return {'stage': stage, 'ok': False, 'seconds': None, 'process_peak_memory_mb': None, 'error': None}
+
+def finish_stage(result, started):
+    result['seconds'] = round(time.perf_counter() - started, 3)
+    # The whole process's peak by the time this stage ended, not the stage's own use
+    result['process_peak_memory_mb'] = peak_memory_mb()
+    return result
+
+def run_in_process():
+    """Generate and publish in this interpreter; returns per-stage result dicts
+    
+    Each outline goes straight FROM the generator to a publishing thread the moment
+    it is ready, so publishing overlaps the rest of generation.
+    """
+    # Imported here so both modules log through this script's logging setup
+    import daily_ai_content_generator as generator
+    import wordpress_rest_publisher as publisher
+    
+    outlines = queue.Queue()
+    done = object()
+    generation = stage_result('generation')
+    publishing = stage_result('publishing')
+    
+    def publish_outlines():
+        started = time.perf_counter()
+        try:
+            if not publisher.test_wordpress_connection():
+                raise RuntimeError(f"cannot connect to WordPress at {publisher.WP_URL}")
+            
+            store = publisher.open_content_store(
+                create=True,
+                data_dir=generator.CONFIG['data_dir'],
+                file_name=generator.CONFIG['content_store_file']
+            )
+            try:
+                pending = publisher.iter_streamed_content(iter(outlines.get, done), store)
+                stories = publisher.publish_stories(pending, store)
+                
+                # Then whatever earlier runs left unpublished, skipping what was just tried
+                handled = {story['outline_id'] for story in stories}
+                leftover = [
+                    (outline_id, story) for outline_id, story in publisher.load_unpublished_content(store)
+                    if outline_id not in handled
+                ]
+                if leftover:
+                    logger.info(f"📚 Publishing {len(leftover)} stories left over FROM earlier runs...")
+                    stories += publisher.publish_stories(leftover, store, len(leftover))
+            finally:
+                store.close()
+            
+            publishing['stories'] = stories
+            publishing['published'] = sum(story['status'] == 'published' for story in stories)
+            publishing['failed'] = len(stories) - publishing['published']
+            publishing['ok'] = True
+        except Exception as e:
+            logger.exception("❌ Error in publishing")
+            publishing['error'] = f"{type(e).__name__}: {e}"
+        finally:
+            finish_stage(publishing, started)
+    
+    logger.info("📤 Starting content publishing alongside generation...")
+    publisher_thread = threading.Thread(target=publish_outlines, name='publisher')
+    publisher_thread.start()
+    
+    logger.info("🚀 Starting content generation...")
+    started = time.perf_counter()
+    handed_over = []
+    
+    def hand_over(outline):
+        handed_over.append(outline['mytribal_adaptation']['suggested_title'])
+        outlines.put(outline)
+    
+    try:
+        outlines_file = generator.generate_content(on_outline=hand_over)
+        generation['outlines_file'] = str(outlines_file) if outlines_file else None
+        generation['ok'] = True
+    except Exception as e:
+        logger.exception("❌ Error in content generation")
+        generation['error'] = f"{type(e).__name__}: {e}"
+    finally:
+        generation['outlines'] = len(handed_over)
+        finish_stage(generation, started)
+        outlines.put(done)
+    
+    publisher_thread.join()
+    return [generation, publishing]
+
+def save_run_report(report):
+    """Append a run report to the JSON Lines history"""
+    try:
+        import daily_ai_content_generator as generator
+        report_path = Path(generator.CONFIG['data_dir']) / AUTOMATION_CONFIG['report_file']
+        report_path.parent.mkdir(exist_ok=True)
+        with open(report_path, 'a', encoding='utf-8') as f:
+            f.write(json.dumps(report, ensure_ascii=False, default=str) + '\n')
+        logger.info(f"🧾 Run report saved to {report_path}")
+    except Exception as e:
+        logger.warning(f"⚠️ Could not save run report: {e}")
+
+def run_daily_automation():
+    """In-process workflow: run both stages, then log and save a structured report"""
+    logger.info("🎯 Starting Daily Automation for mytribal.ai")
+    started_at = datetime.now()
+    started = time.perf_counter()
+    logger.info(f"⏰ Started at: {started_at.strftime('%Y-%m-%d %H:%M:%S')}")
+    
+    stages = run_in_process()
+    report = {
+        'started_at': started_at.isoformat(),
+        'seconds': round(time.perf_counter() - started, 3),
+        'ok': all(stage['ok'] for stage in stages),
+        'process_peak_memory_mb': peak_memory_mb(),
+        'stages': stages
+    }
+    
+    logger.info("📊 Stage results:")
+    for stage in stages:
+        details = ', '.join(
+            f"{key}={stage[key]}" for key in ('outlines', 'published', 'failed') if key in stage
+        )
+        status = "✅" if stage['ok'] else "❌"
+        logger.info(
+            f"   {status} {stage['stage']}: {stage['seconds']}s, process peak so far {stage['process_peak_memory_mb']} MB"
+            + (f", {details}" if details else "")
+            + (f", error: {stage['error']}" if stage['error'] else "")
+        )
+    save_run_report(report)
+    
+    if report['ok']:
+        logger.info("🎉 Daily automation completed successfully!")
+    else:
+        logger.error("❌ Daily automation finished with errors; see the stage results above")
+    logger.info(f"⏰ Completed at: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+    return report
+
+def main(argv=None):
     """Main automation workflow"""
+    parser = argparse.ArgumentParser(description="Daily content generation and publishing for mytribal.ai")
+    parser.add_argument('--subprocess', action='store_true',
+                        help="run the generator and publisher as separate scripts, one after the other")
+    args = parser.parse_args(argv)
+    
+    if not args.subprocess:
+        return run_daily_automation()['ok']
+    
     logger.info("🎯 Starting Daily Automation for mytribal.ai")
     logger.info(f"⏰ Started at: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
     
@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+"""
+Feed Fixtures
+Record live feed responses to disk and replay them offline with injected latency and errors
+"""
+
+import io
+import json
+import re
+import time
+import random
+import hashlib
+import logging
+import threading
+from pathlib import Path
+
+import requests
+from requests.structures import CaseInsensitiveDict
+from urllib3.response import HTTPResponse
+
+logger = logging.getLogger(__name__)
+
+# Per-connection headers that make no sense once the body is on disk
+HOP_BY_HOP_HEADERS = {'connection', 'keep-alive', 'transfer-encoding'}
+
+def fixture_name(url):
+    """Readable, collision-safe file stem for a URL"""
+    slug = re.sub(r'[^A-Za-z0-9]+', '_', re.sub(r'^https?://', '', url)).strip('_')[:60]
+    return f"{slug}_{hashlib.sha1(url.encode('utf-8')).hexdigest()[:8]}"
+
+def build_response(url, status, headers, body):
+    """A requests.Response serving body (as sent on the wire) from memory"""
+    raw = HTTPResponse(
+        body=io.BytesIO(body),
+        headers=headers,
+        status=status,
+        preload_content=False,
+        decode_content=False
+    )
+    response = requests.Response()
+    response.status_code = status
+    response.headers = CaseInsensitiveDict(headers)
+    response.raw = raw
+    response.url = url
+    response.reason = 'Replayed'
+    return response
+
+class RecordingSession:
+    """Wraps a live session and saves every GET response into a fixtures directory"""
+
+    def __init__(self, session, fixtures_dir):
+        self.session = session
+        self.fixtures_dir = Path(fixtures_dir)
+        self.fixtures_dir.mkdir(parents=True, exist_ok=True)
+
+    def get(self, url, headers=None, timeout=None, **kwargs):
+        """Fetch live, keeping the body exactly as it came over the wire"""
+        # Record full responses, never 304s
+        headers = {key: value for key, value in (headers or {}).items()
+                   if key not in ('If-None-Match', 'If-Modified-Since')}
+
+        start = time.monotonic()
+        with self.session.get(url, headers=headers, timeout=timeout, stream=True) as live:
+            body = live.raw.read(decode_content=False)
+            elapsed = time.monotonic() - start
+            response_headers = {key: value for key, value in live.headers.items()
+                                if key.lower() not in HOP_BY_HOP_HEADERS}
+            response_headers['Content-Length'] = str(len(body))
+            status = live.status_code
+
+        stem = self.fixtures_dir / fixture_name(url)
+        stem.with_suffix('.body').write_bytes(body)
+        with open(stem.with_suffix('.json'), 'w', encoding='utf-8') as f:
+            json.dump({
+                'url': url,
+                'status': status,
+                'headers': response_headers,
+                'elapsed': round(elapsed, 3),
+                'recorded_at': time.time()
+            }, f, indent=2)
+
+        logger.info(f"💾 Recorded {url} ({status}, {len(body):,} bytes)")
+        return build_response(url, status, response_headers, body)
+
+    def close(self):
+        self.session.close()
+
+class ReplaySession:
+    """
+    Serves recorded fixtures in place of the network.
+
+    latency adds a fixed delay per request, plus up to jitter more seconds. With
+    error_rate, that fraction of requests fails: error_kind 'http' answers with
+    error_status, 'timeout' raises requests.Timeout. Random choices are seeded
+    per URL and call, so a replay is repeatable whatever the thread interleaving.
+    """
+
+    def __init__(self, fixtures_dir, latency=0.0, jitter=0.0, error_rate=0.0,
+                 error_kind='http', error_status=503, seed=0):
+        self.fixtures_dir = Path(fixtures_dir)
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.error_kind = error_kind
+        self.error_status = error_status
+        self.seed = seed
+        self._lock = threading.Lock()
+        self._calls = {}
+
+        if not self.fixtures_dir.is_dir():
+            raise FileNotFoundError(f"No fixtures directory at {self.fixtures_dir}")
+
+    def _rng(self, url):
+        """Deterministic random source for the nth request to a URL"""
+        with self._lock:
+            call = self._calls.get(url, 0)
+            self._calls[url] = call + 1
+        return random.Random(f"{self.seed}:{url}:{call}")
+
+    def get(self, url, headers=None, timeout=None, **kwargs):
+        """Replay the recorded response for url"""
+        rng = self._rng(url)
+        delay = self.latency + rng.uniform(0, self.jitter)
+
+        if rng.random() < self.error_rate:
+            if self.error_kind == 'timeout':
+                time.sleep(min(delay, timeout) if timeout else delay)
+                raise requests.Timeout(f"Injected timeout for {url}")
+            time.sleep(delay)
+            return build_response(url, self.error_status, {'Content-Length': '0'}, b'')
+
+        time.sleep(delay)
+
+        stem = self.fixtures_dir / fixture_name(url)
+        try:
+            with open(stem.with_suffix('.json'), 'r', encoding='utf-8') as f:
+                fixture = json.load(f)
+            body = stem.with_suffix('.body').read_bytes()
+        except FileNotFoundError:
+            raise requests.ConnectionError(f"No fixture recorded for {url}") from None
+
+        # Answer conditional requests the way the origin server would
+        headers = headers or {}
+        recorded = CaseInsensitiveDict(fixture['headers'])
+        if (headers.get('If-None-Match') and headers['If-None-Match'] == recorded.get('ETag')) or \
+                (headers.get('If-Modified-Since') and headers['If-Modified-Since'] == recorded.get('Last-Modified')):
+            return build_response(url, 304, {}, b'')
+
+        return build_response(url, fixture['status'], fixture['headers'], body)
+
+    def close(self):
+        pass
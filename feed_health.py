@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+"""
+Feed Health
+Per-feed circuit breaker with exponential backoff, persisted in the feed state store
+"""
+
+import time
+import logging
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+
+logger = logging.getLogger(__name__)
+
+HEALTH_CONFIG = {
+    'backoff_base_seconds': 15 * 60,   # Backoff after the first failure
+    'backoff_max_seconds': 24 * 3600   # Backoff never grows beyond this
+}
+
+def parse_retry_after(value, now=None):
+    """Convert a Retry-After header (seconds or HTTP date) to an epoch time, or None"""
+    if not value:
+        return None
+
+    now = time.time() if now is None else now
+    value = value.strip()
+    if value.isdigit():
+        return now + int(value)
+
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+    return retry_at.timestamp()
+
+def backoff_remaining(state, now=None):
+    """Seconds until a failing feed may be retried; 0 if it is healthy or its window expired"""
+    now = time.time() if now is None else now
+    return max(0.0, state.get('backoff_until', 0) - now)
+
+def record_success(feed_state, url, status):
+    """Close the breaker for a feed after a successful fetch"""
+    feed_state.update(url, failures=None, backoff_until=None, last_status=status)
+
+def record_failure(feed_state, url, status, retry_after=None, now=None):
+    """Open the breaker for a feed, doubling its backoff with every consecutive failure"""
+    now = time.time() if now is None else now
+    failures = feed_state.get(url).get('failures', 0) + 1
+
+    backoff = min(
+        HEALTH_CONFIG['backoff_base_seconds'] * 2 ** (failures - 1),
+        HEALTH_CONFIG['backoff_max_seconds']
+    )
+    backoff_until = now + backoff
+
+    # Respect the server's own Retry-After if it asks for longer
+    retry_at = parse_retry_after(retry_after, now)
+    if retry_at and retry_at > backoff_until:
+        backoff_until = retry_at
+
+    feed_state.update(url, failures=failures, backoff_until=backoff_until, last_status=status)
+
+    retry_time = datetime.fromtimestamp(backoff_until).strftime('%Y-%m-%d %H:%M')
+    logger.warning(f"🔌 {url} failed {failures} time(s) in a row ({status}); backing off until {retry_time}")
+    return backoff_until
@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+Feed State Store
+Persists per-feed state (HTTP validators and similar bookkeeping) between runs
+"""
+
+import json
+import os
+import threading
+import logging
+import time
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+class FeedStateStore:
+    """Thread-safe JSON store of per-feed state keyed by feed URL"""
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self._lock = threading.Lock()
+        self._state = {}
+        self._dirty = False
+        self.load()
+
+    def load(self):
+        """Load state from disk, starting empty if the file is missing or corrupt"""
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                self._state = json.load(f)
+        except FileNotFoundError:
+            self._state = {}
+        except Exception as e:
+            logger.warning(f"⚠️ Could not read feed state {self.path}: {e}")
+            self._state = {}
+
+    def get(self, url):
+        """Return a copy of the state recorded for a feed URL"""
+        with self._lock:
+            return dict(self._state.get(url, {}))
+
+    def update(self, url, **fields):
+        """Merge fields into a feed's state; None values remove the field"""
+        with self._lock:
+            record = self._state.setdefault(url, {})
+            for key, value in fields.items():
+                if value is None:
+                    record.pop(key, None)
+                else:
+                    record[key] = value
+            self._dirty = True
+
+    def record_poll(self, url, entry_times=(), keep=50, field='last_polled'):
+        """Record a poll and merge observed entry timestamps (epoch seconds), newest first
+
+        field names the timestamp to set, e.g. 'last_pushed' for a WebSub delivery.
+        """
+        with self._lock:
+            record = self._state.setdefault(url, {})
+            record[field] = time.time()
+            if entry_times:
+                merged = set(record.get('entry_times', [])) | {int(t) for t in entry_times}
+                record['entry_times'] = sorted(merged, reverse=True)[:keep]
+            self._dirty = True
+
+    def save(self):
+        """Atomically write state to disk if anything changed"""
+        with self._lock:
+            if not self._dirty:
+                return
+
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.path.with_suffix(self.path.suffix + '.tmp')
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(self._state, f, indent=2, ensure_ascii=False)
+            os.replace(tmp_path, self.path)
+            self._dirty = False
+
+def conditional_headers(state):
+    """Build If-None-Match / If-Modified-Since headers from stored validators"""
+    headers = {}
+    if state.get('etag'):
+        headers['If-None-Match'] = state['etag']
+    if state.get('last_modified'):
+        headers['If-Modified-Since'] = state['last_modified']
+    return headers
@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+"""
+Keyword Matcher
+Finds every configured keyword in a text with one compiled, word-bounded regex pass
+"""
+
+import re
+
+def _trie_pattern(words):
+    """Build a regex alternation factored by shared prefixes so each position tries one branch"""
+    trie = {}
+    for word in words:
+        node = trie
+        for char in word:
+            node = node.setdefault(char, {})
+        node[''] = True
+
+    def build(node):
+        branches = [re.escape(char) + build(child) for char, child in sorted(node.items()) if char]
+        if not branches:
+            return ''
+        body = branches[0] if len(branches) == 1 else f"(?:{'|'.join(branches)})"
+        # A keyword ending here makes the longer continuations optional
+        return f"(?:{body})?" if '' in node else body
+
+    return build(trie)
+
+class KeywordMatcher:
+    """Case-insensitive whole-word matcher for a fixed keyword list"""
+
+    def __init__(self, keywords):
+        # Canonical spelling for each keyword, in configuration order
+        self.keywords = list(dict.fromkeys(keywords))
+        self._canonical = {keyword.lower(): keyword for keyword in self.keywords}
+
+        # Text is lowercased once per call, which is much faster than re.IGNORECASE.
+        # A trailing 's' is allowed so 'algorithms' still counts as 'algorithm'.
+        self._pattern = re.compile(rf"\b({_trie_pattern(self._canonical)})s?\b")
+
+        # A match consumes its text, so record the shorter keywords each keyword contains
+        self._implied = {
+            keyword: [
+                other for other in self._canonical
+                if other != keyword and re.search(rf"\b{re.escape(other)}\b", keyword)
+            ]
+            for keyword in self._canonical
+        }
+        self._order = {keyword: i for i, keyword in enumerate(self._canonical)}
+
+    def find(self, text, lowered=False):
+        """Return the canonical keywords present in text, in configuration order
+        
+        Pass lowered=True when text is already lowercase to skip lowercasing it again.
+        """
+        found = set()
+        for keyword in set(self._pattern.findall(text if lowered else text.lower())):
+            found.add(keyword)
+            found.update(self._implied[keyword])
+
+        return [self._canonical[keyword] for keyword in sorted(found, key=self._order.__getitem__)]
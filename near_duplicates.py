@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+Near-Duplicate Detection
+MinHash signatures with an LSH bucket index to collapse the same story arriving from several sources
+"""
+
+import hashlib
+import struct
+from collections import defaultdict
+
+from normalized_text import normalize_text
+
+STOPWORDS = frozenset("""
+    a an the and or but of to in on for with at by from is are was were be been as it its
+    this that these those after over into new says how why what who you your can will has
+    have about more than just now here
+""".split())
+
+# Only the opening words of a summary describe the story; the rest is the source's own prose
+MAX_SUMMARY_WORDS = 15
+
+def _content_words(text):
+    return [word for word in normalize_text(text).tokens if word not in STOPWORDS]
+
+def shingle_text(title, summary=''):
+    """Return the word shingle set for an entry, counting title words twice"""
+    title_words = _content_words(title)
+    summary_words = _content_words(summary)[:MAX_SUMMARY_WORDS]
+
+    # Rewritten headlines keep their key terms, so title words get extra weight
+    return set(title_words) | {f"t:{word}" for word in title_words} | set(summary_words)
+
+class MinHasher:
+    """Computes fixed-length MinHash signatures from shingle sets"""
+
+    # blake2b yields up to 64 bytes, i.e. 16 independent 32-bit hash values per call
+    VALUES_PER_DIGEST = 16
+
+    def __init__(self, num_perm=64):
+        if num_perm % self.VALUES_PER_DIGEST:
+            raise ValueError(f"num_perm must be a multiple of {self.VALUES_PER_DIGEST}")
+
+        self.num_perm = num_perm
+        self._salts = [
+            i.to_bytes(2, 'little') for i in range(num_perm // self.VALUES_PER_DIGEST)
+        ]
+        self._unpack = struct.Struct(f'<{self.VALUES_PER_DIGEST}I').unpack
+
+    def _hash_values(self, shingle):
+        data = shingle.encode('utf-8')
+        values = ()
+        for salt in self._salts:
+            values += self._unpack(hashlib.blake2b(data, digest_size=64, salt=salt).digest())
+        return values
+
+    def signature(self, shingles):
+        """Return the MinHash signature of a shingle set, or None if it is empty"""
+        if not shingles:
+            return None
+        # Column-wise minimum over every shingle's hash values
+        return tuple(map(min, zip(*map(self._hash_values, shingles))))
+
+def jaccard_similarity(set_a, set_b):
+    """Exact Jaccard similarity of two shingle sets"""
+    if not set_a or not set_b:
+        return 0.0
+    shared = len(set_a & set_b)
+    return shared / (len(set_a) + len(set_b) - shared)
+
+class LSHIndex:
+    """Banded locality-sensitive hash index over MinHash signatures"""
+
+    def __init__(self, num_perm=64, bands=32):
+        if num_perm % bands:
+            raise ValueError("num_perm must be divisible by bands")
+
+        self.bands = bands
+        self.rows = num_perm // bands
+        self._buckets = defaultdict(list)
+
+    def _band_keys(self, signature):
+        for band in range(self.bands):
+            start = band * self.rows
+            yield (band, signature[start:start + self.rows])
+
+    def add(self, key, signature):
+        """Index a signature under a caller-provided key"""
+        for band_key in self._band_keys(signature):
+            self._buckets[band_key].append(key)
+
+    def remove(self, key, signature):
+        """Drop a key indexed under the same signature"""
+        for band_key in self._band_keys(signature):
+            bucket = self._buckets.get(band_key)
+            if bucket and key in bucket:
+                bucket.remove(key)
+                if not bucket:
+                    del self._buckets[band_key]
+
+    def query(self, signature):
+        """Return keys sharing at least one band with the signature"""
+        candidates = set()
+        for band_key in self._band_keys(signature):
+            candidates.update(self._buckets.get(band_key, ()))
+        return candidates
@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+"""
+Normalized Text
+One memoized normalization of feed text (markup stripped, entities decoded,
+lowercased, tokenized) shared by scoring, keywords, key points and titles
+"""
+
+import html
+import re
+from functools import lru_cache
+
+TAG_RE = re.compile(r'<[^>]+>')
+SPACE_RE = re.compile(r'\s+')
+WORD_RE = re.compile(r'\w+')
+
+class NormalizedText:
+    """Plain, lowercased and tokenized forms of one piece of feed text"""
+
+    __slots__ = ('plain', 'lower', '_tokens')
+
+    def __init__(self, raw):
+        text = html.unescape(TAG_RE.sub(' ', raw or ''))
+        # Some feeds escape their markup twice; decoding exposes a second layer of tags
+        if '<' in text:
+            text = html.unescape(TAG_RE.sub(' ', text))
+
+        self.plain = SPACE_RE.sub(' ', text).strip()
+        self.lower = self.plain.lower()
+        self._tokens = None
+
+    @property
+    def tokens(self):
+        """Lowercased word tokens, split on first use"""
+        if self._tokens is None:
+            self._tokens = tuple(WORD_RE.findall(self.lower))
+        return self._tokens
+
+class EntryText:
+    """Normalized title and summary of one entry"""
+
+    __slots__ = ('title', 'summary', 'lower')
+
+    def __init__(self, title, summary):
+        self.title = normalize_text(title)
+        self.summary = normalize_text(summary)
+        self.lower = f"{self.title.lower} {self.summary.lower}"
+
+@lru_cache(maxsize=8192)
+def normalize_text(raw):
+    """Memoized NormalizedText for a raw string"""
+    return NormalizedText(raw)
+
+@lru_cache(maxsize=4096)
+def entry_text(title, summary):
+    """Memoized EntryText for an entry's raw title and summary"""
+    return EntryText(title, summary)
@@ -0,0 +1,174 @@
+#!/usr/bin/env python3
+"""
+Pull Feed Parser
+Incremental RSS/Atom parsing that stops once enough entries have been read
+"""
+
+import copy
+import time
+import logging
+from datetime import datetime
+from email.utils import parsedate_tz, mktime_tz
+from xml.etree.ElementTree import XMLPullParser, ParseError, tostring
+
+import feedparser
+# feedparser's own sanitizer, so entries are cleaned the same whichever parser read them
+from feedparser.sanitizer import _sanitize_html
+
+logger = logging.getLogger(__name__)
+
+CHUNK_SIZE = 16 * 1024
+
+ATOM = '{http://www.w3.org/2005/Atom}'
+RSS1 = '{http://purl.org/rss/1.0/}'
+CONTENT = '{http://purl.org/rss/1.0/modules/content/}'
+DC = '{http://purl.org/dc/elements/1.1/}'
+XHTML = '{http://www.w3.org/1999/xhtml}'
+
+# Atom type values whose content is markup; a bare or "text" type is plain text
+HTML_TYPES = {'html', 'xhtml', 'text/html', 'application/xhtml+xml'}
+
+ITEM_TAGS = {'item', RSS1 + 'item', ATOM + 'entry'}
+FEED_TAGS = {'rss', 'channel', 'feed', ATOM + 'feed', '{http://www.w3.org/1999/02/22-rdf-syntax-ns#}RDF'}
+
+class FeedDict(dict):
+    """Dict with attribute access, so entries can be used like feedparser's"""
+
+    def __getattr__(self, key):
+        try:
+            return self[key]
+        except KeyError:
+            raise AttributeError(key) from None
+
+def _xhtml_markup(element):
+    """Inner markup of an Atom type="xhtml" construct, without its wrapping div or namespaces"""
+    container = element.find(XHTML + 'div')
+    if container is None:
+        container = element
+
+    parts = [container.text or '']
+    for child in container:
+        child = copy.deepcopy(child)
+        for node in child.iter():
+            if isinstance(node.tag, str):
+                node.tag = node.tag.rpartition('}')[2]
+        parts.append(tostring(child, encoding='unicode'))
+    return ''.join(parts)
+
+def _text(element, *tags, html=False):
+    """Stripped text of the first child found among tags, or None
+
+    Atom type="xhtml" content is markup rather than text, so it comes back as HTML,
+    as feedparser returns it. Markup (html=True, or an Atom HTML type) is run
+    through feedparser's sanitizer, dropping scripts, event handlers and the like.
+    """
+    for tag in tags:
+        child = element.find(tag)
+        if child is None:
+            continue
+        text = _xhtml_markup(child) if child.get('type') == 'xhtml' else child.text
+        if text:
+            text = text.strip()
+            if html or child.get('type') in HTML_TYPES:
+                text = _sanitize_html(text, 'utf-8', 'text/html').strip()
+            return text
+    return None
+
+def _parse_time(value):
+    """Parse an RFC 822 or ISO 8601 date into a UTC struct_time, or None"""
+    if not value:
+        return None
+    try:
+        parsed = parsedate_tz(value)
+        if parsed:
+            return time.gmtime(mktime_tz(parsed))
+        return time.gmtime(datetime.fromisoformat(value.replace('Z', '+00:00')).timestamp())
+    except (ValueError, OverflowError):
+        return None
+
+def _atom_link(element):
+    """href of an Atom entry's alternate link"""
+    for link in element.iter(ATOM + 'link'):
+        if link.get('rel', 'alternate') == 'alternate' and link.get('href'):
+            return link.get('href')
+    return None
+
+def _build_entry(element):
+    """Map an RSS item or Atom entry element onto feedparser's entry keys"""
+    if element.tag == ATOM + 'entry':
+        entry = FeedDict(
+            title=_text(element, ATOM + 'title'),
+            link=_atom_link(element),
+            id=_text(element, ATOM + 'id'),
+            summary=_text(element, ATOM + 'summary', ATOM + 'content'),
+            published=_text(element, ATOM + 'published'),
+            updated=_text(element, ATOM + 'updated')
+        )
+    else:
+        ns = RSS1 if element.tag.startswith(RSS1) else ''
+        guid = element.find('guid')
+        entry = FeedDict(
+            title=_text(element, ns + 'title'),
+            link=_text(element, ns + 'link') or (guid.text.strip() if guid is not None and guid.text and
+                                                 guid.get('isPermaLink', 'true') == 'true' else None),
+            id=guid.text.strip() if guid is not None and guid.text else element.get(
+                '{http://www.w3.org/1999/02/22-rdf-syntax-ns#}about'),
+            summary=_text(element, ns + 'description', CONTENT + 'encoded', html=True),
+            published=_text(element, 'pubDate', DC + 'date'),
+            updated=_text(element, DC + 'modified')
+        )
+
+    # Leave absent fields out, as feedparser does, so entry.get(key, default) behaves the same
+    entry = FeedDict((key, value) for key, value in entry.items() if value is not None)
+    entry.setdefault('title', '')
+    for key in ('published', 'updated'):
+        parsed = _parse_time(entry.get(key))
+        if parsed:
+            entry[key + '_parsed'] = parsed
+    return entry
+
+def iter_feed_entries(chunks, max_entries=None):
+    """Yield entries from RSS/Atom byte chunks, reading no further than needed"""
+    parser = XMLPullParser(events=('start', 'end'))
+    root_checked = False
+    count = 0
+
+    for chunk in chunks:
+        parser.feed(chunk)
+        for event, element in parser.read_events():
+            if event == 'start':
+                if not root_checked:
+                    if element.tag not in FEED_TAGS:
+                        raise ParseError(f"not an RSS or Atom document: <{element.tag}>")
+                    root_checked = True
+                continue
+
+            if element.tag in ITEM_TAGS:
+                yield _build_entry(element)
+                element.clear()  # Drop the parsed subtree to keep memory flat
+                count += 1
+                if max_entries is not None and count >= max_entries:
+                    return
+
+    parser.close()
+
+def parse_feed(body, max_entries=None):
+    """
+    Parse a feed body into an object with .entries, stopping after max_entries.
+
+    Well-formed RSS 2.0, RSS 1.0 and Atom are parsed incrementally; anything the
+    pull parser rejects (bad markup, HTML entities, non-feed documents) goes
+    through feedparser's forgiving parser instead.
+    """
+    view = memoryview(body)
+    chunks = (view[i:i + CHUNK_SIZE] for i in range(0, len(view), CHUNK_SIZE))
+
+    try:
+        return FeedDict(entries=list(iter_feed_entries(chunks, max_entries)))
+    except ParseError as e:
+        logger.debug(f"Pull parser fell back to feedparser: {e}")
+
+    feed = feedparser.parse(body)
+    if max_entries is not None:
+        feed['entries'] = feed.entries[:max_entries]
+    return feed
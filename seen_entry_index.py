@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""
+Seen Entry Index
+Remembers which feed entries were already processed so unchanged items skip scoring
+"""
+
+import hashlib
+import sqlite3
+import threading
+import time
+import logging
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
+
+logger = logging.getLogger(__name__)
+
+# Query parameters that only track the click and never change the article
+TRACKING_PARAMS = ('utm_', 'fbclid', 'gclid', 'mc_cid', 'mc_eid', 'ref', 'cmpid')
+
+ENTRY_NEW = 'new'
+ENTRY_UPDATED = 'updated'
+ENTRY_UNCHANGED = 'unchanged'
+
+def normalize_link(link):
+    """Normalize a link so trivially different URLs for one article compare equal"""
+    if not link:
+        return ''
+
+    parts = urlsplit(link.strip())
+    query = [
+        (key, value) for key, value in parse_qsl(parts.query, keep_blank_values=True)
+        if not key.lower().startswith(TRACKING_PARAMS)
+    ]
+    path = parts.path.rstrip('/') or '/'
+
+    return urlunsplit((
+        parts.scheme.lower() or 'https',
+        parts.netloc.lower().removeprefix('www.'),
+        path,
+        urlencode(sorted(query)),
+        ''  # Fragments never identify a different article
+    ))
+
+def _digest(text, size):
+    return hashlib.blake2b(text.encode('utf-8'), digest_size=size).digest()
+
+def entry_fingerprint(guid, link, title, summary):
+    """Return (identity key, content hash) for a feed entry"""
+    identity = guid.strip() if guid else normalize_link(link)
+    if not identity:
+        identity = title.strip().lower()
+
+    key = _digest(identity, 16)
+    content_hash = _digest(f"{title.strip()}\n{summary.strip()}", 8)
+    return key, content_hash
+
+class SeenEntryIndex:
+    """SQLite-backed set of entry fingerprints with age-based eviction"""
+
+    def __init__(self, path, max_age_days=30, timeout=30):
+        self.path = str(path)
+        self.max_age_days = max_age_days
+        self._lock = threading.Lock()
+
+        # Fetch workers share one connection; the lock serializes access. Other
+        # processes (a push receiver, a shard) wait up to timeout for our commit
+        self._conn = sqlite3.connect(self.path, timeout=timeout, check_same_thread=False)
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS seen_entries (
+                key BLOB PRIMARY KEY,
+                content_hash BLOB NOT NULL,
+                first_seen REAL NOT NULL,
+                last_seen REAL NOT NULL
+            ) WITHOUT ROWID
+        """)
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_seen_last_seen ON seen_entries(last_seen)")
+        self._conn.commit()
+
+    def classify(self, guid, link, title, summary):
+        """Record an entry and report whether it is new, updated or unchanged"""
+        return self.classify_fingerprint(*entry_fingerprint(guid, link, title, summary))
+
+    def classify_fingerprint(self, key, content_hash):
+        """classify() for a fingerprint computed elsewhere, e.g. in a parse worker"""
+        now = time.time()
+
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT content_hash FROM seen_entries WHERE key = ?", (key,)
+            ).fetchone()
+
+            if row is None:
+                self._conn.execute(
+                    "INSERT INTO seen_entries (key, content_hash, first_seen, last_seen) VALUES (?, ?, ?, ?)",
+                    (key, content_hash, now, now)
+                )
+                return ENTRY_NEW
+
+            self._conn.execute(
+                "UPDATE seen_entries SET content_hash = ?, last_seen = ? WHERE key = ?",
+                (content_hash, now, key)
+            )
+            return ENTRY_UNCHANGED if row[0] == content_hash else ENTRY_UPDATED
+
+    def evict(self, max_age_days=None):
+        """Forget entries not seen within the retention window"""
+        max_age_days = self.max_age_days if max_age_days is None else max_age_days
+        cutoff = time.time() - max_age_days * 86400
+
+        with self._lock:
+            removed = self._conn.execute(
+                "DELETE FROM seen_entries WHERE last_seen < ?", (cutoff,)
+            ).rowcount
+            self._conn.commit()
+
+        if removed:
+            logger.info(f"🧹 Evicted {removed} seen entries older than {max_age_days} days")
+        return removed
+
+    def commit(self):
+        """Persist everything recorded since the last commit"""
+        with self._lock:
+            self._conn.commit()
+
+    def close(self):
+        """Close the index, discarding uncommitted classifications"""
+        with self._lock:
+            self._conn.close()
+
+    def __len__(self):
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM seen_entries").fetchone()[0]
@@ -0,0 +1,341 @@
+#!/usr/bin/env python3
+"""
+Sharded Feed Ingestion for mytribal.ai
+Splits a large source list (e.g. an OPML import) into consistent-hash shards that
+worker processes claim through a shared SQLite store, then merges them for ranking
+"""
+
+import argparse
+import bisect
+import hashlib
+import json
+import logging
+import os
+import re
+import socket
+import sqlite3
+import time
+from datetime import datetime
+from multiprocessing import Process
+from pathlib import Path
+from xml.etree import ElementTree
+
+import daily_ai_content_generator as generator
+from content_entry import ContentEntry
+from feed_state import FeedStateStore
+from seen_entry_index import SeenEntryIndex
+
+logger = logging.getLogger(__name__)
+
+INGEST_CONFIG = {
+    'store_file': 'ingest.db',   # Stored inside data_dir; must be on a filesystem all workers share
+    'shards': 16,
+    'virtual_nodes': 64,         # Ring points per shard; more points spread feeds more evenly
+    'lease_seconds': 300,        # A shard whose worker stops renewing is reclaimed after this
+    'busy_timeout': 30,          # Seconds to wait for another worker's write lock
+    'opml_weight': 0.8,
+    'opml_max_entries': 10
+}
+
+def _slug(text):
+    return re.sub(r'[^a-z0-9]+', '_', text.lower()).strip('_')
+
+def load_opml(path, category='opml_import'):
+    """Read RSS sources from an OPML file; nested outline folders become categories"""
+    sources = {}
+
+    def walk(element, category):
+        for outline in element.findall('outline'):
+            label = outline.get('title') or outline.get('text') or ''
+            url = outline.get('xmlUrl')
+            if not url:
+                walk(outline, _slug(label) or category)
+                continue
+
+            base = _slug(label) or _slug(url)
+            name, n = base, 2
+            while name in sources:
+                name, n = f"{base}_{n}", n + 1
+            sources[name] = {
+                'url': url,
+                'category': category,
+                'weight': INGEST_CONFIG['opml_weight'],
+                'max_entries': INGEST_CONFIG['opml_max_entries']
+            }
+
+    body = ElementTree.parse(path).getroot().find('body')
+    if body is not None:
+        walk(body, category)
+    logger.info(f"📚 Imported {len(sources)} sources FROM {path}")
+    return sources
+
+def _ring_hash(text):
+    return int.from_bytes(hashlib.blake2b(text.encode('utf-8'), digest_size=8).digest(), 'big')
+
+class HashRing:
+    """Consistent-hash ring: changing the shard count moves only ~1/N of the feeds"""
+
+    def __init__(self, shard_count, virtual_nodes=None):
+        virtual_nodes = virtual_nodes or INGEST_CONFIG['virtual_nodes']
+        points = sorted(
+            (_ring_hash(f"shard-{shard}#{node}"), shard)
+            for shard in range(shard_count)
+            for node in range(virtual_nodes)
+        )
+        self._points = [point for point, _ in points]
+        self._shards = [shard for _, shard in points]
+
+    def shard_for(self, key):
+        """Shard owning a key (a feed URL)"""
+        index = bisect.bisect(self._points, _ring_hash(key)) % len(self._points)
+        return self._shards[index]
+
+def shard_sources(sources, shard_count):
+    """Split {name: info} sources into {shard: {name: info}} by feed URL"""
+    ring = HashRing(shard_count)
+    shards = {shard: {} for shard in range(shard_count)}
+    for source_name, source_info in sources.items():
+        shards[ring.shard_for(source_info['url'])][source_name] = source_info
+    return shards
+
+class ShardStore:
+    """SQLite store where workers lease shards and deposit their entries"""
+
+    def __init__(self, path, busy_timeout=None):
+        self.path = str(path)
+        # Autocommit mode; every write below opens its own IMMEDIATE transaction
+        self._conn = sqlite3.connect(
+            self.path,
+            timeout=busy_timeout or INGEST_CONFIG['busy_timeout'],
+            isolation_level=None
+        )
+        self._conn.executescript("""
+            CREATE TABLE IF NOT EXISTS shard_leases (
+                run_id TEXT NOT NULL,
+                shard INTEGER NOT NULL,
+                owner TEXT,
+                lease_expires REAL,
+                done INTEGER NOT NULL DEFAULT 0,
+                PRIMARY KEY (run_id, shard)
+            );
+            CREATE TABLE IF NOT EXISTS shard_entries (
+                run_id TEXT NOT NULL,
+                shard INTEGER NOT NULL,
+                seq INTEGER NOT NULL,
+                payload TEXT NOT NULL,
+                PRIMARY KEY (run_id, shard, seq)
+            );
+        """)
+
+    def ensure_run(self, run_id, shard_count):
+        """Create the lease rows for a run; safe to call from every worker"""
+        self._conn.execute("BEGIN IMMEDIATE")
+        self._conn.executemany(
+            "INSERT OR IGNORE INTO shard_leases (run_id, shard) VALUES (?, ?)",
+            [(run_id, shard) for shard in range(shard_count)]
+        )
+        self._conn.execute("COMMIT")
+
+    def claim(self, run_id, owner, lease_seconds):
+        """Lease the next unfinished shard that is free or whose lease expired, or None"""
+        now = time.time()
+        self._conn.execute("BEGIN IMMEDIATE")
+        try:
+            row = self._conn.execute(
+                """SELECT shard FROM shard_leases
+                   WHERE run_id = ? AND done = 0 AND (owner IS NULL OR lease_expires < ?)
+                   ORDER BY shard LIMIT 1""",
+                (run_id, now)
+            ).fetchone()
+            if row is not None:
+                self._conn.execute(
+                    "UPDATE shard_leases SET owner = ?, lease_expires = ? WHERE run_id = ? AND shard = ?",
+                    (owner, now + lease_seconds, run_id, row[0])
+                )
+            self._conn.execute("COMMIT")
+        except Exception:
+            self._conn.execute("ROLLBACK")
+            raise
+        return None if row is None else row[0]
+
+    def renew(self, run_id, shard, owner, lease_seconds):
+        """Extend a lease; False if another worker has taken the shard over"""
+        return self._conn.execute(
+            """UPDATE shard_leases SET lease_expires = ?
+               WHERE run_id = ? AND shard = ? AND owner = ? AND done = 0""",
+            (time.time() + lease_seconds, run_id, shard, owner)
+        ).rowcount == 1
+
+    def complete(self, run_id, shard, owner, entries):
+        """Atomically store a shard's entries and mark it done, if the lease is still ours"""
+        self._conn.execute("BEGIN IMMEDIATE")
+        try:
+            still_owner = self._conn.execute(
+                "SELECT 1 FROM shard_leases WHERE run_id = ? AND shard = ? AND owner = ? AND done = 0",
+                (run_id, shard, owner)
+            ).fetchone()
+            if still_owner:
+                self._conn.execute("DELETE FROM shard_entries WHERE run_id = ? AND shard = ?", (run_id, shard))
+                self._conn.executemany(
+                    "INSERT INTO shard_entries (run_id, shard, seq, payload) VALUES (?, ?, ?, ?)",
+                    [
+                        (run_id, shard, seq, json.dumps(entry.to_dict(), ensure_ascii=False))
+                        for seq, entry in enumerate(entries)
+                    ]
+                )
+                self._conn.execute(
+                    "UPDATE shard_leases SET done = 1, lease_expires = NULL WHERE run_id = ? AND shard = ?",
+                    (run_id, shard)
+                )
+            self._conn.execute("COMMIT")
+        except Exception:
+            self._conn.execute("ROLLBACK")
+            raise
+        return bool(still_owner)
+
+    def pending(self, run_id):
+        """Number of shards of a run that are not finished yet"""
+        return self._conn.execute(
+            "SELECT COUNT(*) FROM shard_leases WHERE run_id = ? AND done = 0", (run_id,)
+        ).fetchone()[0]
+
+    def iter_entries(self, run_id):
+        """Stream a run's stored entries in shard order"""
+        cursor = self._conn.execute(
+            "SELECT payload FROM shard_entries WHERE run_id = ? ORDER BY shard, seq", (run_id,)
+        )
+        for (payload,) in cursor:
+            yield ContentEntry.from_dict(json.loads(payload))
+
+    def close(self):
+        self._conn.close()
+
+def store_path():
+    return Path(generator.ensure_data_directory()) / INGEST_CONFIG['store_file']
+
+def default_run_id():
+    return datetime.now().strftime('%Y%m%d')
+
+def run_worker(run_id, sources, shard_count, owner=None, data_dir=None):
+    """Claim and fetch shards until none are left; returns how many this worker finished
+
+    data_dir overrides CONFIG['data_dir'], which a spawned worker process would
+    otherwise see at its module default.
+    """
+    if data_dir is not None:
+        generator.CONFIG['data_dir'] = data_dir
+    owner = owner or f"{socket.gethostname()}:{os.getpid()}"
+    lease_seconds = INGEST_CONFIG['lease_seconds']
+    shards = shard_sources(sources, shard_count)
+
+    data_dir = Path(generator.ensure_data_directory())
+    store = ShardStore(store_path())
+    store.ensure_run(run_id, shard_count)
+    finished = 0
+
+    try:
+        while (shard := store.claim(run_id, owner, lease_seconds)) is not None:
+            shard_sources_ = shards[shard]
+            logger.info(f"🧩 {owner} claimed shard {shard} ({len(shard_sources_)} sources)")
+
+            # Each shard keeps its own feed state and seen-entry index; feeds stay
+            # on the same shard between runs, so this history carries over
+            batches = {}
+            lease_lost = False
+            state_tag = f"shard{shard}"
+            feed_state = FeedStateStore(
+                generator.state_file_path(data_dir, generator.CONFIG['feed_state_file'], state_tag)
+            )
+            seen_index = SeenEntryIndex(
+                generator.state_file_path(data_dir, generator.CONFIG['seen_index_file'], state_tag),
+                generator.CONFIG['seen_index_max_age_days']
+            )
+            try:
+                batch_iter = generator.iter_source_batches(
+                    shard_sources_, state_tag=state_tag, seen_index=seen_index, feed_state=feed_state
+                )
+                try:
+                    for source_index, entries in batch_iter:
+                        batches[source_index] = entries
+                        if not store.renew(run_id, shard, owner, lease_seconds):
+                            lease_lost = True
+                            break
+                finally:
+                    batch_iter.close()
+
+                entries = [entry for index in sorted(batches) for entry in batches[index]]
+                if not lease_lost and store.complete(run_id, shard, owner, entries):
+                    # Mark entries seen and keep the new validators only once the entries
+                    # are stored, or the shard's retry would skip them as seen or unmodified
+                    seen_index.commit()
+                    feed_state.save()
+                    finished += 1
+                    logger.info(f"✅ {owner} finished shard {shard}: {len(entries)} entries")
+                else:
+                    logger.warning(f"⚠️ {owner} lost the lease on shard {shard}; its results were discarded")
+            finally:
+                seen_index.close()
+    finally:
+        store.close()
+
+    return finished
+
+def merge_shards(run_id, sources):
+    """Rank the merged shard results into story outlines once every shard is done"""
+    store = ShardStore(store_path())
+    try:
+        pending = store.pending(run_id)
+        if pending:
+            logger.warning(f"⏳ {pending} shards of run {run_id} are not finished yet; not merging")
+            return None
+
+        logger.info(f"🔀 Merging shards of run {run_id}")
+        return generator.generate_content(sources, content=store.iter_entries(run_id))
+    finally:
+        store.close()
+
+def run_local(run_id, sources, shard_count, workers):
+    """Run several worker processes on this host, then merge their shards"""
+    processes = [
+        Process(
+            target=run_worker,
+            args=(run_id, sources, shard_count, None, generator.CONFIG['data_dir']),
+            name=f"ingest-{n}"
+        )
+        for n in range(workers)
+    ]
+    for process in processes:
+        process.start()
+    for process in processes:
+        process.join()
+
+    return merge_shards(run_id, sources)
+
+def main():
+    """Command line entry point for sharded ingestion"""
+    parser = argparse.ArgumentParser(description="Sharded, multi-worker feed ingestion for mytribal.ai")
+    parser.add_argument('command', choices=('worker', 'merge', 'run'),
+                        help="worker: claim and fetch shards; merge: rank finished shards; run: both, locally")
+    parser.add_argument('--opml', action='append', default=[], help="add the sources in this OPML file")
+    parser.add_argument('--no-builtin', action='store_true', help="skip the built-in EXTERNAL_RSS_SOURCES")
+    parser.add_argument('--shards', type=int, default=INGEST_CONFIG['shards'], help="number of shards")
+    parser.add_argument('--workers', type=int, default=os.cpu_count(), help="worker processes for 'run'")
+    parser.add_argument('--run-id', default=default_run_id(), help="identifies one ingestion run (default: today)")
+    parser.add_argument('--data-dir', default=generator.CONFIG['data_dir'], help="shared data directory")
+    args = parser.parse_args()
+
+    generator.CONFIG['data_dir'] = args.data_dir
+
+    sources = {} if args.no_builtin else dict(generator.EXTERNAL_RSS_SOURCES)
+    for opml_path in args.opml:
+        sources.update(load_opml(opml_path))
+
+    if args.command == 'worker':
+        run_worker(args.run_id, sources, args.shards)
+    elif args.command == 'merge':
+        merge_shards(args.run_id, sources)
+    else:
+        run_local(args.run_id, sources, args.shards, args.workers)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+"""
+Source Connectors
+Native JSON API sources (Hacker News, Reddit) that emit the same entries as the RSS path
+"""
+
+import json
+import time
+import logging
+from datetime import datetime, timezone
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+
+from bounded_download import download_body
+from pull_feed_parser import FeedDict
+
+logger = logging.getLogger(__name__)
+
+CONNECTOR_CONFIG = {
+    'item_workers': 8,             # Concurrent item lookups per source
+    'scan_factor': 4,              # Look at up to max_entries * scan_factor candidates
+    'popularity_saturation': 500   # Score at which popularity reaches 1.0
+}
+
+# Connector name -> function(fetch_json, source_info) returning a FeedDict with .entries
+CONNECTORS = {}
+
+def register_connector(name):
+    """Decorator that makes a connector available to sources as {'connector': name}"""
+    def decorator(func):
+        CONNECTORS[name] = func
+        return func
+    return decorator
+
+def get_connector(name):
+    """Look up a registered connector, with a clear error for typos in the source config"""
+    try:
+        return CONNECTORS[name]
+    except KeyError:
+        raise ValueError(f"Unknown source connector {name!r}; known: {', '.join(sorted(CONNECTORS))}") from None
+
+def json_fetcher(session, timeout, max_bytes, max_seconds, throttle=None):
+    """Build fetch_json(url) on top of the bounded downloader; HTTP errors raise HTTPError
+
+    With a throttle (a HostThrottle), every request, item lookups included, waits its turn.
+    """
+    def fetch_json(url):
+        if throttle is not None:
+            throttle.wait(url)
+        response, body, _ = download_body(
+            session, url, timeout=timeout, max_bytes=max_bytes, max_seconds=max_seconds
+        )
+        if response.status_code >= 400:
+            raise requests.HTTPError(f"HTTP {response.status_code} for {url}", response=response)
+        return json.loads(body)
+    return fetch_json
+
+def make_entry(title, link, guid, summary, created, score, source_info):
+    """An entry shaped like the RSS parser's, plus a 0-1 popularity from the score"""
+    saturation = source_info.get('popularity_saturation', CONNECTOR_CONFIG['popularity_saturation'])
+    created = int(created or time.time())
+    return FeedDict(
+        title=title or '',
+        link=link,
+        id=guid,
+        summary=summary or '',
+        published=datetime.fromtimestamp(created, timezone.utc).isoformat(),
+        published_parsed=time.gmtime(created),
+        score=score,
+        popularity=min(score / saturation, 1.0) if saturation else 0.0
+    )
+
+@register_connector('hacker_news_api')
+def hacker_news_api(fetch_json, source_info):
+    """
+    Hacker News via the Firebase API: url is a story list such as .../v0/topstories.json.
+
+    Items are looked up concurrently in batches, in list order, until max_entries
+    stories reaching min_score are found, so low-scoring stories never get text-scored.
+    """
+    base_url = source_info['url'].rsplit('/', 1)[0]
+    max_entries = source_info['max_entries']
+    min_score = source_info.get('min_score', 0)
+
+    story_ids = fetch_json(source_info['url'])[:max_entries * CONNECTOR_CONFIG['scan_factor']]
+    batch_size = max(max_entries, CONNECTOR_CONFIG['item_workers'])
+    entries = []
+    skipped = 0
+    looked_up = 0
+    failures = []
+
+    def fetch_item(story_id):
+        # One bad item must not cost the whole source; the error comes back instead
+        try:
+            return fetch_json(f"{base_url}/item/{story_id}.json")
+        except Exception as e:
+            return e
+
+    with ThreadPoolExecutor(max_workers=CONNECTOR_CONFIG['item_workers'], thread_name_prefix='hn-item') as executor:
+        for start in range(0, len(story_ids), batch_size):
+            batch = story_ids[start:start + batch_size]
+            for item in executor.map(fetch_item, batch):
+                looked_up += 1
+                if isinstance(item, Exception):
+                    failures.append(item)
+                    continue
+                if not item or item.get('type') != 'story' or item.get('dead') or item.get('deleted'):
+                    continue
+                if item.get('score', 0) < min_score:
+                    skipped += 1
+                    continue
+
+                discussion = f"https://news.ycombinator.com/item?id={item['id']}"
+                entries.append(make_entry(
+                    item.get('title'), item.get('url') or discussion, discussion,
+                    item.get('text'), item.get('time'), item.get('score', 0), source_info
+                ))
+                if len(entries) >= max_entries:
+                    break
+
+            if len(entries) >= max_entries:
+                break
+
+    if failures:
+        # Every lookup failing means the API is down, which the source's backoff should see
+        if len(failures) == looked_up:
+            raise failures[-1]
+        logger.warning(f"   ⚠️ Skipped {len(failures)} Hacker News items that could not be fetched: {failures[-1]}")
+    if skipped:
+        logger.info(f"   🔻 Skipped {skipped} Hacker News stories below {min_score} points")
+    return FeedDict(entries=entries)
+
+@register_connector('reddit_json')
+def reddit_json(fetch_json, source_info):
+    """Reddit via a .json listing such as /r/artificial/hot.json; one request returns every post"""
+    min_score = source_info.get('min_score', 0)
+    entries = []
+    skipped = 0
+
+    for child in fetch_json(source_info['url']).get('data', {}).get('children', []):
+        post = child.get('data', {})
+        if post.get('stickied'):
+            continue
+        if post.get('score', 0) < min_score:
+            skipped += 1
+            continue
+
+        entries.append(make_entry(
+            post.get('title'), f"https://www.reddit.com{post.get('permalink', '')}", post.get('name'),
+            post.get('selftext'), post.get('created_utc'), post.get('score', 0), source_info
+        ))
+        if len(entries) >= source_info['max_entries']:
+            break
+
+    if skipped:
+        logger.info(f"   🔻 Skipped {skipped} Reddit posts below {min_score} points")
+    return FeedDict(entries=entries)
@@ -0,0 +1,113 @@
+"""
+Shared fixtures: the repo root on sys.path, a scratch working directory and a
+local stand-in HTTP server
+"""
+
+import logging
+import sys
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+# With a root handler in place, the generator's logging.basicConfig leaves
+# daily_ai_content_generator.log alone when tests import it
+logging.getLogger().addHandler(logging.NullHandler())
+
+@pytest.fixture(autouse=True)
+def scratch_cwd(tmp_path, monkeypatch):
+    """Run every test in its own directory, so relative paths never touch the repo"""
+    monkeypatch.chdir(tmp_path)
+
+@pytest.fixture
+def data_dir(tmp_path, monkeypatch):
+    """A fresh data directory the generator and its stores write into"""
+    import daily_ai_content_generator as generator
+    path = tmp_path / 'content_for_mytribal'
+    path.mkdir()
+    monkeypatch.setitem(generator.CONFIG, 'data_dir', str(path))
+    monkeypatch.setitem(generator.CONFIG, 'request_delay', 0)
+    monkeypatch.setitem(generator.CONFIG, 'extract_articles', False)
+    return path
+
+@pytest.fixture
+def http_server():
+    """Serve routes {path: handler(request)} on localhost; yields the base URL and the routes"""
+    routes = {}
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'
+
+        def _dispatch(self):
+            route = routes.get(self.path.split('?')[0])
+            if route is None:
+                self.send_response(404)
+                self.send_header('Content-Length', '0')
+                self.end_headers()
+                return
+            route(self)
+
+        do_GET = do_POST = _dispatch
+
+        def log_message(self, format, *args):
+            pass
+
+    server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+    server.daemon_threads = True
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield f"http://127.0.0.1:{server.server_address[1]}", routes
+    finally:
+        server.shutdown()
+        server.server_close()
+
+def reply(request, body, status=200, headers=None):
+    """Send a complete response FROM a route handler"""
+    request.send_response(status)
+    for key, value in (headers or {}).items():
+        request.send_header(key, value)
+    if 'Content-Length' not in (headers or {}):
+        request.send_header('Content-Length', str(len(body)))
+    request.end_headers()
+    request.wfile.write(body)
+
+AI_TITLES = [
+    "OpenAI releases a new large language model for developers",
+    "Machine learning startup raises funding for AI chips",
+    "Google DeepMind shows neural network that plans robot tasks",
+    "Generative AI tools change how newsrooms write headlines",
+    "Nvidia GPU demand grows as artificial intelligence training scales",
+    "Anthropic publishes research on AI safety and alignment",
+]
+
+def rss_feed(title, items):
+    """RSS 2.0 bytes for (title, link, description) items"""
+    entries = ''.join(
+        f"<item><title>{item_title}</title><link>{link}</link><guid>{link}</guid>"
+        f"<description>{description}</description>"
+        f"<pubDate>Mon, 06 Oct 2025 10:00:00 +0000</pubDate></item>"
+        for item_title, link, description in items
+    )
+    return (
+        f'<?xml version="1.0"?><rss version="2.0"><channel><title>{title}</title>'
+        f'<link>https://example.com/</link>{entries}</channel></rss>'
+    ).encode('utf-8')
+
+def ai_feed(name, count=6):
+    """A feed of AI stories whose links are unique to the feed name"""
+    return rss_feed(name, [
+        (f"{AI_TITLES[i % len(AI_TITLES)]} ({name} {i})", f"https://example.com/{name}/{i}",
+         f"{AI_TITLES[i % len(AI_TITLES)]}: machine learning and AI models in depth.")
+        for i in range(count)
+    ])
+
+def feed_sources(base_url, names, **extra):
+    """Generator source configs for feeds served at base_url/<name>.xml"""
+    return {
+        name: {'url': f"{base_url}/{name}.xml", 'category': 'tech_news', 'weight': 0.9, 'max_entries': 10, **extra}
+        for name in names
+    }
@@ -0,0 +1,37 @@
+import requests
+
+import article_extractor
+from article_extractor import attach_article_text
+from conftest import reply
+
+PARAGRAPH = "Researchers trained a new language model on a much larger corpus than before. " * 3
+
+class Story:
+    def __init__(self, link):
+        self.link = link
+        self.summary = "Feed summary"
+        self.article_text = None
+
+def test_broken_articles_fall_back_to_the_feed_summary(http_server, tmp_path, monkeypatch):
+    base_url, routes = http_server
+    routes['/good'] = lambda r: reply(r, f"<article><p>{PARAGRAPH}</p></article>".encode('utf-8'))
+    routes['/bad-gzip'] = lambda r: reply(r, b'this is not gzip', headers={'Content-Encoding': 'gzip'})
+    routes['/unparsable'] = lambda r: reply(r, b'<p>anything</p>')
+
+    extract = article_extractor.extract_main_text
+
+    def failing_extract(html):
+        if 'anything' in html:
+            raise ValueError("parser gave up")
+        return extract(html)
+
+    monkeypatch.setattr(article_extractor, 'extract_main_text', failing_extract)
+
+    stories = [Story(f"{base_url}/{path}") for path in ('good', 'bad-gzip', 'unparsable')]
+    with requests.Session() as session:
+        extracted = attach_article_text(stories, session, tmp_path, timeout=5)
+
+    assert extracted == 1
+    assert PARAGRAPH.strip() in stories[0].article_text
+    assert stories[1].article_text is None
+    assert stories[2].article_text is None
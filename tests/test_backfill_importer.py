@@ -0,0 +1,44 @@
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+import backfill_importer
+from content_store import ContentStore
+
+def raw(link, source_name='feed'):
+    return {'title': f"Story at {link}", 'link': link, 'source_name': source_name}
+
+def site_post(link, day):
+    return {'title': f"Post at {link}", 'link': link, 'feed_url': 'https://mytribal.ai/feed/',
+            'parsed_date': f"{day}T09:00:00"}
+
+def test_earliest_day_wins_whatever_the_file_order(tmp_path):
+    data_dir = tmp_path / 'data'
+    data_dir.mkdir()
+    (data_dir / 'raw_content_2025-10-02.json').write_text(json.dumps([raw('https://example.com/x')]))
+    (data_dir / 'raw_content_2025-10-01.json').write_text(json.dumps([raw('https://example.com/y')]))
+    site_file = tmp_path / 'mytribal_rss_data.json'
+    site_file.write_text(json.dumps([
+        site_post('https://example.com/x', '2025-09-30'),
+        site_post('https://example.com/y', '2025-10-05')
+    ]))
+
+    store = ContentStore(tmp_path / 'content_store.db')
+    # Directory first: its files hold the later day for x, the earlier one for y
+    result = backfill_importer.run_backfill(store, [data_dir, site_file])
+    days = dict(store._conn.execute("SELECT link, day FROM raw_entries").fetchall())
+    store.close()
+
+    assert result['imported'] == 3
+    assert days == {'https://example.com/x': '2025-09-30', 'https://example.com/y': '2025-10-01'}
+
+def test_importing_does_not_load_the_generator(tmp_path):
+    repo = Path(backfill_importer.__file__).resolve().parent
+    loaded = subprocess.run(
+        [sys.executable, '-c', "import sys, backfill_importer; print('daily_ai_content_generator' in sys.modules)"],
+        cwd=tmp_path, env={'PYTHONPATH': str(repo)}, capture_output=True, text=True, check=True
+    ).stdout.strip()
+
+    assert loaded == 'False'
+    assert not (tmp_path / 'daily_ai_content_generator.log').exists()
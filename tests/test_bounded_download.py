@@ -0,0 +1,49 @@
+import gzip
+
+import pytest
+import requests
+
+from bounded_download import download_body, DownloadTooLarge
+from conftest import reply
+
+def test_streams_and_decompresses_gzip(http_server):
+    base_url, routes = http_server
+    body = b'<rss>' + b'x' * 10000 + b'</rss>'
+    routes['/feed'] = lambda r: reply(r, gzip.compress(body), headers={'Content-Encoding': 'gzip'})
+
+    with requests.Session() as session:
+        response, received, wire_bytes = download_body(session, base_url + '/feed')
+
+    assert response.status_code == 200
+    assert received == body
+    assert wire_bytes < len(body)
+
+def test_truncated_body_raises_request_exception(http_server):
+    base_url, routes = http_server
+
+    def truncated(request):
+        # Promise more than is sent, then hang up
+        request.send_response(200)
+        request.send_header('Content-Length', '1000')
+        request.end_headers()
+        request.wfile.write(b'<rss>only part')
+        request.wfile.flush()
+        request.close_connection = True
+
+    routes['/feed'] = truncated
+    with requests.Session() as session, pytest.raises(requests.RequestException):
+        download_body(session, base_url + '/feed')
+
+def test_invalid_gzip_raises_request_exception(http_server):
+    base_url, routes = http_server
+    routes['/feed'] = lambda r: reply(r, b'this is not gzip at all', headers={'Content-Encoding': 'gzip'})
+
+    with requests.Session() as session, pytest.raises(requests.exceptions.ContentDecodingError):
+        download_body(session, base_url + '/feed')
+
+def test_oversized_body_is_refused(http_server):
+    base_url, routes = http_server
+    routes['/feed'] = lambda r: reply(r, b'x' * 5000)
+
+    with requests.Session() as session, pytest.raises(DownloadTooLarge):
+        download_body(session, base_url + '/feed', max_bytes=1000)
@@ -0,0 +1,29 @@
+import wordpress_rest_publisher as publisher
+from content_store import ContentStore
+
+def test_rerun_keeps_row_ids_and_only_rewrites_changed_entries(tmp_path):
+    store = ContentStore(tmp_path / 'content_store.db')
+    entry = {'link': 'https://example.com/a', 'title': 'OpenAI model', 'source_name': 'feed'}
+    store.add_raw_entries([entry], day='2025-10-06')
+    fetched_at = store._conn.execute("SELECT fetched_at FROM raw_entries").fetchone()[0]
+
+    store.add_raw_entries([entry], day='2025-10-06')
+    assert store._conn.execute("SELECT fetched_at FROM raw_entries").fetchone()[0] == fetched_at
+
+    store.add_raw_entries([{**entry, 'title': 'OpenAI model, updated'}], day='2025-10-06')
+    assert [row['title'] for row in store.raw_entries('2025-10-06')] == ['OpenAI model, updated']
+
+    outline = {'story_number': 1, 'content': {'original_link': entry['link'], 'title': entry['title']}}
+    [outline_id] = store.add_outlines([outline], day='2025-10-06')
+    store.mark_published(outline_id)
+    assert store.add_outlines([{**outline, 'story_number': 2}], day='2025-10-06') == [outline_id]
+    store.close()
+
+def test_publisher_opens_the_store_in_the_given_data_dir(tmp_path):
+    data_dir = tmp_path / 'elsewhere'
+    assert publisher.open_content_store(data_dir=str(data_dir)) is None
+
+    store = publisher.open_content_store(create=True, data_dir=str(data_dir))
+    store.close()
+    assert (data_dir / publisher.CONTENT_STORE_FILE).exists()
+    publisher.open_content_store(data_dir=str(data_dir)).close()
@@ -0,0 +1,52 @@
+import threading
+from concurrent.futures import ProcessPoolExecutor
+
+import requests
+
+import daily_ai_content_generator as generator
+from conftest import ai_feed, feed_sources, reply
+from feed_fixtures import RecordingSession, ReplaySession
+
+def fetch_all(sources, session):
+    return {
+        index: [(entry.link, entry.ai_relevance_score) for entry in entries]
+        for index, entries in generator.iter_source_batches(sources, session)
+    }
+
+def test_replay_with_parse_workers_matches_thread_parsing(http_server, data_dir, tmp_path, monkeypatch):
+    base_url, routes = http_server
+    names = [f"feed{i}" for i in range(4)]
+    for name in names:
+        body = ai_feed(name)
+        routes[f"/{name}.xml"] = lambda r, body=body: reply(r, body, headers={'Content-Type': 'application/rss+xml'})
+    sources = feed_sources(base_url, names)
+
+    fixtures = tmp_path / 'fixtures'
+    fetch_all(sources, RecordingSession(requests.Session(), fixtures))
+
+    for state_file in data_dir.iterdir():
+        state_file.unlink()
+    monkeypatch.setitem(generator.CONFIG, 'parse_workers', 0)
+    threaded = fetch_all(sources, ReplaySession(fixtures))
+
+    for state_file in data_dir.iterdir():
+        state_file.unlink()
+    monkeypatch.setitem(generator.CONFIG, 'parse_workers', 2)
+    pools = []
+
+    def recording_pool(*args, **kwargs):
+        pools.append(kwargs)
+        return ProcessPoolExecutor(*args, **kwargs)
+
+    monkeypatch.setattr(generator, 'ProcessPoolExecutor', recording_pool)
+    result = {}
+    # A forked pool used to deadlock here; run it where a hang fails the test instead
+    worker = threading.Thread(target=lambda: result.update(fetch_all(sources, ReplaySession(fixtures))), daemon=True)
+    worker.start()
+    worker.join(timeout=120)
+
+    assert not worker.is_alive(), "parsing in the process pool did not finish"
+    # Workers start lazily on a fetch thread, so forking them could copy a held lock
+    assert pools and pools[0]['mp_context'].get_start_method() != 'fork'
+    assert result == threaded
+    assert sum(len(entries) for entries in threaded.values()) > 0
@@ -0,0 +1,30 @@
+import feedparser
+import pytest
+
+from pull_feed_parser import iter_feed_entries
+
+ATOM = b'''<?xml version="1.0"?><feed xmlns="http://www.w3.org/2005/Atom"><title>t</title>
+<entry><title type="html">&lt;b&gt;Bold&lt;/b&gt; &lt;script&gt;x&lt;/script&gt;</title><link href="https://e.com/1"/><id>1</id>
+<summary type="html">&lt;p onclick="x()"&gt;Hi&lt;script&gt;alert(1)&lt;/script&gt;&lt;/p&gt;</summary></entry>
+<entry><title>AT&amp;T &lt;b&gt;</title><link href="https://e.com/2"/><id>2</id><summary>AT&amp;T &lt;script&gt;x&lt;/script&gt; 1 &lt; 2</summary></entry>
+<entry><title>x</title><link href="https://e.com/3"/><id>3</id><content type="xhtml">
+<div xmlns="http://www.w3.org/1999/xhtml"><p onclick="x()">Hi</p><script>alert(1)</script></div></content></entry>
+</feed>'''
+
+RSS = b'''<?xml version="1.0"?><rss version="2.0"><channel><title>t</title>
+<item><title>A &amp; B</title><link>https://e.com/1</link>
+<description>&lt;p onclick="x()"&gt;Hi &lt;script&gt;alert(1)&lt;/script&gt;&lt;b&gt;bold&lt;/b&gt; AT&amp;amp;T&lt;/p&gt;</description></item>
+<item><title>plain</title><link>https://e.com/2</link><description>AT&amp;T rocks &amp; 1 &lt; 2</description></item>
+<item><title>cdata</title><link>https://e.com/3</link>
+<description><![CDATA[<iframe src="x"></iframe><a href="javascript:x()">l</a> <img src="a.png" onerror="y()">]]></description></item>
+</channel></rss>'''
+
+@pytest.mark.parametrize('body', [ATOM, RSS], ids=['atom', 'rss'])
+def test_markup_is_sanitized_like_feedparser(body):
+    expected = feedparser.parse(body).entries
+    entries = list(iter_feed_entries([body]))
+
+    assert [(entry.title, entry.get('summary')) for entry in entries] == \
+        [(entry.title, entry.get('summary')) for entry in expected]
+    assert not any('script' in entry.get('summary', '') or 'onclick' in entry.get('summary', '')
+                   for entry in entries if entry.link != 'https://e.com/2')
@@ -0,0 +1,46 @@
+import multiprocessing
+import time
+
+import daily_ai_content_generator as generator
+import sharded_ingest
+from conftest import ai_feed, feed_sources, reply
+from sharded_ingest import ShardStore
+
+def test_expired_lease_is_reassigned(tmp_path):
+    store = ShardStore(tmp_path / 'ingest.db')
+    store.ensure_run('run', 1)
+
+    assert store.claim('run', 'worker-a', 0.2) == 0
+    assert store.claim('run', 'worker-b', 0.2) is None  # Still leased to worker-a
+
+    time.sleep(0.3)
+    assert store.claim('run', 'worker-b', 60) == 0
+
+    # worker-a woke up too late: it can neither renew nor store its results
+    assert not store.renew('run', 0, 'worker-a', 60)
+    assert not store.complete('run', 0, 'worker-a', [])
+    assert store.pending('run') == 1
+
+    assert store.complete('run', 0, 'worker-b', [])
+    assert store.pending('run') == 0
+    store.close()
+
+def test_spawned_workers_use_the_configured_data_dir(http_server, data_dir, tmp_path, monkeypatch):
+    base_url, routes = http_server
+    # Not the default directory name, which a worker would also find in the working directory
+    shared_dir = tmp_path / 'shared'
+    shared_dir.mkdir()
+    monkeypatch.setitem(generator.CONFIG, 'data_dir', str(shared_dir))
+    names = [f"feed{i}" for i in range(3)]
+    for name in names:
+        body = ai_feed(name)
+        routes[f"/{name}.xml"] = lambda r, body=body: reply(r, body, headers={'Content-Type': 'application/rss+xml'})
+    sources = feed_sources(base_url, names)
+
+    # Spawned workers start FROM the module defaults, as on macOS and Windows
+    monkeypatch.setattr(sharded_ingest, 'Process', multiprocessing.get_context('spawn').Process)
+    monkeypatch.setattr(generator, 'generate_content', lambda sources, content: list(content))
+    entries = sharded_ingest.run_local('run', sources, 2, 2)
+
+    assert {entry.source_name for entry in entries} == set(names)
+    assert list(shared_dir.glob('seen_entries_shard*.db'))
@@ -0,0 +1,30 @@
+import pytest
+
+import daily_ai_content_generator as generator
+from conftest import ai_feed, feed_sources, reply
+
+def test_failed_run_keeps_neither_seen_entries_nor_validators(http_server, data_dir):
+    base_url, routes = http_server
+    requests_seen = []
+
+    def feed(request):
+        requests_seen.append(request.headers.get('If-None-Match'))
+        if request.headers.get('If-None-Match') == '"v1"':
+            reply(request, b'', status=304, headers={'ETag': '"v1"'})
+        else:
+            reply(request, ai_feed('feed0'), headers={'ETag': '"v1"', 'Content-Type': 'application/rss+xml'})
+
+    routes['/feed0.xml'] = feed
+    sources = feed_sources(base_url, ['feed0'])
+
+    with pytest.raises(RuntimeError):
+        for _ in generator.iter_source_batches(sources):
+            raise RuntimeError("storing the entries failed")
+
+    assert not (data_dir / 'feed_state.json').exists()
+
+    # The retry downloads the feed in full and finds every entry new again
+    batches = list(generator.iter_source_batches(sources))
+    assert requests_seen == [None, None]
+    assert batches and batches[0][1]
+    assert (data_dir / 'feed_state.json').exists()
@@ -0,0 +1,56 @@
+import json
+import time
+
+import pytest
+
+import daily_ai_content_generator as generator
+from conftest import reply
+from feed_state import FeedStateStore
+
+def hn_source(base_url):
+    return {'hn': {
+        'url': f"{base_url}/v0/topstories.json", 'connector': 'hacker_news_api',
+        'category': 'tech_community', 'weight': 0.8, 'max_entries': 3, 'min_score': 0
+    }}
+
+def test_item_lookups_wait_for_the_host_throttle(http_server, data_dir, monkeypatch):
+    base_url, routes = http_server
+    monkeypatch.setitem(generator.CONFIG, 'request_delay', 0.2)
+    request_times = []
+
+    def respond(request, payload):
+        request_times.append(time.monotonic())
+        reply(request, json.dumps(payload).encode('utf-8'), headers={'Content-Type': 'application/json'})
+
+    routes['/v0/topstories.json'] = lambda r: respond(r, [1, 2, 3])
+    for item_id in (1, 2, 3):
+        routes[f"/v0/item/{item_id}.json"] = lambda r, item_id=item_id: respond(r, {
+            'id': item_id, 'type': 'story', 'score': 100, 'time': 1759744800,
+            'title': f"OpenAI machine learning model {item_id}", 'url': f"https://example.com/{item_id}"
+        })
+
+    list(generator.iter_source_batches(hn_source(base_url)))
+
+    assert len(request_times) == 4
+    gaps = [later - earlier for earlier, later in zip(request_times, request_times[1:])]
+    assert min(gaps) >= 0.15
+
+@pytest.mark.parametrize('route', [
+    lambda r: reply(r, b'{"error": "down"}', status=500),
+    lambda r: reply(r, b'not json at all', headers={'Content-Type': 'application/json'})
+], ids=['http-500', 'bad-json'])
+def test_failing_connector_backs_off(http_server, data_dir, route):
+    base_url, routes = http_server
+    calls = []
+    routes['/v0/topstories.json'] = lambda r: (calls.append(1), route(r))
+    sources = hn_source(base_url)
+    url = sources['hn']['url']
+
+    assert list(generator.iter_source_batches(sources)) == [(0, [])]
+    state = FeedStateStore(data_dir / 'feed_state.json').get(url)
+    assert state['failures'] == 1
+    assert state['backoff_until'] > time.time()
+
+    # The breaker is open: the next run does not contact the API at all
+    list(generator.iter_source_batches(sources))
+    assert len(calls) == 1
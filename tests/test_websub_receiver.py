@@ -0,0 +1,143 @@
+import threading
+import time
+
+import pytest
+import requests
+
+import daily_ai_content_generator as generator
+from conftest import AI_TITLES, rss_feed
+from websub_receiver import WebSubReceiver
+
+def push_body(name, title_indexes):
+    return rss_feed(name, [
+        (f"{AI_TITLES[i]} ({name})", f"https://example.com/{name}/{i}",
+         f"{AI_TITLES[i]}: machine learning and AI models in depth.")
+        for i in title_indexes
+    ])
+
+@pytest.fixture
+def receiver(data_dir):
+    sources = {
+        name: {'url': f"https://example.com/{name}.xml", 'category': 'tech_news', 'weight': 0.9, 'max_entries': 10}
+        for name in ('push_a', 'push_b')
+    }
+    with requests.Session() as session:
+        yield WebSubReceiver(sources=sources, callback_base='http://127.0.0.1:1', session=session)
+
+def test_failed_ingest_leaves_entries_unseen(receiver, data_dir, monkeypatch):
+    body = push_body('push_a', [0, 1])
+
+    def failing_generate(*args, **kwargs):
+        raise OSError("disk full")
+
+    monkeypatch.setattr(generator, 'generate_content', failing_generate)
+    with pytest.raises(OSError):
+        receiver.ingest('push_a', body)
+    monkeypatch.undo()
+    monkeypatch.setitem(generator.CONFIG, 'data_dir', str(data_dir))
+    monkeypatch.setitem(generator.CONFIG, 'request_delay', 0)
+    monkeypatch.setitem(generator.CONFIG, 'extract_articles', False)
+
+    # The retried push still finds its entries new
+    receiver.ingest('push_a', body)
+    assert generator.load_story_outlines(data_dir)
+
+def test_concurrent_appends_keep_every_outline(receiver, data_dir, monkeypatch):
+    outline_stories = generator.iter_story_outlines
+
+    def slow_outlines(*args, **kwargs):
+        # Without the write lock, both pushes read today's outlines before either saves
+        time.sleep(0.5)
+        return outline_stories(*args, **kwargs)
+
+    monkeypatch.setattr(generator, 'iter_story_outlines', slow_outlines)
+    pushes = [
+        threading.Thread(target=receiver.ingest, args=('push_a', push_body('push_a', [0, 1]))),
+        threading.Thread(target=receiver.ingest, args=('push_b', push_body('push_b', [2, 3])))
+    ]
+    for push in pushes:
+        push.start()
+    for push in pushes:
+        push.join()
+
+    outlines = generator.load_story_outlines(data_dir)
+    assert {outline['source_info']['name'] for outline in outlines} == {'push_a', 'push_b'}
+    assert sorted(outline['story_number'] for outline in outlines) == list(range(1, len(outlines) + 1))
+
+def test_pushed_feeds_are_polled_only_as_a_safety_net(receiver, data_dir, monkeypatch):
+    import adaptive_scheduler
+    from feed_state import FeedStateStore
+
+    monkeypatch.setattr(generator, 'EXTERNAL_RSS_SOURCES', receiver.sources)
+    url = receiver.sources['push_a']['url']
+    receiver.feed_state.update(url, websub_expires=time.time() + 5 * 86400)
+    receiver.ingest('push_a', push_body('push_a', [0]))
+
+    push_state = adaptive_scheduler.load_push_state(data_dir)
+    assert push_state.get(url)['last_pushed'] == pytest.approx(time.time(), abs=60)
+
+    # Never polled, both would be due; the subscribed one waits out the safety-net interval
+    feed_state = FeedStateStore(data_dir / 'feed_state.json')
+    assert set(adaptive_scheduler.due_sources(feed_state, push_state=push_state)) == {'push_b'}
+    later = time.time() + adaptive_scheduler.SCHEDULER_CONFIG['subscribed_poll_interval'] + 1
+    assert set(adaptive_scheduler.due_sources(feed_state, later, push_state)) == {'push_b', 'push_a'}
+
+def test_signature_valid():
+    import hashlib
+    import hmac
+
+    from websub_receiver import signature_valid
+
+    body = b'<rss>pushed</rss>'
+    digest = hmac.new(b'secret', body, hashlib.sha256).hexdigest()
+
+    assert signature_valid('secret', body, f"sha256={digest}")
+    assert signature_valid('secret', body, f"sha256={digest.upper()}")
+    assert not signature_valid('other', body, f"sha256={digest}")
+    assert not signature_valid('secret', body + b' ', f"sha256={digest}")
+    assert not signature_valid('secret', body, f"md5={hashlib.md5(body).hexdigest()}")
+    assert not signature_valid('secret', body, None)
+
+def test_verify_intent_confirms_only_what_was_requested(receiver):
+    url = receiver.sources['push_a']['url']
+    receiver.feed_state.update(url, websub_topic=url, websub_secret='secret', websub_pending='subscribe')
+    params = {'hub.mode': 'subscribe', 'hub.topic': url, 'hub.challenge': 'abc', 'hub.lease_seconds': '3600'}
+
+    assert receiver.verify_intent('push_a', {**params, 'hub.topic': 'https://evil.example/feed'}) == (404, b'')
+    assert receiver.verify_intent('push_a', {**params, 'hub.mode': 'unsubscribe'}) == (404, b'')
+    assert receiver.verify_intent('unknown', params) == (404, b'')
+
+    assert receiver.verify_intent('push_a', params) == (200, b'abc')
+    state = receiver.feed_state.get(url)
+    assert 'websub_pending' not in state
+    assert state['websub_expires'] == pytest.approx(time.time() + 3600, abs=60)
+
+    # Confirmed once; a replayed verification finds nothing pending
+    assert receiver.verify_intent('push_a', params) == (404, b'')
+
+def test_signed_push_over_http_is_ingested(receiver, data_dir):
+    import hashlib
+    import hmac
+
+    for source_info in receiver.sources.values():
+        receiver.feed_state.update(source_info['url'], websub_secret='secret')
+    server = receiver.make_server('127.0.0.1', 0)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    callback = f"http://127.0.0.1:{server.server_address[1]}/websub/"
+
+    try:
+        forged_body = push_body('push_b', [2, 3])
+        forged = requests.post(callback + 'push_b', data=forged_body,
+                               headers={'X-Hub-Signature': 'sha256=' + '0' * 64})
+        body = push_body('push_a', [0, 1])
+        signature = 'sha256=' + hmac.new(b'secret', body, hashlib.sha256).hexdigest()
+        signed = requests.post(callback + 'push_a', data=body, headers={'X-Hub-Signature': signature})
+        receiver._pushes.join()
+    finally:
+        server.shutdown()
+        server.server_close()
+
+    # WebSub wants a 2xx either way; only the signed push reaches today's outlines
+    assert forged.status_code == signed.status_code == 202
+    outlines = generator.load_story_outlines(data_dir)
+    assert outlines and {outline['source_info']['name'] for outline in outlines} == {'push_a'}
@@ -0,0 +1,323 @@
+#!/usr/bin/env python3
+"""
+WebSub Receiver for mytribal.ai
+Subscribes to the hubs our feeds advertise and ingests pushed updates within seconds
+"""
+
+import argparse
+import hmac
+import logging
+import queue
+import re
+import secrets
+import sqlite3
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import urlparse, parse_qs, quote
+
+import schedule
+
+import daily_ai_content_generator as generator
+from bounded_download import download_body
+from feed_state import FeedStateStore
+from seen_entry_index import SeenEntryIndex
+
+logger = logging.getLogger(__name__)
+
+WEBSUB_CONFIG = {
+    'host': '0.0.0.0',
+    'port': 8080,
+    'callback_base': 'http://localhost:8080',  # Public URL hubs can reach this receiver at
+    'callback_path': '/websub/',
+    'lease_seconds': 5 * 86400,                # Requested; the hub has the final say
+    'renew_fraction': 0.8,                     # Resubscribe after this share of the lease
+    'max_push_bytes': 5 * 1024 * 1024,
+    'state_tag': 'websub',                     # Subscription state lives in feed_state_websub.json
+    'push_retry_seconds': 60,                  # Wait before retrying a push while a poll holds the index
+    'push_max_attempts': 10
+}
+
+LINK_TAG = re.compile(r'<(?:atom:)?link\b[^>]*>', re.IGNORECASE)
+LINK_ATTR = re.compile(r'(\w+)\s*=\s*["\']([^"\']*)["\']')
+
+def discover_hub(headers, body):
+    """Return (hub, topic) advertised by a feed's Link headers or <link> elements"""
+    hub = topic = None
+
+    # HTTP Link header: <https://hub>; rel="hub", <https://feed>; rel="self"
+    for part in headers.get('Link', '').split(','):
+        match = re.match(r'\s*<([^>]+)>\s*;.*rel="?([^";]+)"?', part)
+        if match:
+            rels = match.group(2).split()
+            hub = hub or (match.group(1) if 'hub' in rels else None)
+            topic = topic or (match.group(1) if 'self' in rels else None)
+
+    # Links live near the top of the document, before the entries
+    head = body[:64 * 1024].decode('utf-8', errors='replace')
+    for tag in LINK_TAG.findall(head):
+        attrs = {key.lower(): value for key, value in LINK_ATTR.findall(tag)}
+        rels = attrs.get('rel', '').split()
+        if 'hub' in rels:
+            hub = hub or attrs.get('href')
+        if 'self' in rels:
+            topic = topic or attrs.get('href')
+
+    return hub, topic
+
+def signature_valid(secret, body, header):
+    """Check an X-Hub-Signature header ("sha1=...", "sha256=..." etc.) against the body"""
+    if not header or '=' not in header:
+        return False
+
+    method, digest = header.split('=', 1)
+    if method not in ('sha1', 'sha256', 'sha384', 'sha512'):
+        return False
+    expected = hmac.new(secret.encode('utf-8'), body, method).hexdigest()
+    return hmac.compare_digest(expected, digest.strip().lower())
+
+class WebSubReceiver:
+    """Manages hub subscriptions for the configured sources and ingests pushed content"""
+
+    def __init__(self, sources=None, callback_base=None, session=None):
+        self.sources = generator.EXTERNAL_RSS_SOURCES if sources is None else sources
+        self.callback_base = (callback_base or WEBSUB_CONFIG['callback_base']).rstrip('/')
+        self.session = session or generator.create_http_session()
+
+        data_dir = Path(generator.ensure_data_directory())
+        # A file of our own: the poller's save() would otherwise overwrite our keys and we its validators
+        self.feed_state = FeedStateStore(
+            generator.state_file_path(data_dir, generator.CONFIG['feed_state_file'], WEBSUB_CONFIG['state_tag'])
+        )
+        self.seen_index_path = data_dir / generator.CONFIG['seen_index_file']
+
+        self._pushes = queue.Queue()
+        self._worker = threading.Thread(target=self._ingest_loop, name='websub-ingest', daemon=True)
+
+    def callback_url(self, source_name):
+        return f"{self.callback_base}{WEBSUB_CONFIG['callback_path']}{quote(source_name)}"
+
+    def subscribe(self, source_name, mode='subscribe'):
+        """Discover a source's hub and ask it to (un)subscribe us; False if it has none"""
+        source_info = self.sources[source_name]
+        url = source_info['url']
+
+        response, body, _ = download_body(
+            self.session, url,
+            timeout=generator.CONFIG['request_timeout'],
+            max_bytes=generator.CONFIG['max_feed_bytes'],
+            max_seconds=generator.CONFIG['max_download_seconds']
+        )
+        hub, topic = discover_hub(response.headers, body)
+        if not hub:
+            logger.info(f"   ➖ {source_name} advertises no WebSub hub; it stays on polling")
+            return False
+
+        topic = topic or url
+        secret = self.feed_state.get(url).get('websub_secret') or secrets.token_hex(20)
+        self.feed_state.update(url, websub_hub=hub, websub_topic=topic, websub_secret=secret,
+                               websub_pending=mode)
+        self.feed_state.save()
+
+        response = self.session.post(hub, data={
+            'hub.mode': mode,
+            'hub.topic': topic,
+            'hub.callback': self.callback_url(source_name),
+            'hub.secret': secret,
+            'hub.lease_seconds': WEBSUB_CONFIG['lease_seconds']
+        }, timeout=generator.CONFIG['request_timeout'])
+
+        if response.status_code not in (202, 204):
+            logger.warning(f"⚠️ Hub {hub} refused {mode} for {source_name}: HTTP {response.status_code}")
+            return False
+
+        logger.info(f"📮 Requested {mode} to {topic} at {hub}")
+        return True
+
+    def subscribe_all(self):
+        """Subscribe every source that advertises a hub"""
+        logger.info(f"📮 Looking for WebSub hubs across {len(self.sources)} sources...")
+        for source_name, source_info in self.sources.items():
+            if source_info.get('connector'):
+                continue
+            try:
+                self.subscribe(source_name)
+            except Exception as e:
+                logger.error(f"❌ Could not subscribe to {source_name}: {e}")
+
+    def renew_due(self):
+        """Resubscribe before leases run out"""
+        now = time.time()
+        for source_name, source_info in self.sources.items():
+            state = self.feed_state.get(source_info['url'])
+            if state.get('websub_renew_at') and state['websub_renew_at'] <= now:
+                try:
+                    self.subscribe(source_name)
+                except Exception as e:
+                    logger.error(f"❌ Could not renew subscription to {source_name}: {e}")
+
+    def verify_intent(self, source_name, params):
+        """Answer a hub's verification GET; returns (status, body)"""
+        source_info = self.sources.get(source_name)
+        if source_info is None:
+            return 404, b''
+
+        url = source_info['url']
+        state = self.feed_state.get(url)
+        mode = params.get('hub.mode')
+        topic = params.get('hub.topic')
+
+        if mode == 'denied':
+            logger.warning(f"🚫 Hub denied subscription to {source_name}: {params.get('hub.reason', 'no reason')}")
+            self.feed_state.update(url, websub_pending=None)
+            return 200, b''
+
+        # Only confirm what we actually asked for, so nobody can subscribe us to anything else
+        if mode not in ('subscribe', 'unsubscribe') or mode != state.get('websub_pending') \
+                or topic != state.get('websub_topic'):
+            return 404, b''
+
+        if mode == 'subscribe':
+            lease = int(params.get('hub.lease_seconds', WEBSUB_CONFIG['lease_seconds']))
+            self.feed_state.update(
+                url,
+                websub_pending=None,
+                websub_expires=time.time() + lease,
+                websub_renew_at=time.time() + lease * WEBSUB_CONFIG['renew_fraction']
+            )
+            logger.info(f"✅ Subscribed to {source_name} for {lease / 3600:.0f}h")
+        else:
+            self.feed_state.update(url, websub_pending=None, websub_expires=None, websub_renew_at=None,
+                                   websub_secret=None)
+            logger.info(f"👋 Unsubscribed FROM {source_name}")
+
+        self.feed_state.save()
+        return 200, params.get('hub.challenge', '').encode('utf-8')
+
+    def accept_push(self, source_name, body, signature):
+        """Queue a pushed feed body for ingestion if its HMAC signature checks out"""
+        source_info = self.sources.get(source_name)
+        if source_info is None:
+            return False
+
+        secret = self.feed_state.get(source_info['url']).get('websub_secret')
+        if not secret or not signature_valid(secret, body, signature):
+            logger.warning(f"🚫 Ignoring push for {source_name} with a missing or bad signature")
+            return False
+
+        self._pushes.put((source_name, body, 1))
+        return True
+
+    def _ingest_loop(self):
+        """Ingest pushes one at a time so today's files only ever have one writer"""
+        while True:
+            source_name, body, attempt = self._pushes.get()
+            try:
+                self.ingest(source_name, body)
+            except sqlite3.OperationalError as e:
+                # A scheduled poll holds the seen-entry index until it finishes; try again later
+                if attempt >= WEBSUB_CONFIG['push_max_attempts']:
+                    logger.error(f"❌ Dropping push FROM {source_name} after {attempt} attempts: {e}")
+                else:
+                    logger.warning(f"⏳ Push FROM {source_name} deferred ({e}), retrying in {WEBSUB_CONFIG['push_retry_seconds']}s")
+                    threading.Timer(
+                        WEBSUB_CONFIG['push_retry_seconds'], self._pushes.put, ((source_name, body, attempt + 1),)
+                    ).start()
+            except Exception as e:
+                logger.error(f"❌ Error ingesting push FROM {source_name}: {e}")
+            finally:
+                self._pushes.task_done()
+
+    def ingest(self, source_name, body):
+        """Score a pushed feed body and fold new entries into today's ranking"""
+        source_info = self.sources[source_name]
+        feed = generator.parse_source_body(body, source_info)
+
+        # Take the write lock before the index, so a poll holding the lock never waits on our index
+        with generator.content_write_lock(generator.ensure_data_directory()):
+            seen_index = SeenEntryIndex(self.seen_index_path, generator.CONFIG['seen_index_max_age_days'])
+            try:
+                entries = generator.process_feed_entries(feed, source_name, source_info, seen_index)
+                logger.info(f"⚡ Push FROM {source_name}: {len(feed.entries)} entries, {len(entries)} new and AI-relevant")
+                if entries:
+                    generator.generate_content({source_name: source_info}, append=True, content=entries)
+                # Only once the entries are saved, or a failed push would lose them for good
+                seen_index.commit()
+            finally:
+                seen_index.close()
+
+        # The adaptive scheduler reads this to hold back polls while the hub keeps pushing
+        self.feed_state.record_poll(source_info['url'], generator.entry_timestamps(feed), field='last_pushed')
+        self.feed_state.save()
+
+    def make_server(self, host=None, port=None):
+        """HTTP server for hub callbacks; start the ingest worker alongside it"""
+        receiver = self
+
+        class CallbackHandler(BaseHTTPRequestHandler):
+            def _source_name(self):
+                path = urlparse(self.path).path
+                prefix = WEBSUB_CONFIG['callback_path']
+                return path[len(prefix):] if path.startswith(prefix) else None
+
+            def _reply(self, status, body=b''):
+                self.send_response(status)
+                self.send_header('Content-Type', 'text/plain')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def do_GET(self):
+                params = {key: values[0] for key, values in parse_qs(urlparse(self.path).query).items()}
+                self._reply(*receiver.verify_intent(self._source_name(), params))
+
+            def do_POST(self):
+                length = int(self.headers.get('Content-Length') or 0)
+                if length > WEBSUB_CONFIG['max_push_bytes']:
+                    self._reply(413)
+                    return
+                body = self.rfile.read(length)
+                # WebSub asks for a 2xx even when the signature is rejected
+                receiver.accept_push(self._source_name(), body, self.headers.get('X-Hub-Signature'))
+                self._reply(202)
+
+            def log_message(self, format, *args):
+                logger.debug(f"websub {self.address_string()} {format % args}")
+
+        if not self._worker.is_alive():
+            self._worker.start()
+        return ThreadingHTTPServer(
+            (host or WEBSUB_CONFIG['host'], port or WEBSUB_CONFIG['port']), CallbackHandler
+        )
+
+def main():
+    """Serve hub callbacks, subscribe to every hub and keep subscriptions renewed"""
+    parser = argparse.ArgumentParser(description="WebSub push receiver for mytribal.ai")
+    parser.add_argument('--host', default=WEBSUB_CONFIG['host'])
+    parser.add_argument('--port', type=int, default=WEBSUB_CONFIG['port'])
+    parser.add_argument('--callback-base', default=WEBSUB_CONFIG['callback_base'],
+                        help="public base URL that hubs call back")
+    args = parser.parse_args()
+
+    logger.info("🚀 Starting WebSub receiver for mytribal.ai...")
+    receiver = WebSubReceiver(callback_base=args.callback_base)
+    server = receiver.make_server(args.host, args.port)
+    threading.Thread(target=server.serve_forever, name='websub-http', daemon=True).start()
+    logger.info(f"👂 Listening on {args.host}:{args.port}, callbacks at {receiver.callback_base}")
+
+    receiver.subscribe_all()
+    schedule.every(1).hours.do(receiver.renew_due)
+
+    try:
+        while True:
+            schedule.run_pending()
+            time.sleep(1)
+    finally:
+        server.shutdown()
+
+if __name__ == "__main__":
+    try:
+        main()
+    except KeyboardInterrupt:
+        logger.info("🛑 WebSub receiver stopped")
@@ -5,7 +5,9 @@ Posts content using WordPress REST API instead of XML-RPC
 """
 
 import os
+import sys
 import json
+import argparse
 import base64
 import ssl
 from datetime import datetime
@@ -13,6 +15,8 @@ import requests
 from dotenv import load_dotenv
 import urllib3
 
+from content_store import ContentStore
+
 # Suppress SSL warnings
 urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
 
@@ -27,6 +31,12 @@ WP_APP_PASSWORD = os.getenv("WP_APP_PASSWORD")
 # OpenAI configuration
 OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
 
+# Content store shared with the generator; match its CONFIG['data_dir'] (--data-dir)
+# and CONFIG['content_store_file']
+DATA_DIR = "content_for_mytribal"
+CONTENT_STORE_FILE = "content_store.db"
+UNPUBLISHED_LOOKBACK_DAYS = 3
+
 # RSS feed mapping to WordPress categories
 RSS_CATEGORY_MAPPING = {
     "https://techcrunch.com/feed/": "AI Technology",
@@ -408,10 +418,10 @@ def publish_to_wordpress_rest(title, content, image_url=None, category_name="AI
         print(f"❌ Error publishing to WordPress: {e}")
         return False
 
-def load_todays_content():
+def load_todays_content(data_dir=None):
     """Load today's generated content"""
     today = datetime.now().strftime("%Y-%m-%d")
-    content_file = f"content_for_mytribal/mytribal_stories_{today}.json"
+    content_file = os.path.join(data_dir or DATA_DIR, f"mytribal_stories_{today}.json")
     
     try:
         with open(content_file, 'r', encoding='utf-8') as f:
@@ -426,6 +436,47 @@ def load_todays_content():
         print(f"❌ Error loading content: {e}")
         return None
 
+def open_content_store(create=False, data_dir=None, file_name=None):
+    """Open the content store shared with the generator; None if it does not exist and create is False"""
+    data_dir = data_dir or DATA_DIR
+    path = os.path.join(data_dir, file_name or CONTENT_STORE_FILE)
+    if not create and not os.path.exists(path):
+        return None
+    os.makedirs(data_dir, exist_ok=True)
+    return ContentStore(path)
+
+def load_unpublished_content(store, days=UNPUBLISHED_LOOKBACK_DAYS):
+    """Load (outline_id, story) pairs for recent stories that are not published yet"""
+    try:
+        pending = store.unpublished_outlines(days)
+    except Exception as e:
+        print(f"❌ Error reading content store: {e}")
+        return []
+    
+    if pending:
+        print(f"✅ Loaded {len(pending)} unpublished stories from the last {days} days")
+    return pending
+
+def iter_jsonl_stories(stream):
+    """Yield stories FROM a JSON Lines stream as each line arrives"""
+    for line_number, line in enumerate(stream, 1):
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            yield json.loads(line)
+        except json.JSONDecodeError as e:
+            print(f"⚠️ Skipping malformed story on line {line_number}: {e}")
+
+def iter_streamed_content(stories, store):
+    """(outline_id, story) pairs for streamed stories, skipping any already published"""
+    for story in stories:
+        outline_id, status = store.outline_state(story) if store else (None, None)
+        if status == 'published':
+            print(f"⏭️ Already published: {story['mytribal_adaptation']['suggested_title'][:60]}")
+            continue
+        yield outline_id, story
+
 def create_sample_content():
     """Create sample content for testing"""
     sample_stories = [
@@ -441,8 +492,65 @@ def create_sample_content():
     ]
     return sample_stories
 
-def main():
+def publish_story(story, number, store=None, outline_id=None):
+    """Write, illustrate and publish one story; returns a result dict"""
+    title = story['mytribal_adaptation']['suggested_title']
+    description = story['content']['summary']
+    if story['content'].get('article_text'):
+        # Extracted by the generator; far more detail than the feed summary
+        description = f"{description}\n\nSource article:\n{story['content']['article_text']}"
+    result = {'title': title, 'outline_id': outline_id, 'status': 'failed', 'error': None}
+    
+    print(f"📝 Title: {title}")
+    print(f"📄 Description: {description[:100]}...")
+    
+    # Generate article
+    print("🤖 Generating article...")
+    article = generate_article_with_openai(title, description)
+    if not article:
+        print("⚠️ Skipping story due to article generation failure")
+        result['error'] = "article generation failed"
+    else:
+        # Generate image
+        print("🎨 Generating image...")
+        image_url = generate_image_with_dalle(title)
+        
+        # Publish to WordPress
+        if publish_to_wordpress_rest(title, article, image_url, "AI Technology"):
+            print(f"✅ Story {number} published successfully!")
+            result['status'] = 'published'
+        else:
+            print(f"❌ Failed to publish story {number}")
+            result['error'] = "WordPress publish failed"
+    
+    if store and outline_id is not None:
+        if result['status'] == 'published':
+            store.mark_published(outline_id)
+        else:
+            store.mark_failed(outline_id, result['error'])
+    return result
+
+def publish_stories(pending, store=None, total='?'):
+    """Publish (outline_id, story) pairs as they come; returns one result dict per story"""
+    results = []
+    for i, (outline_id, story) in enumerate(pending, 1):
+        print(f"\n--- Processing Story {i}/{total} ---")
+        results.append(publish_story(story, i, store, outline_id))
+        print("-" * 50)
+    return results
+
+def parse_args(argv=None):
+    """Command line options for the publisher"""
+    parser = argparse.ArgumentParser(description="Publish mytribal.ai story outlines to WordPress")
+    parser.add_argument('--input', metavar='PATH',
+                        help="read outlines as JSON Lines FROM PATH ('-' for stdin) as they arrive")
+    parser.add_argument('--data-dir', default=DATA_DIR,
+                        help="the generator's data directory, holding the content store and daily files")
+    return parser.parse_args(argv)
+
+def main(argv=None):
     """Main publishing workflow"""
+    args = parse_args(argv)
     print("🚀 Starting WordPress REST API Publisher for MyTribal AI...")
     print("=" * 70)
     
@@ -455,46 +563,41 @@ def main():
         print("3. Verify your application password is correct")
         return
     
-    # Load today's content
-    stories = load_todays_content()
-    if not stories:
-        print("📝 No content file found, using sample content for testing...")
-        stories = create_sample_content()
+    # Streamed input may come straight FROM a generator that has not created the store yet
+    store = open_content_store(create=bool(args.input), data_dir=args.data_dir)
+    input_stream = None
     
-    print(f"\n📚 Processing {len(stories)} stories...")
-    
-    success_count = 0
-    for i, story in enumerate(stories, 1):
-        print(f"\n--- Processing Story {i}/{len(stories)} ---")
-        
-        title = story['mytribal_adaptation']['suggested_title']
-        description = story['content']['summary']
-        
-        print(f"📝 Title: {title}")
-        print(f"📄 Description: {description[:100]}...")
-        
-        # Generate article
-        print("🤖 Generating article...")
-        article = generate_article_with_openai(title, description)
-        if not article:
-            print("⚠️ Skipping story due to article generation failure")
-            continue
-        
-        # Generate image
-        print("🎨 Generating image...")
-        image_url = generate_image_with_dalle(title)
-        
-        # Publish to WordPress
-        if publish_to_wordpress_rest(title, article, image_url, "AI Technology"):
-            success_count += 1
-            print(f"✅ Story {i} published successfully!")
+    if args.input:
+        # Stream stories one line at a time, e.g. piped straight FROM the generator
+        input_stream = sys.stdin if args.input == '-' else open(args.input, 'r', encoding='utf-8')
+        pending = iter_streamed_content(iter_jsonl_stories(input_stream), store)
+        total = '?'
+        print(f"\n📚 Processing stories as they arrive FROM {args.input}...")
+    else:
+        # Load unpublished stories FROM the content store, or today's file without one
+        if store:
+            pending = load_unpublished_content(store)
+            if not pending:
+                print("📭 No unpublished stories in the content store")
         else:
-            print(f"❌ Failed to publish story {i}")
-        
-        print("-" * 50)
+            stories = load_todays_content(args.data_dir)
+            if not stories:
+                print("📝 No content file found, using sample content for testing...")
+                stories = create_sample_content()
+            pending = [(None, story) for story in stories]
+        total = len(pending)
+        print(f"\n📚 Processing {total} stories...")
+    
+    results = publish_stories(pending, store, total)
+    success_count = sum(result['status'] == 'published' for result in results)
+    
+    if store:
+        store.close()
+    if input_stream not in (None, sys.stdin):
+        input_stream.close()
     
     print(f"\n🎉 Publishing Complete!")
-    print(f"✅ Successfully published: {success_count}/{len(stories)} stories")
+    print(f"✅ Successfully published: {success_count}/{len(results)} stories")
     
     if success_count > 0:
         print(f"🌐 Check your website at {WP_URL} to see the new posts!")